@@ -1,17 +1,26 @@
 import simpy
 import random
-import matplotlib.pyplot as plt
 import statistics
+import logging
+
+# Los mensajes de cada llegada y de cada atención van al log en nivel DEBUG: imprimirlos en cada suceso domina el tiempo de ejecución.
+# Para verlos, cambiar el nivel a logging.DEBUG
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+registro = logging.getLogger(__name__)
 
 # Parámetros de la simulación
 TIEMPOS_ENTRE_LLEGADAS_PICO = {'grande': 30, 'mediano': 40, 'pequeño': 25, 'motocicleta': 380}  # Tiempo entre llegadas durante horas pico (en segundos)
 TIEMPOS_ENTRE_LLEGADAS_NO_PICO = {'grande': 60, 'mediano': 70, 'pequeño': 40, 'motocicleta': 380}  # Tiempo entre llegadas fuera de horas pico (en segundos)
+SEMILLA = 2024  # Semilla maestra: con la misma semilla la corrida se repite exactamente
 TIEMPOS_SERVICIO = {
-    'grande': lambda: random.uniform(45, 55),  # Tiempo de servicio para vehículos grandes (uniforme entre 45 y 55 segundos)
-    'mediano': lambda: random.expovariate(1 / 30),  # Tiempo de servicio para vehículos medianos (exponencial con media de 30 segundos)
-    'pequeño': lambda: random.triangular(15, 20, 35),  # Tiempo de servicio para vehículos pequeños (triangular entre 15, 20 y 35 segundos)
-    'motocicleta': lambda: random.expovariate(1 / 30)  # Tiempo de servicio para motocicletas (exponencial con media de 30 segundos)
+    'grande': lambda generador: generador.uniform(45, 55),  # Tiempo de servicio para vehículos grandes (uniforme entre 45 y 55 segundos)
+    'mediano': lambda generador: generador.expovariate(1 / 30),  # Tiempo de servicio para vehículos medianos (exponencial con media de 30 segundos)
+    'pequeño': lambda generador: generador.triangular(15, 20, 35),  # Tiempo de servicio para vehículos pequeños (triangular entre 15, 20 y 35 segundos)
+    'motocicleta': lambda generador: generador.expovariate(1 / 30)  # Tiempo de servicio para motocicletas (exponencial con media de 30 segundos)
 }
+# Un generador de random por tipo de vehículo derivado de la semilla maestra, en lugar del estado global de random: los tiempos
+# de servicio de un tipo no cambian si cambia la cantidad de vehículos de los demás
+GENERADORES_SERVICIO = {tipo_vehiculo: random.Random(f'{SEMILLA}-servicio-{tipo_vehiculo}') for tipo_vehiculo in TIEMPOS_SERVICIO}
 HORAS_PICO_A = [(7, 9)]  # Intervalos de horas pico en estación A (de 7 a 9)
 HORAS_PICO_D = [(19, 20)]  # Intervalos de horas pico en estación D (de 19 a 20)
 # TIEMPO_SIMULACION = 1440 * 7  # Tiempo total de simulación en minutos (7 días)
@@ -54,7 +63,7 @@ def llegada_vehiculos(entorno, estacion: str, cabinas: simpy.Resource):
             tiempo_entre_llegadas_segundos = tiempos_entre_llegadas[tipo_vehiculo]  # Tiempo entre llegadas (en segundos)
             tiempo_entre_llegadas_minutos = tiempo_entre_llegadas_segundos / 60 # Divide por 60 para convertir a minutos el tiempo_entre_llegadas (que está en segundos)
             yield entorno.timeout(tiempo_entre_llegadas_minutos)
-            print(f"Llegó vehículo tipo '{tipo_vehiculo}' a la estación {estacion} en el minuto {entorno.now}")
+            registro.debug("Llegó vehículo tipo '%s' a la estación %s en el minuto %s", tipo_vehiculo, estacion, entorno.now)
             total_vehiculos += 1  # Incrementar el contador total de vehículos
             eventos.append((entorno.now, 'llegada', tipo_vehiculo, estacion))  # Registra el evento de llegada
             entorno.process(atender_vehiculo(entorno, estacion, cabinas, tipo_vehiculo))  # Inicia el proceso de atención del vehículo
@@ -66,12 +75,12 @@ def atender_vehiculo(entorno, estacion: str, cabinas: simpy.Resource, tipo_vehic
     tiempo_llegada = entorno.now  # Tiempo de llegada del vehículo
 
     # PROBLEMA: la capacidad en hora pico no se está actualizando correctamente
-    print(f"Capacidad actual de estación {estacion}: {cabinas.capacity}")
+    registro.debug("Capacidad actual de estación %s: %s", estacion, cabinas.capacity)
 
     # Se usa la keyword "with" the python, para manejar automáticamente la liberación de la cabina al finalizar el proceso (resource.release() al finalizar)
     with cabinas.request() as req:  # Solicitar una cabina de peaje (un Resource de SimPy)
         yield req  # Espera hasta que una cabina esté disponible
-        tiempo_servicio_segundos = TIEMPOS_SERVICIO[tipo_vehiculo]()  # Obtener el tiempo de servicio λ del vehículo (llamando a la función lambda)
+        tiempo_servicio_segundos = TIEMPOS_SERVICIO[tipo_vehiculo](GENERADORES_SERVICIO[tipo_vehiculo])  # Obtener el tiempo de servicio λ del vehículo (llamando a la función lambda)
         tiempo_servicio_minutos = tiempo_servicio_segundos/60
         yield entorno.timeout(tiempo_servicio_minutos)  # Simula el tiempo de servicio (delay en Arena)
 
@@ -84,18 +93,18 @@ def atender_vehiculo(entorno, estacion: str, cabinas: simpy.Resource, tipo_vehic
 def control_cabinas(entorno, estacion: str, cabinas: simpy.Resource):
     while True:
         hora_actual = int(entorno.now / 60) % 24  # Hora actual de la simulación    (% es el módulo o residuo de la división)
-        print(f"\nHORA ACTUAL {hora_actual}\n")
+        registro.debug("HORA ACTUAL %s", hora_actual)
         horas_pico = HORAS_PICO_A if estacion == 'A' else HORAS_PICO_D
 
         # Verifica si la hora actual está dentro de algún intervalo de horas pico.
         if any(inicio <= hora_actual < fin for inicio, fin in horas_pico):
             nueva_capacidad = 3  # Durante horas pico, la capacidad es 3
             if cabinas.capacity == 1: # Si la capacidad es 1 y es hora pico, muestra mensaje de comienzo de hora pico
-                print(f"COMIENZO HORA PICO PARA ESTACIÓN {estacion}. Capacidad modificada: {nueva_capacidad}")
+                registro.info("COMIENZO HORA PICO PARA ESTACIÓN %s. Capacidad modificada: %s", estacion, nueva_capacidad)
         else:
             nueva_capacidad = 1  # Fuera de horas pico, la capacidad es 1
             if cabinas.capacity == 3: # Si la capacidad es 3 y no es hora pico, muestra mensaje de fin de hora pico
-                print(f"FIN HORA PICO PARA ESTACIÓN {estacion}. Capacidad modificada: {nueva_capacidad}")
+                registro.info("FIN HORA PICO PARA ESTACIÓN %s. Capacidad modificada: %s", estacion, nueva_capacidad)
 
         # Cambiar la capacidad de las cabinas
         if cabinas.capacity != nueva_capacidad:
@@ -122,6 +131,7 @@ entorno.run(until=TIEMPO_SIMULACION)  # Ejecutar la simulación por TIEMPO_SIMUL
 #############################################################################################################################################################
 ##                                                               Resultados de la simulación                                                               ##
 #############################################################################################################################################################
+print(f"Semilla: {SEMILLA}")
 print(f"Total de vehículos: {total_vehiculos}\n")  # Total de vehículos atendidos
 print(f"Tiempo promedio de espera: {statistics.mean(tiempos_espera):.2f} segundos ({statistics.mean(tiempos_espera)/60/60:.2f} horas)")  # Tiempo de espera promedio (mean)
 print(f"Tiempo máximo de espera: {max(tiempos_espera):.2f} segundos ({max(tiempos_espera)/60/60:.2f} horas)")
@@ -140,6 +150,7 @@ print(f"Costo total de habilitar una cabina extra: ${costo_total_habilitacion:.2
 print(f"Multa necesaria MÍNIMA por vehículo que supera 3 minutos de espera: ${multa_necesaria:.2f}")  # Imprimir la multa necesaria por vehículo que supera el tiempo de espera límite
 
 # Graficar los tiempos de espera de los vehículos
+import matplotlib.pyplot as plt  # Se importa recién para el gráfico, así no demora el arranque de la simulación
 plt.hist(tiempos_espera, bins=50, edgecolor='black')    # 50 intervalos
 plt.axvline(LIMITE_ESPERA, color='red', linestyle='dashed', linewidth=1, label='Límite de 3 minutos')
 plt.xlabel('Tiempo de espera (segundos)')
@@ -20,7 +20,6 @@
 
 import simpy
 import random
-import matplotlib.pyplot as plt
 import statistics
 
 # Parámetros de la simulación
@@ -131,6 +130,7 @@ else:
 print(f"Multa necesaria por vehículo que supera 3 minutos de espera: ${costo_multa:.2f}")  # Imprimir la multa necesaria
 
 # Mostrar el histograma de tiempos de espera
+import matplotlib.pyplot as plt  # Se importa recién para el gráfico, así no demora el arranque de la simulación
 plt.hist(tiempos_espera, bins=50, edgecolor='black')
 plt.title("Distribución de Tiempos de Espera")
 plt.xlabel("Tiempo de Espera (segundos)")
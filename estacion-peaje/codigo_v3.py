@@ -1,7 +1,12 @@
 import simpy
 import random
-import matplotlib.pyplot as plt
 import statistics
+import logging
+
+# Los mensajes de cada llegada y de cada atención van al log en nivel DEBUG: imprimirlos en cada suceso domina el tiempo de ejecución.
+# Para verlos, cambiar el nivel a logging.DEBUG
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+registro = logging.getLogger(__name__)
 
 # Parámetros de la simulación
 TIEMPOS_ENTRE_LLEGADAS_PICO = {'grande': 30, 'mediano': 40, 'pequeño': 25, 'motocicleta': 380}  # Tiempo entre llegadas durante horas pico (en segundos)
@@ -54,7 +59,7 @@ def llegada_vehiculos(entorno, estacion: str, cabinas: simpy.Resource):
             tiempo_entre_llegadas_segundos = tiempos_entre_llegadas[tipo_vehiculo]  # Tiempo entre llegadas (en segundos)
             tiempo_entre_llegadas_minutos = tiempo_entre_llegadas_segundos / 60 # Divide por 60 para convertir a minutos el tiempo_entre_llegadas (que está en segundos)
             yield entorno.timeout(tiempo_entre_llegadas_minutos)
-            print(f"Llegó vehículo tipo '{tipo_vehiculo}' a la estación {estacion} en el minuto {entorno.now}")
+            registro.debug("Llegó vehículo tipo '%s' a la estación %s en el minuto %s", tipo_vehiculo, estacion, entorno.now)
             total_vehiculos += 1  # Incrementar el contador total de vehículos
             eventos.append((entorno.now, 'llegada', tipo_vehiculo, estacion))  # Registra el evento de llegada
             entorno.process(atender_vehiculo(entorno, estacion, cabinas, tipo_vehiculo))  # Inicia el proceso de atención del vehículo
@@ -66,7 +71,7 @@ def atender_vehiculo(entorno, estacion: str, cabinas: simpy.Resource, tipo_vehic
     tiempo_llegada = entorno.now  # Tiempo de llegada del vehículo
 
     # PROBLEMA: la capacidad en hora pico no se está actualizando correctamente
-    print(f"Capacidad actual de estación {estacion}: {cabinas.capacity}")
+    registro.debug("Capacidad actual de estación %s: %s", estacion, cabinas.capacity)
 
     # Se usa la keyword "with" the python, para manejar automáticamente la liberación de la cabina al finalizar el proceso (resource.release() al finalizar)
     with cabinas.request() as req:  # Solicitar una cabina de peaje (un Resource de SimPy)
@@ -84,18 +89,18 @@ def atender_vehiculo(entorno, estacion: str, cabinas: simpy.Resource, tipo_vehic
 def control_cabinas(entorno, estacion: str, cabinas: simpy.Resource):
     while True:
         hora_actual = int(entorno.now / 60) % 24  # Hora actual de la simulación    (% es el módulo o residuo de la división)
-        print(f"\nHORA ACTUAL {hora_actual}\n")
+        registro.debug("HORA ACTUAL %s", hora_actual)
         horas_pico = HORAS_PICO_A if estacion == 'A' else HORAS_PICO_D
 
         # Verifica si la hora actual está dentro de algún intervalo de horas pico.
         if any(inicio <= hora_actual < fin for inicio, fin in horas_pico):
             nueva_capacidad = 3  # Durante horas pico, la capacidad es 3
             if cabinas.capacity == 1: # Si la capacidad es 1 y es hora pico, muestra mensaje de comienzo de hora pico
-                print(f"COMIENZO HORA PICO PARA ESTACIÓN {estacion}. Capacidad modificada: {nueva_capacidad}")
+                registro.info("COMIENZO HORA PICO PARA ESTACIÓN %s. Capacidad modificada: %s", estacion, nueva_capacidad)
         else:
             nueva_capacidad = 1  # Fuera de horas pico, la capacidad es 1
             if cabinas.capacity == 3: # Si la capacidad es 3 y no es hora pico, muestra mensaje de fin de hora pico
-                print(f"FIN HORA PICO PARA ESTACIÓN {estacion}. Capacidad modificada: {nueva_capacidad}")
+                registro.info("FIN HORA PICO PARA ESTACIÓN %s. Capacidad modificada: %s", estacion, nueva_capacidad)
 
         # Cambiar la capacidad de las cabinas
         if cabinas.capacity != nueva_capacidad:
@@ -156,6 +161,7 @@ print(f"Multa necesaria MÍNIMA por vehículo que supera 3 minutos de espera: ${
 print(f"Intervalo de confianza del 95%: {statistics.stdev(tiempos_espera) / (total_vehiculos ** 0.5) * 1.96:.2f} minutos")
 
 # Graficar los tiempos de espera de los vehículos
+import matplotlib.pyplot as plt  # Se importa recién para el gráfico, así no demora el arranque de la simulación
 plt.hist(tiempos_espera, bins=50, edgecolor='black')
 plt.axvline(LIMITE_ESPERA, color='red', linestyle='dashed', linewidth=1, label='Límite de 3 minutos')
 plt.xlabel('Tiempo de espera (segundos)')
@@ -1,7 +1,12 @@
 import simpy
 import random
-import matplotlib.pyplot as plt
 import statistics
+import logging
+
+# Los mensajes de cada llegada y de cada atención van al log en nivel DEBUG: imprimirlos en cada suceso domina el tiempo de ejecución.
+# Para verlos, cambiar el nivel a logging.DEBUG
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+registro = logging.getLogger(__name__)
 
 # Parámetros de la simulación
 TIEMPOS_ENTRE_LLEGADAS_PICO = {'grande': 30, 'mediano': 40, 'pequeño': 25, 'motocicleta': 380}  # Tiempo entre llegadas durante horas pico (en segundos)
@@ -49,7 +54,7 @@ def llegada_vehiculos(entorno, estacion: str, cabinas):
         for tipo_vehiculo in tiempos_entre_llegadas.keys():
             tiempo_entre_llegadas = tiempos_entre_llegadas[tipo_vehiculo]  # Tiempo entre llegadas (en segundos)
             yield entorno.timeout(tiempo_entre_llegadas / 60)  # Divide por 60 para convertir a minutos el tiempo_entre_llegadas (que está en segundos)
-            print(f"Llegó vehículo tipo '{tipo_vehiculo}' a la estación {estacion} en el minuto {entorno.now}")
+            registro.debug("Llegó vehículo tipo '%s' a la estación %s en el minuto %s", tipo_vehiculo, estacion, entorno.now)
             total_vehiculos += 1  # Incrementar el contador total de vehículos
             eventos.append((entorno.now, 'llegada', tipo_vehiculo, estacion))  # Registra el evento de llegada
             entorno.process(atender_vehiculo(entorno, estacion, cabinas, tipo_vehiculo))  # Inicia el proceso de atención del vehículo
@@ -60,7 +65,7 @@ def atender_vehiculo(entorno, estacion: str, cabinas, tipo_vehiculo):
 
     tiempo_llegada = entorno.now  # Tiempo de llegada del vehículo
 
-    print(f"Capacidad actual de estación {estacion}: {cabinas.capacity}")
+    registro.debug("Capacidad actual de estación %s: %s", estacion, cabinas.capacity)
 
     with cabinas.request() as req:  # Solicitar una cabina de peaje (un Resource de SimPy)
         yield req  # Espera hasta que una cabina esté disponible
@@ -76,18 +81,18 @@ def atender_vehiculo(entorno, estacion: str, cabinas, tipo_vehiculo):
 def control_cabinas(entorno, estacion: str, cabinas):
     while True:
         hora_actual = int(entorno.now / 60) % 24  # Hora actual de la simulación (% es el módulo o residuo de la división)
-        print(f"\nHORA ACTUAL {hora_actual}")
+        registro.debug("HORA ACTUAL %s", hora_actual)
         horas_pico = HORAS_PICO_A if estacion == 'A' else HORAS_PICO_D
 
         # Verifica si la hora actual está dentro de algún intervalo de horas pico.
         if any(inicio <= hora_actual < fin for inicio, fin in horas_pico):
             nueva_capacidad = 3  # Durante horas pico, la capacidad es 3
             if cabinas.capacity == 1:  # Si la capacidad es 1 y es hora pico, muestra mensaje de comienzo de hora pico
-                print(f"COMIENZO HORA PICO PARA ESTACIÓN {estacion}. Capacidad modificada: {nueva_capacidad}")
+                registro.info("COMIENZO HORA PICO PARA ESTACIÓN %s. Capacidad modificada: %s", estacion, nueva_capacidad)
         else:
             nueva_capacidad = 1  # Fuera de horas pico, la capacidad es 1
             if cabinas.capacity == 3:  # Si la capacidad es 3 y no es hora pico, muestra mensaje de fin de hora pico
-                print(f"FIN HORA PICO PARA ESTACIÓN {estacion}. Capacidad modificada: {nueva_capacidad}")
+                registro.info("FIN HORA PICO PARA ESTACIÓN %s. Capacidad modificada: %s", estacion, nueva_capacidad)
 
         # Cambiar la capacidad de las cabinas creando un nuevo Resource
         if cabinas.capacity != nueva_capacidad:
@@ -118,6 +123,7 @@ print(f"Desviación estándar de tiempo de espera: {statistics.stdev(tiempos_esp
 print(f"Intervalo de confianza del 95%: {statistics.stdev(tiempos_espera) / (total_vehiculos ** 0.5) * 1.96:.2f} minutos")
 
 # Imprimir los tiempos de espera en una gráfica de histogramas
+import matplotlib.pyplot as plt  # Se importa recién para el gráfico, así no demora el arranque de la simulación
 plt.hist(tiempos_espera, bins=20, edgecolor='black', alpha=0.7)
 plt.axvline(statistics.mean(tiempos_espera), color='r', linestyle='dashed', linewidth=1)
 plt.axvline(statistics.median(tiempos_espera), color='g', linestyle='dashed', linewidth=1)
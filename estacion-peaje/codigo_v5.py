@@ -1,6 +1,12 @@
+import simpy
 import random
-import matplotlib.pyplot as plt
 import statistics
+import logging
+
+# Los mensajes de cada llegada y de cada atención van al log en nivel DEBUG: imprimirlos en cada suceso domina el tiempo de ejecución.
+# Para verlos, cambiar el nivel a logging.DEBUG
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+registro = logging.getLogger(__name__)
 
 # Parámetros de la simulación
 TIEMPOS_ENTRE_LLEGADAS_PICO = {'grande': 30, 'mediano': 40, 'pequeño': 25, 'motocicleta': 380}  # Tiempo entre llegadas durante horas pico (en segundos)
@@ -32,7 +38,7 @@ def llegada_vehiculos(entorno, estacion: str, cabinas: int):
         for tipo_vehiculo in tipos_vehiculos:
             tiempo_entre_llegadas_segundos = tiempos_entre_llegadas[tipo_vehiculo]  # Tiempo entre llegadas (en segundos)
             tiempo_entre_llegadas_minutos = tiempo_entre_llegadas_segundos / 60  # Convertir a minutos
-            print(f"Llegó vehículo tipo '{tipo_vehiculo}' a la estación {estacion} en el minuto {entorno.now}")
+            registro.debug("Llegó vehículo tipo '%s' a la estación %s en el minuto %s", tipo_vehiculo, estacion, entorno.now)
             total_vehiculos += 1
             eventos.append((entorno.now, 'llegada', tipo_vehiculo, estacion))
             entorno.process(atender_vehiculo(entorno, estacion, cabinas, tipo_vehiculo))
@@ -78,6 +84,7 @@ print(f"Vehículos que superan {LIMITE_ESPERA} minutos de espera: {vehiculos_sup
 print()
 
 # Graficar los tiempos de espera de los vehículos
+import matplotlib.pyplot as plt  # Se importa recién para el gráfico, así no demora el arranque de la simulación
 plt.hist(tiempos_espera, bins=50, edgecolor='black')
 plt.axvline(LIMITE_ESPERA, color='red', linestyle='dashed', linewidth=1, label=f'Límite de {LIMITE_ESPERA} minutos')
 plt.xlabel('Tiempo de espera (minutos)')
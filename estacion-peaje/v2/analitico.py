@@ -0,0 +1,143 @@
+import math
+from muestreo import momentos_distribucion
+from tasas import SEGUNDOS_DIA
+from codigo_final_v2 import TIEMPOS_SERVICIO, TIEMPOS_ENTRE_LLEGADAS, estaciones_por_defecto, ejecutar_replica
+from semillas import semilla_maestra, generar_semillas
+
+# Evaluación analítica del peaje sin simular. Mientras las tasas de llegada y la cantidad de cabinas no cambian, cada estación
+# es una cola M/G/c: llegadas de Poisson (la suma de las de cada tipo de vehículo) y un tiempo de servicio que es la mezcla de
+# los de cada tipo, con pesos proporcionales a sus tasas. La espera media en cola sale de:
+# - Pollaczek-Khinchine para una cabina (exacta en estado estacionario): Wq = lambda E[S^2] / (2 (1 - rho))
+# - Allen-Cunneen para c cabinas (aproximada): Wq = C(c, a) / (c mu - lambda) * (1 + cs^2) / 2, con C la fórmula C de Erlang
+# La cola de la distribución de la espera se aproxima como en M/M/c: P(Wq > t) = P(Wq > 0) exp(-t / m), con m = Wq / P(Wq > 0).
+# Los resultados de estado estacionario sólo valen si el tramo dura mucho más que el tiempo que tarda la cola en estabilizarse
+# y si la cola no viene cargada del tramo anterior; en los demás tramos (típicamente las horas pico) hay que simular
+
+UTILIZACION_MAXIMA = 0.9  # Con utilización más alta la cola tarda demasiado en estabilizarse y la aproximación deja de ser confiable
+FACTOR_RELAJACION = 10  # El tramo tiene que durar al menos esta cantidad de tiempos de relajación
+
+# Media y segundo momento del tiempo de servicio de la mezcla de tipos de vehículo que llegan con las tasas dadas
+def momentos_mezcla(tasas, tiempos_servicio=TIEMPOS_SERVICIO):
+    tasa_total = sum(tasas.values())
+    media = segundo = 0.0
+    for tipo_vehiculo, tasa in tasas.items():
+        if tasa > 0:
+            media_tipo, segundo_tipo = momentos_distribucion(*tiempos_servicio[tipo_vehiculo])
+            media += tasa / tasa_total * media_tipo
+            segundo += tasa / tasa_total * segundo_tipo
+    return media, segundo
+
+# Probabilidad de esperar en una cola M/M/c con carga ofrecida a = lambda / mu (fórmula C de Erlang, calculada con la
+# recursión de la fórmula B para evitar factoriales grandes)
+def erlang_c(cabinas, carga):
+    erlang_b = 1.0
+    for k in range(1, cabinas + 1):
+        erlang_b = carga * erlang_b / (k + carga * erlang_b)
+    utilizacion = carga / cabinas
+    return erlang_b / (1 - utilizacion + utilizacion * erlang_b)
+
+# Espera media en cola de una M/G/c en estado estacionario. Devuelve un diccionario con la utilización, la probabilidad de
+# esperar y la espera media (infinita si la cola no es estable)
+def espera_mgc(tasa, media_servicio, segundo_momento, cabinas):
+    carga = tasa * media_servicio
+    utilizacion = carga / cabinas if cabinas > 0 else math.inf
+    cuadrado_cv = segundo_momento / media_servicio ** 2 - 1 if media_servicio > 0 else 0.0  # Coeficiente de variación al cuadrado
+    if tasa == 0:
+        return {'utilizacion': 0.0, 'probabilidad_espera': 0.0, 'espera': 0.0, 'cuadrado_cv': cuadrado_cv}
+    if utilizacion >= 1:
+        return {'utilizacion': utilizacion, 'probabilidad_espera': 1.0, 'espera': math.inf, 'cuadrado_cv': cuadrado_cv}
+    if cabinas == 1:
+        probabilidad_espera = utilizacion
+        espera = tasa * segundo_momento / (2 * (1 - utilizacion))  # Pollaczek-Khinchine
+    else:
+        probabilidad_espera = erlang_c(cabinas, carga)
+        espera = probabilidad_espera / (cabinas / media_servicio - tasa) * (1 + cuadrado_cv) / 2  # Allen-Cunneen
+    return {'utilizacion': utilizacion, 'probabilidad_espera': probabilidad_espera, 'espera': espera, 'cuadrado_cv': cuadrado_cv}
+
+# Tramos de [0, tiempo_final) en los que la estación tiene tasas de llegada y cabinas constantes: (inicio, fin, tasas, cabinas)
+def tramos_estacion(estacion, tabla, tiempo_final):
+    limites = set(range(0, int(math.ceil(tiempo_final)), tabla.resolucion))
+    cambios = estacion.cambios_capacidad()
+    for dia in range(int(math.ceil(tiempo_final / SEGUNDOS_DIA))):
+        limites.update(dia * SEGUNDOS_DIA + segundo for segundo, _ in cambios)
+    limites = sorted(limite for limite in limites if limite < tiempo_final) + [tiempo_final]
+    tramos = []
+    for inicio, fin in zip(limites, limites[1:]):
+        tasas = {tipo_vehiculo: tabla.tasa(tipo_vehiculo, inicio) for tipo_vehiculo in tabla.tasas}
+        cabinas = estacion.capacidad_en((inicio % SEGUNDOS_DIA) / 3600)
+        if tramos and tramos[-1][2] == tasas and tramos[-1][3] == cabinas:
+            tramos[-1] = (tramos[-1][0], fin, tasas, cabinas)  # Se une con el tramo anterior si nada cambió
+        else:
+            tramos.append((inicio, fin, tasas, cabinas))
+    return tramos
+
+# Evalúa cada tramo de cada estación de una configuración de SimulacionCabinas. Un tramo es confiable si su utilización es
+# menor que UTILIZACION_MAXIMA, si dura al menos FACTOR_RELAJACION veces el tiempo de relajación de la cola
+# (aproximación de heavy traffic: media de servicio / (c (1 - raíz(rho))^2)) y si el tramo anterior no estaba saturado
+def evaluar_tramos(configuracion):
+    estaciones = configuracion['estaciones'] or estaciones_por_defecto(configuracion['horarios_pico_mañana'], configuracion['horarios_pico_vespertino'])
+    limite = configuracion['limite_espera']
+    resultados = []
+    for numero, estacion in enumerate(estaciones):
+        tabla = estacion.tabla_tasas(configuracion.get('tiempos_entre_llegadas') or TIEMPOS_ENTRE_LLEGADAS)
+        saturado = False
+        for inicio, fin, tasas, cabinas in tramos_estacion(estacion, tabla, configuracion['tiempo_final']):
+            tasa = sum(tasas.values())
+            media, segundo = momentos_mezcla(tasas, configuracion.get('tiempos_servicio') or TIEMPOS_SERVICIO)
+            cola = espera_mgc(tasa, media, segundo, cabinas)
+            utilizacion = cola['utilizacion']
+            relajacion = media / (cabinas * (1 - math.sqrt(utilizacion)) ** 2) if utilizacion < 1 else math.inf
+            confiable = utilizacion < UTILIZACION_MAXIMA and fin - inicio >= FACTOR_RELAJACION * relajacion and not saturado
+            saturado = utilizacion >= UTILIZACION_MAXIMA
+            llegadas = tasa * (fin - inicio)
+            # Vehículos en cola y cabinas ocupadas promedio del tramo (Little): Lq = lambda Wq, lambda E[S] = c rho
+            largo_cola = tasa * cola['espera'] if tasa > 0 else 0.0
+            ocupadas = min(utilizacion, 1.0) * cabinas
+            if cola['espera'] > 0 and math.isfinite(cola['espera']):
+                media_condicional = cola['espera'] / cola['probabilidad_espera']  # Espera media de los que esperan
+                excedidos = llegadas * cola['probabilidad_espera'] * math.exp(-limite / media_condicional)
+                exceso = excedidos * media_condicional  # E[(Wq - limite)+] de una exponencial
+            else:
+                excedidos = 0.0 if cola['espera'] == 0 else llegadas
+                exceso = 0.0 if cola['espera'] == 0 else math.inf
+            resultados.append({'estacion': numero, 'inicio': inicio, 'fin': fin, 'cabinas': cabinas, 'tasa': tasa, 'llegadas': llegadas,
+                               **cola, 'largo_cola': largo_cola, 'ocupadas': ocupadas, 'relajacion': relajacion, 'excedidos': excedidos,
+                               'exceso': exceso, 'confiable': confiable})
+    return resultados
+
+# Métricas de una réplica (las mismas claves que SimulacionCabinas.resultados_replica, como valores esperados) calculadas
+# analíticamente, más 'confiable' (todos los tramos son confiables) y 'fraccion_confiable' (de las llegadas)
+def evaluar(configuracion):
+    tramos = evaluar_tramos(configuracion)
+    estaciones = configuracion['estaciones'] or estaciones_por_defecto(configuracion['horarios_pico_mañana'], configuracion['horarios_pico_vespertino'])
+    llegadas = sum(tramo['llegadas'] for tramo in tramos)
+    espera = sum(tramo['llegadas'] * tramo['espera'] for tramo in tramos if tramo['llegadas'] > 0) / llegadas if llegadas > 0 else 0.0
+    exceso = sum(tramo['exceso'] for tramo in tramos)
+    multas = exceso * configuracion['multa_espera']
+    costo_con_cabina_extra = (exceso // (60*10)) * configuracion['costo_cabina_extra'] if math.isfinite(exceso) else math.inf
+    tiempo_extra = sum(max(0, tramo['cabinas'] - estaciones[tramo['estacion']].cabinas) * (tramo['fin'] - tramo['inicio']) for tramo in tramos)
+    costo_plan_cabinas = math.ceil(round(tiempo_extra / (60*10), 6)) * configuracion['costo_cabina_extra']
+    llegadas_confiables = sum(tramo['llegadas'] for tramo in tramos if tramo['confiable'])
+    # Promedios ponderados por tiempo sumando las estaciones, como en la simulación: L = Lq + cabinas ocupadas
+    tiempo_final = configuracion['tiempo_final']
+    area_cola = sum(tramo['largo_cola'] * (tramo['fin'] - tramo['inicio']) for tramo in tramos)
+    area_ocupadas = sum(tramo['ocupadas'] * (tramo['fin'] - tramo['inicio']) for tramo in tramos)
+    area_cabinas = sum(tramo['cabinas'] * (tramo['fin'] - tramo['inicio']) for tramo in tramos)
+    return {'espera': espera, 'excedidos': sum(tramo['excedidos'] for tramo in tramos), 'vehiculos_atendidos': llegadas,
+            'multas': multas, 'costo_con_cabina_extra': costo_con_cabina_extra, 'diferencia_costos': multas - costo_con_cabina_extra,
+            'costo_plan_cabinas': costo_plan_cabinas, 'costo_total': multas + costo_plan_cabinas,
+            'llegadas': llegadas, 'llegadas_esperadas': llegadas,
+            'largo_cola': area_cola / tiempo_final, 'largo_sistema': (area_cola + area_ocupadas) / tiempo_final,
+            'utilizacion': area_ocupadas / area_cabinas if area_cabinas > 0 else 0.0,
+            'confiable': all(tramo['confiable'] for tramo in tramos), 'fraccion_confiable': llegadas_confiables / llegadas if llegadas > 0 else 1.0}
+
+# Evaluación analítica si es confiable; si no, el promedio de "replicas" réplicas simuladas. La cola arrastra su estado de un
+# tramo al siguiente, así que las horas pico no se pueden simular aisladas: se simula el escenario completo
+def evaluar_o_simular(configuracion, replicas=30, semilla=None):
+    resultado = evaluar(configuracion)
+    if resultado['confiable']:
+        return dict(resultado, metodo='analitico')
+    semilla = semilla_maestra(semilla)
+    simulados = [ejecutar_replica((configuracion, semilla_replica)) for semilla_replica in generar_semillas(semilla, replicas)]
+    promedios = {metrica: sum(simulado[metrica] for simulado in simulados) / replicas for metrica in simulados[0] if metrica != 'semilla'}
+    return dict(promedios, confiable=False, fraccion_confiable=resultado['fraccion_confiable'], metodo='simulacion', semilla=semilla)
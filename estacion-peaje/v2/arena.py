@@ -0,0 +1,680 @@
+import os
+import re
+import math
+import struct
+import logging
+import argparse
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from codigo_final_v2 import SimulacionCabinas, Vehiculo
+from escenarios import compilar_escenario
+from muestreo import DISTRIBUCIONES, momentos_distribucion
+from semillas import semilla_maestra, generar_semillas
+from distribucion_t import cuantil_t, intervalo_t
+
+registro = logging.getLogger('peaje')
+
+# Importa el modelo original de Arena (tp_gonzalo_benito_182885.p) como escenario del simulador y lo valida contra la salida
+# de SIMAN (tp_gonzalo_benito_182885.out).
+# El .p es el programa SIMAN que Arena compila del modelo. Desde Arena 13 es un documento compuesto de OLE (el formato de
+# los .doc viejos) y el programa está como texto en el flujo 'Contents': los elementos del experimento separados por bytes
+# nulos (SCHEDULES, QUEUES, RESOURCES, REPLICATE, EXPRESSIONS, ...) y los bloques del modelo separados por ';', cada uno
+# con su etiqueta (174$CREATE,...:NEXT(175$)). Se lee el documento con un lector mínimo del formato, así no se toman
+# restos de versiones anteriores del modelo que quedan en sectores libres del archivo (un .p de texto plano también sirve).
+# Del modelo se toman las llegadas (CREATE), las cabinas (STATION + QUEUE + SEIZE + DELAY), los caminos de cada vehículo
+# (BRANCH, FINDJ sobre un PickStation, ROUTE) y la duración y cantidad de réplicas (REPLICATE).
+# Diferencias con el simulador, que el escenario importado aproxima:
+# - En Arena cada cabina tiene su cola y el vehículo elige la de menos vehículos esperando (PickStation); en el simulador
+#   las cabinas de una estación comparten una cola FIFO. Mientras haya vehículos esperando las dos disciplinas atienden
+#   al mismo ritmo (en la cola compartida ninguna cabina queda libre con vehículos esperando en otra)
+# - En Arena el tiempo de atención depende de la cabina y en el simulador del tipo de vehículo: todos los tipos usan la
+#   mezcla de las distribuciones de las cabinas con peso proporcional a la tasa de atención de cada una, que es la fracción
+#   de vehículos que atiende cada cabina cuando están todas ocupadas (la capacidad total de la estación es la misma)
+# - Las estaciones sin recurso (en este modelo la Cabina 4 de los vehículos especiales, una demora sin cola) no se simulan:
+#   sus vehículos no esperan. Las llegadas de las cabinas simuladas son las de cada tipo por la probabilidad de su camino
+# - Arena crea la primera entidad de cada tipo en el instante 0; en el simulador la primera llegada ya es aleatoria
+ENTIDADES_VEHICULO = {
+    'Gran Porte': Vehiculo.GRAN_PORTE,
+    'Grandes': Vehiculo.GRANDE,
+    'Pequeños': Vehiculo.PEQUENO,
+    'Motos': Vehiculo.MOTOCICLETA,
+    'Especial': Vehiculo.ESPECIAL
+}
+ENTIDADES_TIPO = {tipo: entidad for entidad, tipo in ENTIDADES_VEHICULO.items()}
+SEGUNDOS_UNIDAD = {'seconds': 1, 'minutes': 60, 'hours': 3600, 'days': 86400}
+# Distribuciones de SIMAN: distribución registrada en muestreo.py y cantidad de parámetros (el siguiente, si está, es el
+# flujo de números aleatorios de Arena, que no se usa)
+DISTRIBUCIONES_SIMAN = {
+    'expo': ('exponencial', 1), 'exponential': ('exponencial', 1),
+    'unif': ('uniforme', 2), 'uniform': ('uniforme', 2),
+    'tria': ('triangular', 3), 'triangular': ('triangular', 3),
+    'norm': ('normal', 2), 'normal': ('normal', 2),
+}
+FIRMA_OLE = bytes.fromhex('D0CF11E0A1B11AE1')
+FIN_CADENA = 0xFFFFFFFA  # Los números de sector desde aquí marcan el fin de una cadena (o sectores especiales)
+LIMITE_ENTIDADES_DEMO = 150  # Entidades simultáneas que admite la licencia de estudiante de Arena
+
+class ErrorArena(ValueError):
+    pass
+
+# Flujos de un documento compuesto de OLE como {nombre: bytes}: cabecera, tabla de asignación de sectores (FAT), directorio
+# y, para los flujos chicos, el mini flujo con su propia tabla
+def flujos_ole(datos):
+    tamano_sector = 1 << struct.unpack_from('<H', datos, 0x1E)[0]
+    tamano_mini = 1 << struct.unpack_from('<H', datos, 0x20)[0]
+    sectores_fat, primer_directorio = struct.unpack_from('<II', datos, 0x2C)
+    corte_mini, primer_mini_fat, sectores_mini_fat, primer_difat, sectores_difat = struct.unpack_from('<IIIII', datos, 0x38)
+    por_sector = tamano_sector // 4
+    difat = list(struct.unpack_from('<109I', datos, 0x4C))
+    sector = primer_difat
+    for _ in range(sectores_difat):
+        entradas = struct.unpack_from(f'<{por_sector}I', datos, (sector + 1) * tamano_sector)
+        difat.extend(entradas[:-1])
+        sector = entradas[-1]
+    fat = []
+    for sector in difat[:sectores_fat]:
+        fat.extend(struct.unpack_from(f'<{por_sector}I', datos, (sector + 1) * tamano_sector))
+
+    def cadena(sector, tabla, bloque, tamano):
+        partes = []
+        while sector < FIN_CADENA and len(partes) <= len(tabla):  # El límite corta cadenas circulares de un archivo dañado
+            partes.append(bloque(sector, tamano))
+            sector = tabla[sector]
+        return b''.join(partes)
+
+    def sector_archivo(sector, tamano):
+        return datos[(sector + 1) * tamano:(sector + 2) * tamano]
+
+    directorio = cadena(primer_directorio, fat, sector_archivo, tamano_sector)
+    entradas = []
+    for inicio in range(0, len(directorio), 128):
+        entrada = directorio[inicio:inicio + 128]
+        largo_nombre = struct.unpack_from('<H', entrada, 64)[0]
+        entradas.append((entrada[:max(largo_nombre - 2, 0)].decode('utf-16-le', 'replace'), entrada[66],
+                         struct.unpack_from('<I', entrada, 116)[0], struct.unpack_from('<I', entrada, 120)[0]))
+    mini_flujo = cadena(entradas[0][2], fat, sector_archivo, tamano_sector)  # La raíz (entrada 0) guarda el mini flujo
+    mini_fat = []
+    if sectores_mini_fat:
+        tabla = cadena(primer_mini_fat, fat, sector_archivo, tamano_sector)
+        mini_fat = list(struct.unpack(f'<{len(tabla) // 4}I', tabla))
+
+    def sector_mini(sector, tamano):
+        return mini_flujo[sector * tamano:(sector + 1) * tamano]
+
+    flujos = {}
+    for nombre, tipo, primer_sector, tamano in entradas:
+        if tipo != 2:  # 2: flujo (las demás son carpetas o entradas sin usar)
+            continue
+        if tamano < corte_mini:
+            flujos[nombre] = cadena(primer_sector, mini_fat, sector_mini, tamano_mini)[:tamano]
+        else:
+            flujos[nombre] = cadena(primer_sector, fat, sector_archivo, tamano_sector)[:tamano]
+    return flujos
+
+# Texto SIMAN de un archivo .p: el del flujo 'Contents' si es un documento compuesto, o el archivo entero si es texto
+def texto_programa(ruta):
+    with open(ruta, 'rb') as archivo:
+        datos = archivo.read()
+    if datos.startswith(FIRMA_OLE):
+        flujos = flujos_ole(datos)
+        if 'Contents' not in flujos:
+            raise ErrorArena(f"{ruta}: el documento no tiene el flujo 'Contents' con el programa SIMAN")
+        datos = flujos['Contents']
+    return datos.decode('latin-1')
+
+# Divide en el separador sólo fuera de los paréntesis: 'CREATE,1,EXPO(60,2)' -> ['CREATE', '1', 'EXPO(60,2)']
+def dividir(texto, separador):
+    partes = ['']
+    nivel = 0
+    for caracter in texto:
+        if caracter == separador and nivel == 0:
+            partes.append('')
+            continue
+        nivel += (caracter == '(') - (caracter == ')')
+        partes[-1] += caracter
+    return [parte.strip() for parte in partes]
+
+# Expresión numérica constante de SIMAN ('(97)/100', '0.5'); sólo números, operadores y paréntesis
+def evaluar_constante(expresion):
+    if not re.fullmatch(r'[\d.eE\s()+\-*/]+', expresion):
+        raise ErrorArena(f"la expresión '{expresion}' no es una constante")
+    return float(eval(expresion, {'__builtins__': {}}))
+
+# Expresión de tiempo de SIMAN como (distribución, parámetros en segundos): 'MinutesToBaseTime(Uniform(0.8,1.5))' ->
+# ('uniforme', (48.0, 90.0)). Sin conversión explícita la expresión está en la unidad base del modelo
+def tiempo_siman(expresion, segundos_base):
+    expresion = expresion.strip()
+    conversion = re.fullmatch(r'(\w+?)ToBaseTime\((.*)\)', expresion, re.IGNORECASE)
+    if conversion:
+        unidad = conversion.group(1).lower()
+        if unidad not in SEGUNDOS_UNIDAD:
+            raise ErrorArena(f"unidad de tiempo desconocida en '{expresion}'")
+        return tiempo_siman(conversion.group(2), SEGUNDOS_UNIDAD[unidad])
+    funcion = re.fullmatch(r'(\w+)\((.*)\)', expresion)
+    if funcion is None:
+        valor = evaluar_constante(expresion) * segundos_base
+        return 'uniforme', (valor, valor)
+    nombre = funcion.group(1).lower()
+    if nombre not in DISTRIBUCIONES_SIMAN:
+        raise ErrorArena(f"distribución de SIMAN no admitida en '{expresion}' (se admiten {', '.join(sorted(DISTRIBUCIONES_SIMAN))})")
+    distribucion, cantidad = DISTRIBUCIONES_SIMAN[nombre]
+    argumentos = [evaluar_constante(argumento) for argumento in dividir(funcion.group(2), ',')]
+    if len(argumentos) not in (cantidad, cantidad + 1):
+        raise ErrorArena(f"'{expresion}': {nombre} lleva {cantidad} parámetros (y opcionalmente el flujo)")
+    parametros = argumentos[:cantidad]
+    # Todos los parámetros son tiempos salvo el desvío de la normal, que también se escala
+    return distribucion, tuple(parametro * segundos_base for parametro in parametros)
+
+# Bloque del modelo SIMAN: etiqueta ('174$' o None), nombre ('CREATE') y operandos, agrupados como en el texto
+# ('CREATE,1,X,Gran Porte:EXPO(60):NEXT(175$)' -> [['1', 'X', 'Gran Porte'], ['EXPO(60)'], ['NEXT(175$)']])
+class Bloque:
+    __slots__ = ('etiqueta', 'nombre', 'grupos', 'siguiente')
+
+    def __init__(self, texto):
+        partes = re.fullmatch(r'(\d+\$)?([A-Z]+)(.*)', texto, re.DOTALL)
+        if partes is None:
+            raise ErrorArena(f"bloque SIMAN ilegible: '{texto[:60]}'")
+        self.etiqueta, self.nombre, resto = partes.groups()
+        grupos = dividir(resto, ':')
+        grupos[0] = grupos[0][1:] if grupos[0].startswith(',') else grupos[0]
+        self.grupos = [dividir(grupo, ',') for grupo in grupos]
+        self.siguiente = None  # Etiqueta del bloque siguiente si el bloque termina en NEXT(...); si no, es el que le sigue en el texto
+        if len(self.grupos) > 1:
+            proximo = re.fullmatch(r'NEXT\((\d+\$)\)', self.grupos[-1][0])
+            if proximo:
+                self.siguiente = proximo.group(1)
+                self.grupos.pop()
+
+    def operando(self, grupo, indice, defecto=''):
+        operandos = self.grupos[grupo] if grupo < len(self.grupos) else []
+        return operandos[indice] if indice < len(operandos) else defecto
+
+# Cabina de Arena: un STATION con su cola, el recurso que toma (None en una estación sin recurso) y su tiempo de atención
+class CabinaArena:
+    def __init__(self, nombre, estacion, cola, recurso, servicio):
+        self.nombre = nombre
+        self.estacion = estacion
+        self.cola = cola
+        self.recurso = recurso
+        self.servicio = servicio  # (distribución, parámetros en segundos), como en escenarios.py
+
+# Modelo importado: llegadas por tipo de entidad, cabinas, caminos de los vehículos hasta las cabinas y experimento
+class ModeloArena:
+    def __init__(self, texto, origen='modelo'):
+        self.origen = origen
+        inicio_modelo = re.search(r'(?:^|\x00)(\d+\$[A-Z]+[,:;])', texto)
+        if inicio_modelo is None:
+            raise ErrorArena(f"{origen}: no se encontraron los bloques del modelo SIMAN")
+        experimento = texto[:inicio_modelo.start(1)].replace('\x00', ',')
+        modelo = texto[inicio_modelo.start(1):].split('\x00', 1)[0]
+        self.bloques = [Bloque(parte) for parte in modelo.split(';') if parte.strip()]
+        self.etiquetas = {bloque.etiqueta: indice for indice, bloque in enumerate(self.bloques) if bloque.etiqueta}
+        self.leer_experimento(experimento)
+        self.cabinas = {}  # {estación: CabinaArena}
+        self.llegadas = {}  # {entidad: (distribución, parámetros en segundos)}
+        self.caminos = {}  # {entidad: [(probabilidad, [estaciones entre las que elige])]}
+        for indice, bloque in enumerate(self.bloques):
+            if bloque.nombre == 'CREATE':
+                self.leer_llegada(indice, bloque)
+
+    # Elementos del experimento que usa la importación (los demás son de la animación y de los informes)
+    def leer_experimento(self, experimento):
+        replicas = re.search(r'REPLICATE,([^;]*);', experimento)
+        campos = dividir(replicas.group(1), ',') if replicas else []
+        self.replicas = int(evaluar_constante(campos[0])) if campos and campos[0] else 1
+        self.unidad_base = campos[9].lower() if len(campos) > 9 and campos[9].lower() in SEGUNDOS_UNIDAD else 'hours'
+        self.segundos_base = SEGUNDOS_UNIDAD[self.unidad_base]
+        self.tiempo_final = None  # Sin largo de réplica Arena corre hasta que se acaban las entidades
+        if len(campos) > 2 and campos[2]:
+            distribucion, parametros = tiempo_siman(campos[2], self.segundos_base)
+            self.tiempo_final = parametros[0]
+        # Programas de capacidad: {nombre: [(capacidad, duración en segundos o None si es la última)]}
+        self.programas = {}
+        programas = re.search(r'SCHEDULES:(.*?);', experimento)
+        for programa in dividir(programas.group(1), ':') if programas else []:
+            nombre = dividir(programa, ',')[0]
+            unidad = re.search(r'UNITS\((\w+)\)', programa)
+            segundos = SEGUNDOS_UNIDAD.get(unidad.group(1).lower(), self.segundos_base) if unidad else self.segundos_base
+            tramos = []
+            datos = re.search(r'DATA(\(.*)$', programa)
+            for tramo in re.findall(r'\(([^()]*)\)', datos.group(1) if datos else ''):
+                valores = [evaluar_constante(valor) for valor in dividir(tramo, ',') if valor]
+                tramos.append((int(valores[0]), valores[1] * segundos if len(valores) > 1 else None))
+            self.programas[nombre] = tramos
+        # Recursos: {nombre: programa de capacidad o capacidad fija}
+        self.recursos = {}
+        recursos = re.search(r'RESOURCES:(.*?);', experimento)
+        for recurso in re.finditer(r'(?:^|:)([^:,]+),(?:Schedule\(([^,)]+)|Capacity\((\d+))', recursos.group(1) if recursos else ''):
+            self.recursos[recurso.group(1).strip()] = recurso.group(2) if recurso.group(2) else int(recurso.group(3))
+        # PickStation: {nombre: [estaciones]}; cada fila de la expresión es estación, cola, ...
+        self.seleccion_estaciones = {}
+        for expresion in re.finditer(r'([\w ]+?)\((\d+),(\d+)\),([^:;]*)', re.search(r'EXPRESSIONS:(.*?);', experimento).group(1)
+                                     if 'EXPRESSIONS:' in experimento else ''):
+            columnas, filas = int(expresion.group(2)), int(expresion.group(3))
+            valores = dividir(expresion.group(4), ',')
+            self.seleccion_estaciones[expresion.group(1).strip()] = [valores[fila * columnas] for fila in range(filas)]
+
+    def leer_llegada(self, indice, bloque):
+        entidad = bloque.operando(0, 2)
+        if bloque.operando(0, 0, '1') not in ('', '1'):
+            raise ErrorArena(f"{self.origen}: la llegada de '{entidad}' crea lotes de {bloque.operando(0, 0)} entidades")
+        distribucion, parametros = tiempo_siman(bloque.operando(1, 0), self.segundos_base)
+        if distribucion != 'exponencial':
+            raise ErrorArena(f"{self.origen}: las llegadas de '{entidad}' no son exponenciales ({distribucion}); el simulador usa procesos de Poisson")
+        self.llegadas[entidad] = (distribucion, parametros)
+        self.caminos[entidad] = self.destinos(self.proximo(indice), 1.0, set())
+        for _, estaciones in self.caminos[entidad]:
+            for estacion in estaciones:
+                if estacion not in self.cabinas:
+                    self.cabinas[estacion] = self.leer_cabina(estacion)
+
+    def proximo(self, indice):
+        siguiente = self.bloques[indice].siguiente
+        if siguiente is None:
+            return indice + 1
+        if siguiente not in self.etiquetas:
+            raise ErrorArena(f"{self.origen}: el bloque {self.bloques[indice].etiqueta} sigue en {siguiente}, que no existe")
+        return self.etiquetas[siguiente]
+
+    # Caminos de una entidad desde el bloque "indice" como [(probabilidad, [estaciones])]: cada BRANCH reparte la probabilidad
+    # y cada camino termina en una estación, en un PickStation (varias estaciones, se elige la de menor cola) o sale del sistema
+    def destinos(self, indice, probabilidad, visitados):
+        while indice < len(self.bloques):
+            if indice in visitados:
+                raise ErrorArena(f"{self.origen}: el camino de las entidades tiene un ciclo en el bloque {self.bloques[indice].etiqueta}")
+            visitados = visitados | {indice}
+            bloque = self.bloques[indice]
+            if bloque.nombre == 'BRANCH':
+                caminos = []
+                resto = 1.0
+                for grupo in bloque.grupos[1:]:
+                    if grupo[0].lower() == 'with':
+                        fraccion = evaluar_constante(grupo[1])
+                        resto -= fraccion
+                        caminos += self.destinos(self.etiquetas[grupo[2]], probabilidad * fraccion, visitados)
+                    elif grupo[0].lower() == 'else':
+                        caminos += self.destinos(self.etiquetas[grupo[1]], probabilidad * max(resto, 0.0), visitados)
+                    else:
+                        raise ErrorArena(f"{self.origen}: BRANCH {bloque.etiqueta}: rama '{grupo[0]}' no admitida (sólo With y Else)")
+                return caminos
+            if bloque.nombre == 'FINDJ':
+                seleccion = re.search(r'([A-Za-z_][\w ]*?)\(\d+,J\)', ':'.join(','.join(grupo) for grupo in bloque.grupos))
+                if seleccion is None or seleccion.group(1) not in self.seleccion_estaciones:
+                    raise ErrorArena(f"{self.origen}: FINDJ {bloque.etiqueta} no usa una expresión PickStation conocida")
+                return [(probabilidad, self.seleccion_estaciones[seleccion.group(1)])]
+            if bloque.nombre in ('STATION', 'ROUTE'):
+                estacion = bloque.operando(0, 0) if bloque.nombre == 'STATION' else bloque.operando(1, 1)
+                return [(probabilidad, [estacion])]
+            if bloque.nombre == 'DISPOSE':
+                return []
+            indice = self.proximo(indice)
+        return []
+
+    # Cabina de una estación: su cola, el recurso que toma y la demora mientras lo tiene (o la demora sin recurso)
+    def leer_cabina(self, estacion):
+        indice = next((indice for indice, bloque in enumerate(self.bloques) if bloque.nombre == 'STATION' and bloque.operando(0, 0) == estacion), None)
+        if indice is None:
+            raise ErrorArena(f"{self.origen}: no existe la estación '{estacion}'")
+        cola = recurso = servicio = None
+        nombre = estacion
+        indice += 1
+        while indice < len(self.bloques) and self.bloques[indice].nombre not in ('STATION', 'DISPOSE', 'ROUTE', 'RELEASE'):
+            bloque = self.bloques[indice]
+            if bloque.nombre == 'QUEUE':
+                cola = bloque.operando(0, 0)
+                nombre = cola[:-len('.Queue')] if cola.endswith('.Queue') else cola
+            elif bloque.nombre == 'SEIZE':
+                recurso = bloque.operando(1, 0)
+            elif bloque.nombre == 'DELAY' and bloque.operando(1, 0) not in ('0', '0.0'):
+                servicio = tiempo_siman(bloque.operando(1, 0), self.segundos_base)
+            elif bloque.nombre == 'ASSIGN' and nombre == estacion:
+                contador = re.match(r'(.+?)\.NumberIn=', bloque.operando(1, 0))  # Los contadores del módulo Process llevan su nombre
+                nombre = contador.group(1) if contador else nombre
+            indice = self.proximo(indice)
+        if servicio is None:
+            raise ErrorArena(f"{self.origen}: la estación '{estacion}' no tiene tiempo de atención")
+        return CabinaArena(nombre, estacion, cola, recurso, servicio)
+
+    def capacidad(self, recurso):
+        programa = self.recursos.get(recurso, 1)
+        if isinstance(programa, int):
+            return [(programa, None)]
+        if programa not in self.programas:
+            raise ErrorArena(f"{self.origen}: el recurso '{recurso}' usa el programa '{programa}', que no existe")
+        return self.programas[programa]
+
+    # Cabinas simuladas (las que toman un recurso) y estaciones sin recurso, que no se simulan
+    def cabinas_con_recurso(self):
+        return [cabina for cabina in self.cabinas.values() if cabina.recurso is not None]
+
+    def carriles_sin_recurso(self):
+        return [cabina for cabina in self.cabinas.values() if cabina.recurso is None]
+
+    # Probabilidad de que un vehículo de cada tipo vaya a las cabinas con recurso (a cualquiera de ellas)
+    def fraccion_cabinas(self, entidad):
+        con_recurso = {cabina.estacion for cabina in self.cabinas_con_recurso()}
+        return sum(probabilidad for probabilidad, estaciones in self.caminos[entidad] if set(estaciones) <= con_recurso)
+
+    # Cabinas habilitadas en cada momento del día según los programas de los recursos, como (cabinas a las 0 hs, plan de
+    # cabinas) del formato de escenarios.py. Los programas se repiten al terminar (en Arena, la última capacidad de un
+    # programa sin duración queda hasta el final)
+    def plan_cabinas(self):
+        programas = [self.capacidad(cabina.recurso) for cabina in self.cabinas_con_recurso()]
+
+        def capacidad_en(tramos, segundo):
+            ciclo = sum(duracion for _, duracion in tramos) if all(duracion for _, duracion in tramos) else None
+            if ciclo:
+                segundo %= ciclo
+            for capacidad, duracion in tramos:
+                if duracion is None or segundo < duracion:
+                    return capacidad
+                segundo -= duracion
+            return tramos[-1][0]
+
+        bordes = {0.0}
+        for tramos in programas:
+            if all(duracion for _, duracion in tramos):
+                ciclo = sum(duracion for _, duracion in tramos)
+                acumulado = 0.0
+                while acumulado < 86400:
+                    for _, duracion in tramos:
+                        acumulado += duracion
+                        bordes.add(acumulado % 86400)
+                    if ciclo <= 0:
+                        break
+        bordes = sorted(borde for borde in bordes if borde < 86400) + [86400]
+        cabinas = [sum(capacidad_en(tramos, inicio) for tramos in programas) for inicio in bordes[:-1]]
+        plan = [[inicio / 3600, fin / 3600, total] for inicio, fin, total in zip(bordes, bordes[1:], cabinas) if total != cabinas[0]]
+        return cabinas[0], plan
+
+    # Tiempo de atención común a todos los vehículos: mezcla de las cabinas con peso proporcional a su tasa de atención
+    def servicio_cabinas(self):
+        componentes = []
+        for cabina in self.cabinas_con_recurso():
+            distribucion, parametros = cabina.servicio
+            if distribucion not in DISTRIBUCIONES:
+                raise ErrorArena(f"{self.origen}: {cabina.nombre}: la distribución '{distribucion}' no está registrada en muestreo.py")
+            media, _ = momentos_distribucion(distribucion, parametros)
+            componentes.append([1 / media, distribucion, list(parametros)])
+        if len(componentes) == 1:
+            return {'distribucion': componentes[0][1], 'parametros': componentes[0][2]}
+        return {'distribucion': 'mezcla', 'parametros': componentes}
+
+    # El escenario en el formato de escenarios.py (un diccionario como el que se lee de un TOML)
+    def datos_escenario(self, tiempo_final=None, replicas=None):
+        if not self.cabinas_con_recurso():
+            raise ErrorArena(f"{self.origen}: el modelo no tiene cabinas que tomen un recurso")
+        servicio = self.servicio_cabinas()
+        vehiculos = {}
+        for entidad, (_, (media,)) in self.llegadas.items():
+            tipo = ENTIDADES_VEHICULO.get(entidad)
+            fraccion = self.fraccion_cabinas(entidad)
+            vehiculos[tipo.name if tipo is not None else entidad] = {
+                'entre_llegadas': {'distribucion': 'exponencial', 'no_pico': media / fraccion if fraccion > 0 else 0},
+                'servicio': servicio,
+            }
+        cabinas, plan = self.plan_cabinas()
+        tiempo_final = tiempo_final or self.tiempo_final or 86400
+        return {
+            'nombre': f"Arena: {os.path.splitext(os.path.basename(self.origen))[0]}",
+            'simulacion': {'tiempo_final': tiempo_final, 'disciplina': 'fifo', 'replicas': replicas or self.replicas},
+            'vehiculos': vehiculos,
+            'estaciones': [{'nombre': ', '.join(cabina.nombre for cabina in self.cabinas_con_recurso()), 'cabinas': max(cabinas, 1),
+                            'plan_cabinas': plan}],
+        }
+
+    def escenario(self, tiempo_final=None, replicas=None):
+        return compilar_escenario(self.datos_escenario(tiempo_final, replicas), origen=self.origen)
+
+    def informar(self, nivel=logging.INFO):
+        registro.log(nivel, "Modelo de Arena %s: %d réplicas de %.2f horas", self.origen, self.replicas, (self.tiempo_final or 0) / 3600)
+        for entidad, (_, (media,)) in self.llegadas.items():
+            caminos = ", ".join(f"{probabilidad:.0%} a {' o '.join(estaciones)}" for probabilidad, estaciones in self.caminos[entidad])
+            registro.log(nivel, "  Llegadas de %s: exponencial de media %.0f s (%s)", entidad, media, caminos)
+        for cabina in self.cabinas.values():
+            distribucion, parametros = cabina.servicio
+            registro.log(nivel, "  %s (%s): %s %s s, recurso %s%s", cabina.nombre, cabina.estacion, distribucion,
+                         ", ".join(f"{parametro:g}" for parametro in parametros), cabina.recurso or "ninguno",
+                         "" if cabina.recurso else " (no se simula: sus vehículos no esperan)")
+
+def importar_modelo(ruta):
+    return ModeloArena(texto_programa(ruta), origen=ruta)
+
+# Estadística de un informe de Arena: media, semiancho (None si Arena no lo pudo calcular: '(Insuf)' o '(Corr)'), mínimo,
+# máximo y observaciones (en las variables discretas, el valor final)
+class EstadisticaArena:
+    __slots__ = ('media', 'semiancho', 'minimo', 'maximo', 'ultimo')
+
+    def __init__(self, media, semiancho=None, minimo=None, maximo=None, ultimo=None):
+        self.media = media
+        self.semiancho = semiancho
+        self.minimo = minimo
+        self.maximo = maximo
+        self.ultimo = ultimo
+
+# Informe de una réplica en el .out de SIMAN
+class ReplicaArena:
+    def __init__(self, numero, replicas):
+        self.numero = numero
+        self.replicas = replicas
+        self.fin = None  # Tiempo en que terminó la réplica, en segundos
+        self.unidad_base = 'hours'
+        self.error = None  # Error de ejecución que cortó la corrida (por ejemplo el límite de entidades de la licencia)
+        self.tally = {}  # Estadísticas por observación (tiempos por entidad)
+        self.continuas = {}  # Estadísticas ponderadas por tiempo (colas, recursos ocupados, trabajo en proceso)
+        self.salidas = {}  # Valores finales (OUTPUTS: contadores, tiempos acumulados)
+
+    @property
+    def segundos_base(self):
+        return SEGUNDOS_UNIDAD.get(self.unidad_base, 3600)
+
+def numero_arena(texto):
+    if texto.startswith('(') or texto == '--':
+        return None
+    return float(texto)
+
+# Lee los informes de réplica de un .out de SIMAN; los errores de ejecución se asocian al informe que les sigue
+def leer_salida(ruta):
+    with open(ruta, encoding='latin-1') as archivo:
+        lineas = archivo.read().splitlines()
+    replicas = []
+    error = None
+    seccion = None
+    for indice, linea in enumerate(lineas):
+        detectado = re.match(r'A runtime error was detected at time ([\d.Ee+-]+)', linea)
+        if detectado:
+            # El mensaje es el último renglón antes de la lista de causas posibles ('Maximum of 150 entities exceeded.')
+            causas = next((posterior for posterior in range(indice + 1, len(lineas)) if lineas[posterior].startswith('Possible causes')), None)
+            mensaje = next((lineas[anterior].strip() for anterior in range(causas - 1, indice, -1) if lineas[anterior].strip()), None) if causas else None
+            error = f"{mensaje or 'error de ejecución'} (tiempo {detectado.group(1)})"
+            continue
+        resumen = re.search(r'Summary for Replication (\d+) of (\d+)', linea)
+        if resumen:
+            replicas.append(ReplicaArena(int(resumen.group(1)), int(resumen.group(2))))
+            replicas[-1].error, error = error, None
+            seccion = None
+            continue
+        if not replicas:
+            continue
+        replica = replicas[-1]
+        fin = re.match(r'Replication ended at time\s*:\s*([\d.Ee+-]+)\s*(\w+)', linea)
+        unidad = re.match(r'Base Time Units:\s*(\w+)', linea)
+        if unidad:
+            replica.unidad_base = unidad.group(1).lower()
+        if fin:
+            replica.fin = float(fin.group(1)) * SEGUNDOS_UNIDAD.get(fin.group(2).lower(), 3600)
+            continue
+        titulo = linea.strip()
+        if titulo in ('TALLY VARIABLES', 'DISCRETE-CHANGE VARIABLES', 'OUTPUTS'):
+            seccion = {'TALLY VARIABLES': replica.tally, 'DISCRETE-CHANGE VARIABLES': replica.continuas, 'OUTPUTS': replica.salidas}[titulo]
+            continue
+        if seccion is None or not titulo or titulo.startswith(('Identifier', '___')):
+            continue
+        columnas = re.split(r'\s{2,}', titulo)
+        if seccion is replica.salidas and len(columnas) == 2:
+            seccion[columnas[0]] = numero_arena(columnas[1])
+        elif len(columnas) >= 2:
+            valores = columnas[1].split() + [valor for columna in columnas[2:] for valor in columna.split()]
+            if len(valores) == 5:
+                media, semiancho, minimo, maximo, ultimo = (numero_arena(valor) for valor in valores)
+                seccion[columnas[0]] = EstadisticaArena(media, semiancho, minimo, maximo, ultimo)
+    return replicas
+
+# Métricas de la validación: cómo se calculan del informe de Arena (con el modelo importado) y del simulador.
+# Los tiempos se comparan en segundos
+def metricas_arena(modelo, replica):
+    cabinas = modelo.cabinas_con_recurso()
+    segundos = replica.segundos_base
+
+    def tally(nombre):
+        return replica.tally.get(nombre)
+
+    esperas = [(tally(f"{cabina.nombre}.WaitTimePerEntity"), replica.salidas.get(f"{cabina.nombre} Number Out")) for cabina in cabinas]
+    valores = {}
+    if all(espera is not None and espera.media is not None and atendidos for espera, atendidos in esperas):
+        valores['espera'] = sum(espera.media * atendidos for espera, atendidos in esperas) / sum(atendidos for _, atendidos in esperas) * segundos
+    for metrica, nombre in (('llegadas', 'Number In'), ('vehiculos_atendidos', 'Number Out')):
+        contadores = [replica.salidas.get(f"{cabina.nombre} {nombre}") for cabina in cabinas]
+        if None not in contadores:
+            valores[metrica] = sum(contadores)
+    colas = [replica.continuas.get(f"{cabina.cola}.NumberInQueue") for cabina in cabinas]
+    if None not in colas:
+        valores['largo_cola'] = sum(cola.media for cola in colas)
+    utilizaciones = [replica.continuas.get(f"{cabina.recurso}.Utilization") for cabina in cabinas]
+    if None not in utilizaciones:
+        valores['utilizacion'] = statistics.mean(utilizacion.media for utilizacion in utilizaciones)
+    # Por tipo de entidad (las que llegan a las cabinas simuladas): espera (tally WaitTime) y entidades en el sistema
+    # ponderadas por tiempo (WIP); la suma de los WIP es L de la estación
+    entidades = [entidad for entidad in modelo.llegadas if modelo.fraccion_cabinas(entidad) > 0]
+    en_sistema = [replica.continuas.get(f"{entidad}.WIP") for entidad in entidades]
+    for entidad, wip in zip(entidades, en_sistema):
+        espera = tally(f"{entidad}.WaitTime")
+        if espera is not None and espera.media is not None:
+            valores[f'espera:{entidad}'] = espera.media * segundos
+        if wip is not None:
+            valores[f'largo_sistema:{entidad}'] = wip.media
+    if entidades and None not in en_sistema:
+        valores['largo_sistema'] = sum(wip.media for wip in en_sistema)
+    return valores
+
+def metricas_simulacion(resultados):
+    estacion = next(iter(resultados.largo_cola))
+    metricas = {'espera': resultados.espera['media'], 'llegadas': resultados.vehiculos_llegados, 'vehiculos_atendidos': resultados.vehiculos_atendidos,
+                'largo_cola': resultados.largo_cola[estacion], 'utilizacion': resultados.utilizacion[estacion],
+                'largo_sistema': resultados.largo_sistema[estacion], 'en_sistema': resultados.vehiculos_llegados - resultados.vehiculos_atendidos}
+    for tipo, clase in (resultados.por_tipo or {}).items():
+        entidad = ENTIDADES_TIPO.get(tipo, tipo)
+        metricas[f'espera:{entidad}'] = clase['espera']
+        metricas[f'largo_sistema:{entidad}'] = clase['largo_sistema']
+    return metricas
+
+NOMBRES_METRICAS = {
+    'espera': 'Espera promedio (s)',
+    'llegadas': 'Vehículos llegados a las cabinas',
+    'vehiculos_atendidos': 'Vehículos atendidos',
+    'largo_cola': 'Vehículos en cola (promedio)',
+    'utilizacion': 'Utilización de las cabinas',
+    'largo_sistema': 'Vehículos en el sistema (promedio)',
+    'en_sistema': 'Vehículos en el sistema al final',
+}
+
+# Las métricas por tipo de entidad se nombran 'métrica:entidad'
+def nombre_metrica(metrica):
+    base, _, entidad = metrica.partition(':')
+    return f"{NOMBRES_METRICAS[base]}, {entidad}" if entidad else NOMBRES_METRICAS[base]
+
+# Una réplica del escenario importado; función de módulo para poder enviarla a otros procesos
+def ejecutar_replica_validacion(parametros):
+    configuracion, semilla = parametros
+    simulacion = SimulacionCabinas(semilla=semilla, estadisticas_por_tipo=True, **configuracion)
+    return metricas_simulacion(simulacion.ejecutar())
+
+def replicas_simulacion(escenario, replicas, semilla, procesos=1):
+    parametros = [(escenario.configuracion, semilla_replica) for semilla_replica in generar_semillas(semilla, replicas)]
+    if procesos == 1:
+        return [ejecutar_replica_validacion(parametro) for parametro in parametros]
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        return list(ejecutor.map(ejecutar_replica_validacion, parametros))
+
+# Compara cada métrica de Arena con las réplicas del simulador. Si Arena informa el semiancho (varias réplicas o medias de
+# lotes), coinciden cuando la diferencia de las medias es menor que la combinación de los dos semianchos; si no (una sola
+# réplica, '(Insuf)'), cuando el valor de Arena cae en el intervalo de predicción de una réplica nueva del simulador,
+# media ± t * desvío * raíz(1 + 1/n)
+def comparar(arena, semianchos_arena, simulacion, confianza=0.95):
+    comparacion = {}
+    for metrica, valor_arena in arena.items():
+        valores = [resultado[metrica] for resultado in simulacion]
+        media, inferior, superior = intervalo_t(valores, confianza)
+        semiancho = (superior - inferior) / 2
+        semiancho_arena = semianchos_arena.get(metrica)
+        if semiancho_arena is not None:
+            tolerancia = math.hypot(semiancho, semiancho_arena)
+            criterio = 'intervalos de confianza'
+        else:
+            tolerancia = cuantil_t(0.5 + confianza / 2, len(valores) - 1) * statistics.stdev(valores) * math.sqrt(1 + 1 / len(valores))
+            criterio = 'intervalo de predicción'
+        comparacion[metrica] = {'arena': valor_arena, 'semiancho_arena': semiancho_arena, 'media': media, 'semiancho': semiancho,
+                                'rango': (media - tolerancia, media + tolerancia), 'criterio': criterio,
+                                'coincide': abs(valor_arena - media) <= tolerancia}
+    return comparacion
+
+# Validación completa: importa el modelo, lee la salida de Arena, simula el escenario con el horizonte en que terminó la
+# corrida de Arena (la licencia de estudiante la corta a las 150 entidades) y compara; después corre el experimento completo
+# del modelo (REPLICATE) sin límite de entidades
+def validar(ruta_modelo, ruta_salida, replicas=None, semilla=None, procesos=1, confianza=0.95, completo=True):
+    modelo = importar_modelo(ruta_modelo)
+    modelo.informar()
+    informes = leer_salida(ruta_salida)
+    if not informes:
+        raise ErrorArena(f"{ruta_salida}: no hay informes de réplica")
+    semilla = semilla_maestra(semilla)
+    replicas = replicas or modelo.replicas
+    procesos = procesos or os.cpu_count()
+    # Con varios informes (una corrida sin cortes) el semiancho es el de las réplicas de Arena
+    metricas = [metricas_arena(modelo, informe) for informe in informes]
+    comunes = [metrica for metrica in metricas[0] if all(metrica in valores for valores in metricas)]
+    arena = {metrica: statistics.mean(valores[metrica] for valores in metricas) for metrica in comunes}
+    semianchos = {}
+    if len(metricas) > 1:
+        for metrica in comunes:
+            _, inferior, superior = intervalo_t([valores[metrica] for valores in metricas], confianza)
+            semianchos[metrica] = (superior - inferior) / 2
+    horizonte = informes[0].fin or modelo.tiempo_final
+    for informe in informes:
+        if informe.error:
+            registro.info("Arena, réplica %d de %d: %s", informe.numero, informe.replicas, informe.error)
+    registro.info("Comparación con %d informe(s) de Arena, %d réplicas del simulador de %.4f horas (semilla %d):", len(informes), replicas, horizonte / 3600, semilla)
+    comparacion = comparar(arena, semianchos, replicas_simulacion(modelo.escenario(tiempo_final=horizonte), replicas, semilla, procesos), confianza)
+    for metrica, fila in comparacion.items():
+        registro.info("  %-52s Arena %10.3f%s  simulador %10.3f ± %-8.3f  %s (%s %.3f a %.3f)", nombre_metrica(metrica), fila['arena'],
+                      f" ± {fila['semiancho_arena']:.3f}" if fila['semiancho_arena'] is not None else " (Insuf)", fila['media'], fila['semiancho'],
+                      "coincide" if fila['coincide'] else "NO COINCIDE", fila['criterio'], *fila['rango'])
+    resultado = {'semilla': semilla, 'horizonte': horizonte, 'comparacion': comparacion, 'coinciden': all(fila['coincide'] for fila in comparacion.values())}
+    if completo:
+        escenario = modelo.escenario()
+        valores = replicas_simulacion(escenario, replicas, semilla, procesos)
+        registro.info("Experimento completo del modelo: %d réplicas de %.2f horas, sin límite de entidades:", replicas, escenario.configuracion['tiempo_final'] / 3600)
+        resumen = {}
+        for metrica in NOMBRES_METRICAS:
+            media, inferior, superior = intervalo_t([valor[metrica] for valor in valores], confianza)
+            resumen[metrica] = (media, inferior, superior)
+            registro.info("  %-52s %10.3f (%.3f, %.3f)", NOMBRES_METRICAS[metrica], media, inferior, superior)
+        excedidas = sum(valor['en_sistema'] > LIMITE_ENTIDADES_DEMO for valor in valores)
+        registro.info("  %d de %d réplicas terminan con más de %d vehículos en el sistema (el límite de la licencia de estudiante)",
+                      excedidas, replicas, LIMITE_ENTIDADES_DEMO)
+        resultado['completo'] = resumen
+    return resultado
+
+# Valida el simulador contra Arena:  python arena.py ../tp_gonzalo_benito_182885.p ../tp_gonzalo_benito_182885.out [--replicas 50]
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    directorio = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    argumentos = argparse.ArgumentParser(description='Importa el modelo de Arena y compara el simulador con la salida de SIMAN')
+    argumentos.add_argument('modelo', nargs='?', default=os.path.join(directorio, 'tp_gonzalo_benito_182885.p'))
+    argumentos.add_argument('salida', nargs='?', default=os.path.join(directorio, 'tp_gonzalo_benito_182885.out'))
+    argumentos.add_argument('--replicas', type=int, default=None, help='por defecto, las del experimento de Arena')
+    argumentos.add_argument('--semilla', type=int, default=None)
+    argumentos.add_argument('--procesos', type=int, default=1, help='0: todos los núcleos')
+    argumentos.add_argument('--sin-completo', action='store_true', help='sólo la comparación, sin el experimento completo')
+    opciones = argumentos.parse_args()
+    validar(opciones.modelo, opciones.salida, opciones.replicas, opciones.semilla, opciones.procesos or None, completo=not opciones.sin_completo)
@@ -0,0 +1,202 @@
+import os
+import csv
+import math
+import logging
+import itertools
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from codigo_final_v2 import (SimulacionCabinas, Estacion, estaciones_por_defecto, ejecutar_replica, clave_replica,
+                             horarios_pico_mañana, horarios_pico_vespertino)
+from cache_resultados import CacheResultados, abrir_cache
+from reduccion_varianza import intervalo_media
+from analitico import evaluar
+from semillas import semilla_maestra, generar_semillas
+
+# Barrido de parámetros: se simula cada escenario (una combinación de parámetros) con varias réplicas, repartiendo las
+# celdas (escenario x réplica) en un grupo de procesos. Cada celda terminada se guarda en el cache de resultados
+# (cache_resultados.py), así un barrido interrumpido o ampliado sólo simula lo que falta. Todos los escenarios usan las mismas semillas (números aleatorios comunes).
+# Parámetros posibles: cualquier argumento de SimulacionCabinas (multa_espera, costo_cabina_extra, limite_espera, tiempo_final,
+# disciplina, ...) y además, aplicados a cada estación:
+#   cabinas: cabinas habituales
+#   cabinas_pico: cabinas habilitadas durante los horarios pico (arma el plan de cabinas)
+#   horarios_pico: lista de franjas (hora_inicio, hora_fin); no en estaciones con tabla de tasas propia (de un archivo de escenario)
+PARAMETROS_ESTACION = ('cabinas', 'cabinas_pico', 'horarios_pico')
+
+registro = logging.getLogger('peaje')
+
+# Todas las combinaciones de los valores de cada parámetro: grilla({'multa_espera': [0.1, 0.2], 'cabinas': [1, 2]}) da 4 escenarios
+def grilla(espacio):
+    nombres = list(espacio)
+    return [dict(zip(nombres, valores)) for valores in itertools.product(*(espacio[nombre] for nombre in nombres))]
+
+# Hipercubo latino de n escenarios: el rango de cada parámetro se divide en n franjas y cada franja se usa exactamente una vez.
+# Un rango (mínimo, máximo) de enteros da enteros entre ambos (incluidos), de reales da reales; una lista elige entre sus valores
+def hipercubo_latino(espacio, n, semilla=None):
+    generador = np.random.default_rng(semilla)
+    escenarios = [{} for _ in range(n)]
+    for nombre, valores in espacio.items():
+        uniformes = (generador.permutation(n) + generador.random(n)) / n  # Una uniforme dentro de cada franja, en orden aleatorio
+        for escenario, u in zip(escenarios, uniformes):
+            if isinstance(valores, list):
+                escenario[nombre] = valores[int(u * len(valores))]
+            elif all(isinstance(extremo, int) for extremo in valores):
+                minimo, maximo = valores
+                escenario[nombre] = minimo + int(u * (maximo - minimo + 1))
+            else:
+                minimo, maximo = valores
+                escenario[nombre] = float(minimo + u * (maximo - minimo))
+    return escenarios
+
+# Configuración de SimulacionCabinas para un escenario, partiendo de la configuración base
+def configuracion_escenario(configuracion_base, escenario):
+    configuracion = dict(configuracion_base)
+    configuracion.update((nombre, valor) for nombre, valor in escenario.items() if nombre not in PARAMETROS_ESTACION)
+    if any(nombre in escenario for nombre in PARAMETROS_ESTACION):
+        estaciones = configuracion['estaciones'] or estaciones_por_defecto(configuracion['horarios_pico_mañana'], configuracion['horarios_pico_vespertino'])
+        configuracion['estaciones'] = [estacion_escenario(estacion, escenario) for estacion in estaciones]
+    return configuracion
+
+def estacion_escenario(estacion, escenario):
+    # Una estación con la tabla de tasas ya armada (por ejemplo, la de un archivo de escenario) no recalcula las llegadas
+    # con otros horarios pico: barrerlos cambiaría sólo el plan de cabinas
+    if 'horarios_pico' in escenario and estacion.tabla is not None:
+        raise ValueError(f"La estación {estacion.nombre} tiene su tabla de tasas precalculada: no se pueden barrer sus horarios_pico "
+                         "(cambiar los horarios pico del archivo de escenario)")
+    cabinas = escenario.get('cabinas', estacion.cabinas)
+    horarios_pico = [tuple(franja) for franja in escenario.get('horarios_pico', estacion.horarios_pico)]
+    plan_cabinas = estacion.plan_cabinas
+    if 'cabinas_pico' in escenario:
+        plan_cabinas = [(inicio, fin, escenario['cabinas_pico']) for inicio, fin in horarios_pico]
+    return Estacion(estacion.nombre, cabinas=cabinas, horarios_pico=horarios_pico, plan_cabinas=plan_cabinas, tasas=estacion.tasas,
+                    horarios_pico_fin_de_semana=estacion.horarios_pico_fin_de_semana, tabla=estacion.tabla, resolucion=estacion.resolucion)
+
+# Simula cada escenario con "replicas" réplicas y devuelve la tabla ordenada: una fila por celda con el número de escenario,
+# sus parámetros, la réplica, la semilla, el método y las métricas de resultados_replica. cache es la ruta de la base
+# (o un CacheResultados, para elegir sus límites); por defecto (cache=None) no se guarda nada en disco.
+# Con analitico=True los escenarios en los que la evaluación analítica es confiable (ver analitico.py) no se simulan:
+# tienen una única fila con los valores esperados y método 'analitico'
+def barrer(simulacion, escenarios, replicas, semilla=None, procesos=1, cache=None, analitico=False):
+    semilla = semilla_maestra(semilla)
+    semillas = generar_semillas(semilla, replicas)
+    cache = abrir_cache(cache) if cache is not None else None
+    celdas = []  # (escenario, réplica, semilla, configuración, clave)
+    analiticos = {}  # {escenario: resultados de la evaluación analítica}
+    for numero, escenario in enumerate(escenarios):
+        configuracion = configuracion_escenario(simulacion.configuracion, escenario)
+        if analitico:
+            resultado = evaluar(configuracion)
+            if resultado['confiable']:
+                analiticos[numero] = {metrica: valor for metrica, valor in resultado.items() if metrica not in ('confiable', 'fraccion_confiable')}
+                continue
+        for replica, semilla_replica in enumerate(semillas):
+            celdas.append((numero, replica, semilla_replica, configuracion, clave_replica(configuracion, semilla_replica)))
+
+    resultados = {}
+    if cache is not None:
+        resultados = cache.leer_varias(clave for *_, clave in celdas)
+    pendientes = {clave: (configuracion, semilla_replica) for _, _, semilla_replica, configuracion, clave in celdas if clave not in resultados}
+    registro.info("Barrido: %d escenarios x %d réplicas, %d escenarios resueltos analíticamente, %d celdas en el cache y %d por simular",
+                  len(escenarios), replicas, len(analiticos), len(celdas) - len(pendientes), len(pendientes))
+
+    def terminar(clave, resultado):
+        resultados[clave] = resultado
+        if cache is not None:
+            cache.guardar(clave, resultado)
+
+    procesos = procesos or os.cpu_count()
+    if procesos == 1:
+        for clave, parametros in pendientes.items():
+            terminar(clave, ejecutar_replica(parametros))
+    elif pendientes:
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            futuros = {ejecutor.submit(ejecutar_replica, parametros): clave for clave, parametros in pendientes.items()}
+            for futuro in as_completed(futuros):  # Se guarda cada celda apenas termina
+                terminar(futuros[futuro], futuro.result())
+
+    filas = [{'escenario': numero, **escenarios[numero], 'replica': replica, 'semilla': semilla_replica, 'metodo': 'simulacion', **resultados[clave]}
+             for numero, replica, semilla_replica, _, clave in celdas]
+    filas.extend({'escenario': numero, **escenarios[numero], 'replica': 0, 'semilla': None, 'metodo': 'analitico', **resultado}
+                 for numero, resultado in analiticos.items())
+    return sorted(filas, key=lambda fila: (fila['escenario'], fila['replica']))
+
+# Una fila por escenario con la media y el semiancho del intervalo de confianza de cada métrica
+def resumir(tabla, metricas=('espera', 'multas', 'costo_con_cabina_extra', 'diferencia_costos', 'costo_total'), confianza=0.95):
+    escenarios = {}
+    for fila in tabla:
+        escenarios.setdefault(fila['escenario'], []).append(fila)
+    resumen = []
+    for numero, filas in escenarios.items():
+        fila_resumen = {nombre: filas[0][nombre] for nombre in columnas_escenario(filas[0])}
+        fila_resumen['metodo'] = filas[0]['metodo']
+        fila_resumen['replicas'] = len(filas)
+        for metrica in metricas:
+            valores = [fila[metrica] for fila in filas]
+            if len(valores) > 1:
+                intervalo = intervalo_media(valores, confianza)
+                fila_resumen[f'{metrica}_media'], fila_resumen[f'{metrica}_semiancho'] = intervalo['media'], intervalo['semiancho']
+            else:
+                fila_resumen[f'{metrica}_media'], fila_resumen[f'{metrica}_semiancho'] = float(valores[0]), math.nan
+        resumen.append(fila_resumen)
+    return resumen
+
+# Columnas de la tabla que identifican al escenario (el número y sus parámetros), que en cada fila están antes de 'replica'
+def columnas_escenario(fila):
+    columnas = list(fila)
+    return columnas[:columnas.index('replica')]
+
+# Valor del parámetro en el que la métrica (media por escenario) cambia de signo, interpolando linealmente entre los dos
+# escenarios vecinos. Con 'diferencia_costos' es la multa a partir de la cual conviene habilitar la cabina extra.
+# Devuelve None si la métrica no cambia de signo en el rango barrido
+def punto_equilibrio(resumen, parametro='multa_espera', metrica='diferencia_costos_media'):
+    puntos = sorted((fila[parametro], fila[metrica]) for fila in resumen)
+    for (x0, y0), (x1, y1) in zip(puntos, puntos[1:]):
+        if y0 == 0:
+            return x0
+        if (y0 < 0) != (y1 < 0):
+            return x0 + (x1 - x0) * (0 - y0) / (y1 - y0)
+    if puntos and puntos[-1][1] == 0:
+        return puntos[-1][0]
+    return None
+
+# Escribe la tabla en formato CSV: una columna por parámetro o métrica, una fila por celda (o por escenario si es un resumen)
+def escribir_tabla(tabla, archivo):
+    columnas = list(dict.fromkeys(columna for fila in tabla for columna in fila))
+    with open(archivo, 'w', newline='') as salida:
+        escritor = csv.DictWriter(salida, fieldnames=columnas)
+        escritor.writeheader()
+        escritor.writerows(tabla)
+
+# Multa de equilibrio entre pagar multas y habilitar una cabina extra, en un solo comando:
+#   python barrido.py --multa-minima 0.05 --multa-maxima 0.5 --multas 10 --replicas 30
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    argumentos = argparse.ArgumentParser(description='Barrido de la multa por segundo de espera excesiva')
+    argumentos.add_argument('--multa-minima', type=float, default=0.05)
+    argumentos.add_argument('--multa-maxima', type=float, default=0.5)
+    argumentos.add_argument('--multas', type=int, default=10, help='cantidad de valores de multa de la grilla')
+    argumentos.add_argument('--cabinas', type=int, nargs='*', default=[1], help='cantidades de cabinas habituales a barrer')
+    argumentos.add_argument('--dias', type=float, default=1)
+    argumentos.add_argument('--replicas', type=int, default=30)
+    argumentos.add_argument('--semilla', type=int, default=2024)
+    argumentos.add_argument('--procesos', type=int, default=None, help='por defecto, todos los núcleos')
+    argumentos.add_argument('--cache', default='cache_barrido.sqlite')
+    argumentos.add_argument('--cache-mb', type=float, default=256, help='tamaño máximo del cache, se borran los resultados usados hace más tiempo')
+    argumentos.add_argument('--salida', default='barrido.csv')
+    argumentos.add_argument('--analitico', action='store_true', help='no simular los escenarios que se pueden resolver analíticamente')
+    opciones = argumentos.parse_args()
+
+    simulacion = SimulacionCabinas(opciones.dias * 24*60*60, horarios_pico_mañana, horarios_pico_vespertino, multa_espera=1)
+    escenarios = grilla({'cabinas': opciones.cabinas,
+                         'multa_espera': np.linspace(opciones.multa_minima, opciones.multa_maxima, opciones.multas).tolist()})
+    cache = CacheResultados(opciones.cache, tamano_maximo=int(opciones.cache_mb * 2**20))
+    tabla = barrer(simulacion, escenarios, opciones.replicas, opciones.semilla, opciones.procesos, cache, opciones.analitico)
+    escribir_tabla(tabla, opciones.salida)
+    resumen = resumir(tabla)
+    escribir_tabla(resumen, os.path.splitext(opciones.salida)[0] + '_resumen.csv')
+    for cabinas in opciones.cabinas:
+        equilibrio = punto_equilibrio([fila for fila in resumen if fila['cabinas'] == cabinas])
+        if equilibrio is None:
+            registro.info("%d cabina(s): la decisión no cambia entre multas de %.3f y %.3f", cabinas, opciones.multa_minima, opciones.multa_maxima)
+        else:
+            registro.info("%d cabina(s): conviene habilitar una cabina extra con multas mayores a $%.4f por segundo", cabinas, equilibrio)
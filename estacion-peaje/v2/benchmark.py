@@ -0,0 +1,246 @@
+import os
+import io
+import ast
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import platform
+import resource
+import subprocess
+import contextlib
+from datetime import datetime, timezone
+
+# Benchmark de rendimiento de las distintas generaciones del simulador del peaje sobre escenarios estándar. Para cada motor
+# y escenario informa sucesos por segundo, réplicas por segundo y memoria máxima (RSS pico), y agrega los resultados a un
+# historial JSON: al comparar con la corrida anterior se marcan las regresiones.
+# Cada medición corre en un proceso nuevo, así el RSS pico es el de ese motor y escenario y no arrastra memoria de otros.
+# Motores:
+# - 'simpy': los scripts codigo*.py. Ejecutan todo al importarse, así que se interpreta el script hasta entorno.run (sin
+#   los resultados ni los gráficos), reemplazando las constantes del escenario, y se mide sólo entorno.run. Los sucesos son
+#   los eventos de simpy (timeouts, pedidos y liberaciones de recursos), que son más que los sucesos del modelo
+# - 'clases': v3.py y v4.py, heap de objetos. Se cargan sin las llamadas del final del script
+# - 'calendario': codigo_final_v2.py, calendario de tuplas, con el ciclo en Python o con el núcleo de nucleo.py (compilado
+#   con Numba si está instalado; si no, es el mismo núcleo interpretado y mucho más lento)
+# Los modelos no son idénticos entre versiones (unidades de tiempo, tipos de vehículo, cabinas), así que la comparación entre
+# motores es orientativa; lo importante es seguir la evolución de cada motor de una corrida a otra
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+DIRECTORIO_SIMPY = os.path.dirname(DIRECTORIO)
+
+# Escenarios estándar: días simulados y si la hora pico dura todo el día (una cabina muy saturada)
+ESCENARIOS = {
+    '1_dia': {'dias': 1, 'pico': False},
+    '7_dias': {'dias': 7, 'pico': False},
+    '30_dias': {'dias': 30, 'pico': False},
+    'pico_saturado': {'dias': 1, 'pico': True}
+}
+PICO_TODO_EL_DIA = [(0, 24)]
+
+# Motores: tipo y archivo, más lo que cada tipo necesita para crear y correr una réplica
+MOTORES = {
+    'codigo': {'tipo': 'simpy', 'archivo': os.path.join(DIRECTORIO_SIMPY, 'codigo.py')},
+    'codigo_v2': {'tipo': 'simpy', 'archivo': os.path.join(DIRECTORIO_SIMPY, 'codigo_v2.py')},
+    'codigo_v3': {'tipo': 'simpy', 'archivo': os.path.join(DIRECTORIO_SIMPY, 'codigo_v3.py')},
+    'codigo_v4': {'tipo': 'simpy', 'archivo': os.path.join(DIRECTORIO_SIMPY, 'codigo_v4.py')},
+    'codigo_v5': {'tipo': 'simpy', 'archivo': os.path.join(DIRECTORIO_SIMPY, 'codigo_v5.py')},
+    'codigo_final': {'tipo': 'simpy', 'archivo': os.path.join(DIRECTORIO_SIMPY, 'codigo_final.py')},
+    'v3': {'tipo': 'clases', 'archivo': os.path.join(DIRECTORIO, 'v3.py'), 'clase': 'SimulacionPeaje', 'metodo': 'correr',
+           'picos': ('periodos_pico_A', 'periodos_pico_D'), 'argumentos': (), 'cabinas_libres': 'cabinas_disponibles'},
+    'v4': {'tipo': 'clases', 'archivo': os.path.join(DIRECTORIO, 'v4.py'), 'clase': 'SimulacionCabinas', 'metodo': 'ejecutar',
+           'picos': ('horarios_pico_mañana', 'horarios_pico_vespertino'), 'argumentos': (1,), 'cabinas_libres': 'cabinas_libres'},
+    'codigo_final_v2': {'tipo': 'calendario', 'acelerar': False},
+    'codigo_final_v2_nucleo': {'tipo': 'calendario', 'acelerar': True}
+}
+
+# Memoria máxima del proceso hasta ahora, en MB (ru_maxrss está en KB en Linux y en bytes en macOS)
+def rss_pico():
+    maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maximo / 1024 ** 2 if sys.platform == 'darwin' else maximo / 1024
+
+# Reemplaza el valor de las asignaciones de nivel superior a los nombres dados
+def reemplazar_constantes(sentencias, constantes):
+    for sentencia in sentencias:
+        if isinstance(sentencia, ast.Assign) and len(sentencia.targets) == 1 and isinstance(sentencia.targets[0], ast.Name):
+            if sentencia.targets[0].id in constantes:
+                sentencia.value = ast.parse(repr(constantes[sentencia.targets[0].id]), mode='eval').body
+    return sentencias
+
+def es_llamada(sentencia):
+    return isinstance(sentencia, ast.Expr) and isinstance(sentencia.value, ast.Call)
+
+# Script de simpy hasta entorno.run, con las constantes del escenario y la semilla (codigo_final.py deriva sus generadores
+# de SEMILLA; los demás usan el estado global de random). Las unidades de tiempo de estos scripts son minutos
+def preparar_simpy(motor, escenario, semilla):
+    with open(motor['archivo'], encoding='utf-8') as archivo:
+        arbol = ast.parse(archivo.read(), motor['archivo'])
+    corrida = next(indice for indice, sentencia in enumerate(arbol.body)
+                   if es_llamada(sentencia) and isinstance(sentencia.value.func, ast.Attribute) and sentencia.value.func.attr == 'run')
+    constantes = {'TIEMPO_SIMULACION': escenario['dias'] * 1440, 'SEMILLA': semilla}
+    if escenario['pico']:
+        constantes.update(HORAS_PICO=PICO_TODO_EL_DIA, HORAS_PICO_A=PICO_TODO_EL_DIA, HORAS_PICO_D=PICO_TODO_EL_DIA)
+    arbol.body = reemplazar_constantes(arbol.body[:corrida], constantes)
+    return compile(arbol, motor['archivo'], 'exec')
+
+def replica_simpy(codigo, semilla):
+    random.seed(semilla)
+    espacio = {'__name__': 'benchmark', '__file__': codigo.co_filename}
+    exec(codigo, espacio)
+    entorno = espacio['entorno']
+    inicio = time.perf_counter()
+    entorno.run(until=espacio['TIEMPO_SIMULACION'])
+    segundos = time.perf_counter() - inicio
+    return segundos, next(entorno._eid)  # Eventos programados en simpy (el contador de identificadores de eventos)
+
+# Módulo v3.py o v4.py sin las llamadas de nivel superior que corren la simulación al importarlo
+def cargar_clases(motor):
+    with open(motor['archivo'], encoding='utf-8') as archivo:
+        arbol = ast.parse(archivo.read(), motor['archivo'])
+    arbol.body = [sentencia for sentencia in arbol.body if not es_llamada(sentencia)]
+    espacio = {'__name__': 'benchmark', '__file__': motor['archivo']}
+    exec(compile(arbol, motor['archivo'], 'exec'), espacio)
+    return espacio
+
+def replica_clases(motor, espacio, escenario, semilla):
+    picos = [PICO_TODO_EL_DIA, []] if escenario['pico'] else [espacio[nombre] for nombre in motor['picos']]
+    simulacion = espacio[motor['clase']](escenario['dias'] * 86400, *picos, *motor['argumentos'], semilla=semilla)
+    inicio = time.perf_counter()
+    getattr(simulacion, motor['metodo'])()
+    segundos = time.perf_counter() - inicio
+    # Cada llegada quedó atendida, en servicio o en la cola; los sucesos procesados son las llegadas más las salidas
+    en_servicio = 1 - getattr(simulacion, motor['cabinas_libres'])
+    llegadas = simulacion.vehiculos_atendidos + en_servicio + len(simulacion.cola_vehiculos)
+    return segundos, llegadas + simulacion.vehiculos_atendidos
+
+def replica_calendario(motor, modulo, escenario, semilla):
+    picos = (PICO_TODO_EL_DIA, []) if escenario['pico'] else (modulo.horarios_pico_mañana, modulo.horarios_pico_vespertino)
+    simulacion = modulo.SimulacionCabinas(escenario['dias'] * 86400, *picos, 1, semilla=semilla, acelerar=motor['acelerar'])
+    inicio = time.perf_counter()
+    simulacion.ejecutar()
+    segundos = time.perf_counter() - inicio
+    return segundos, simulacion.calendario.secuencia - len(simulacion.calendario)  # Programados menos pendientes
+
+# Corre las réplicas de un motor en un escenario dentro de este proceso (se llama en un proceso nuevo desde medir). Se corren
+# al menos "replicas" réplicas y se siguen agregando hasta medir tiempo_minimo segundos, así los escenarios cortos no quedan
+# dominados por el ruido del reloj y del sistema
+def medir_en_proceso(nombre_motor, nombre_escenario, replicas, semilla, tiempo_minimo=2.0):
+    motor = MOTORES[nombre_motor]
+    escenario = ESCENARIOS[nombre_escenario]
+    logging.disable(logging.INFO)  # Los scripts informan cada cambio de hora pico
+    with contextlib.redirect_stdout(io.StringIO()):
+        if motor['tipo'] == 'simpy':
+            correr = lambda semilla_replica: replica_simpy(preparar_simpy(motor, escenario, semilla_replica), semilla_replica)
+        elif motor['tipo'] == 'clases':
+            espacio = cargar_clases(motor)
+            correr = lambda semilla_replica: replica_clases(motor, espacio, escenario, semilla_replica)
+        else:
+            import codigo_final_v2
+            correr = lambda semilla_replica: replica_calendario(motor, codigo_final_v2, escenario, semilla_replica)
+        rss_base = rss_pico()
+        mediciones = []
+        while len(mediciones) < replicas or sum(medicion[0] for medicion in mediciones) < tiempo_minimo:
+            mediciones.append(correr(semilla + len(mediciones)))
+    segundos = sum(medicion[0] for medicion in mediciones)
+    sucesos = sum(medicion[1] for medicion in mediciones)
+    # La mejor réplica es la menos afectada por otros procesos de la máquina (como el mínimo de timeit): es la que se compara
+    mejor = max(sucesos_replica / segundos_replica for segundos_replica, sucesos_replica in mediciones)
+    return {'motor': nombre_motor, 'escenario': nombre_escenario, 'replicas': len(mediciones), 'segundos': segundos, 'sucesos': sucesos,
+            'sucesos_por_segundo': sucesos / segundos, 'sucesos_por_segundo_mejor': mejor, 'replicas_por_segundo': len(mediciones) / segundos,
+            'rss_base_mb': rss_base, 'rss_pico_mb': rss_pico()}
+
+# Mide un motor en un escenario en un proceso nuevo. Si falla o se pasa del límite de tiempo, devuelve el error
+def medir(nombre_motor, nombre_escenario, replicas=3, semilla=2024, tiempo_minimo=2.0, limite=600):
+    comando = [sys.executable, os.path.abspath(__file__), '--medir', nombre_motor, nombre_escenario, '--replicas', str(replicas),
+               '--semilla', str(semilla), '--tiempo-minimo', str(tiempo_minimo)]
+    entorno = dict(os.environ, MPLBACKEND='Agg')
+    error = {'motor': nombre_motor, 'escenario': nombre_escenario, 'replicas': replicas}
+    try:
+        proceso = subprocess.run(comando, cwd=DIRECTORIO, env=entorno, capture_output=True, text=True, timeout=limite)
+    except subprocess.TimeoutExpired:
+        return dict(error, error=f"Superó el límite de {limite} s")
+    if proceso.returncode != 0:
+        lineas = proceso.stderr.strip().splitlines()
+        return dict(error, error=lineas[-1] if lineas else f"Código de salida {proceso.returncode}")
+    return json.loads(proceso.stdout.strip().splitlines()[-1])
+
+def commit_actual():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=DIRECTORIO, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+# Historial de corridas del benchmark (lista vacía si el archivo no existe)
+def cargar_historial(archivo):
+    if not os.path.exists(archivo):
+        return []
+    with open(archivo, encoding='utf-8') as entrada:
+        return json.load(entrada)['corridas']
+
+def guardar_historial(archivo, corridas):
+    temporal = archivo + '.tmp'
+    with open(temporal, 'w', encoding='utf-8') as salida:
+        json.dump({'corridas': corridas}, salida, ensure_ascii=False, indent=1)
+    os.replace(temporal, archivo)
+
+# Compara cada resultado con el último resultado sin error del mismo motor y escenario en el historial.
+# Devuelve {(motor, escenario): cambio relativo de los sucesos por segundo de la mejor réplica}
+def comparar(resultados, historial):
+    anteriores = {}
+    for corrida in historial:
+        for resultado in corrida['resultados']:
+            if 'error' not in resultado:
+                anteriores[(resultado['motor'], resultado['escenario'])] = resultado
+    cambios = {}
+    for resultado in resultados:
+        anterior = anteriores.get((resultado['motor'], resultado['escenario']))
+        if anterior is not None and 'error' not in resultado:
+            cambios[(resultado['motor'], resultado['escenario'])] = resultado['sucesos_por_segundo_mejor'] / anterior['sucesos_por_segundo_mejor'] - 1
+    return cambios
+
+def imprimir(resultados, cambios, tolerancia):
+    print(f"{'motor':<22} {'escenario':<14} {'sucesos/s':>12} {'réplicas/s':>11} {'RSS pico MB':>12} {'cambio':>8}")
+    for resultado in resultados:
+        clave = (resultado['motor'], resultado['escenario'])
+        if 'error' in resultado:
+            print(f"{clave[0]:<22} {clave[1]:<14} error: {resultado['error']}")
+            continue
+        cambio = f"{cambios[clave]:+.1%}" if clave in cambios else ''
+        marca = '  REGRESIÓN' if cambios.get(clave, 0) < -tolerancia else ''
+        print(f"{clave[0]:<22} {clave[1]:<14} {resultado['sucesos_por_segundo']:>12,.0f} {resultado['replicas_por_segundo']:>11.3f} "
+              f"{resultado['rss_pico_mb']:>12.1f} {cambio:>8}{marca}")
+
+if __name__ == '__main__':
+    argumentos = argparse.ArgumentParser(description='Benchmark de sucesos por segundo de los motores de simulación del peaje')
+    argumentos.add_argument('--motores', nargs='+', choices=list(MOTORES), default=list(MOTORES))
+    argumentos.add_argument('--escenarios', nargs='+', choices=list(ESCENARIOS), default=list(ESCENARIOS))
+    argumentos.add_argument('--replicas', type=int, default=3)
+    argumentos.add_argument('--semilla', type=int, default=2024)
+    argumentos.add_argument('--tiempo-minimo', type=float, default=2.0, help='Segundos mínimos medidos por motor y escenario')
+    argumentos.add_argument('--limite', type=float, default=600, help='Segundos máximos por motor y escenario')
+    argumentos.add_argument('--salida', default=os.path.join(DIRECTORIO, 'benchmark.json'), help='Historial JSON al que se agrega la corrida')
+    argumentos.add_argument('--tolerancia', type=float, default=0.10, help='Caída relativa de sucesos/s que se marca como regresión')
+    argumentos.add_argument('--medir', nargs=2, metavar=('MOTOR', 'ESCENARIO'), help=argparse.SUPPRESS)  # Uso interno: una medición
+    opciones = argumentos.parse_args()
+
+    if opciones.medir:
+        print(json.dumps(medir_en_proceso(*opciones.medir, opciones.replicas, opciones.semilla, opciones.tiempo_minimo)))
+        sys.exit(0)
+
+    resultados = []
+    for nombre_motor in opciones.motores:
+        for nombre_escenario in opciones.escenarios:
+            resultados.append(medir(nombre_motor, nombre_escenario, opciones.replicas, opciones.semilla, opciones.tiempo_minimo, opciones.limite))
+    historial = cargar_historial(opciones.salida)
+    cambios = comparar(resultados, historial)
+    imprimir(resultados, cambios, opciones.tolerancia)
+    historial.append({'fecha': datetime.now(timezone.utc).isoformat(timespec='seconds'), 'commit': commit_actual(),
+                      'python': platform.python_version(), 'plataforma': platform.platform(), 'procesador': platform.processor(),
+                      'resultados': resultados})
+    guardar_historial(opciones.salida, historial)
+    errores = [resultado for resultado in resultados if 'error' in resultado]
+    if errores:
+        print(f"{len(errores)} medición(es) con error: {', '.join(sorted({resultado['motor'] for resultado in errores}))}", file=sys.stderr)
+    # Sale con error si algún motor falló o si hay una regresión, así el benchmark sirve como verificación automática
+    sys.exit(1 if errores or any(cambio < -opciones.tolerancia for cambio in cambios.values()) else 0)
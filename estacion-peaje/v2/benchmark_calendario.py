@@ -0,0 +1,73 @@
+import heapq
+import random
+import time
+import tracemalloc
+from calendario import CalendarioSucesos, LLEGADA, SALIDA
+
+# Micro-benchmark del calendario de sucesos: compara el heap de objetos Suceso (versión anterior del simulador)
+# con el calendario de tuplas (tiempo, secuencia, ...) de calendario.py.
+# Se usa el modelo "hold" clásico: con N sucesos pendientes, se extrae el primero y se programa uno nuevo más adelante
+
+# Versión anterior: un objeto por suceso, ordenado con un __lt__ escrito en Python
+class Suceso:
+    def __init__(self, tiempo, tipo_suceso, tipo_vehiculo=None, tiempo_llegada=None):
+        self.tiempo = tiempo
+        self.tiempo_llegada = tiempo_llegada
+        self.tipo_suceso = tipo_suceso
+        self.tipo_vehiculo = tipo_vehiculo
+
+    def __lt__(self, otro_suceso):
+        return self.tiempo < otro_suceso.tiempo
+
+def llenar_objetos(tiempos):
+    cola_sucesos = []
+    for tiempo in tiempos:
+        heapq.heappush(cola_sucesos, Suceso(tiempo, 'llegada', 'Grande'))
+    return cola_sucesos
+
+def llenar_calendario(tiempos):
+    calendario = CalendarioSucesos()
+    for tiempo in tiempos:
+        calendario.programar(tiempo, LLEGADA, tipo_vehiculo='Grande')
+    return calendario
+
+def hold_objetos(cola_sucesos, incrementos):
+    for incremento in incrementos:
+        suceso = heapq.heappop(cola_sucesos)
+        tipo_suceso = 'salida' if suceso.tipo_suceso == 'llegada' else 'llegada'
+        heapq.heappush(cola_sucesos, Suceso(suceso.tiempo + incremento, tipo_suceso, suceso.tipo_vehiculo))
+
+def hold_calendario(calendario, incrementos):
+    for incremento in incrementos:
+        tiempo, _, codigo, estacion, tipo_vehiculo, _ = calendario.extraer()
+        calendario.programar(tiempo + incremento, SALIDA if codigo == LLEGADA else LLEGADA, estacion, tipo_vehiculo)
+
+# Bytes por suceso pendiente, medidos con tracemalloc al llenar la cola
+def memoria_por_suceso(llenar, tiempos):
+    tracemalloc.start()
+    cola = llenar(tiempos)
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del cola
+    return memoria / len(tiempos)
+
+def medir(n_pendientes, n_operaciones, semilla=0):
+    rng = random.Random(semilla)
+    tiempos = [rng.expovariate(1) for _ in range(n_pendientes)]
+    incrementos = [rng.expovariate(1 / n_pendientes) for _ in range(n_operaciones)]
+    resultados = {}
+    for nombre, llenar, hold in [('objetos Suceso', llenar_objetos, hold_objetos), ('tuplas (tiempo, secuencia)', llenar_calendario, hold_calendario)]:
+        cola = llenar(tiempos)
+        inicio = time.perf_counter()
+        hold(cola, incrementos)
+        segundos = time.perf_counter() - inicio
+        resultados[nombre] = (segundos / n_operaciones * 1e9, memoria_por_suceso(llenar, tiempos))
+    return resultados
+
+if __name__ == '__main__':
+    # El simulador tiene pocos sucesos pendientes (una llegada por tipo de vehículo y una salida por cabina ocupada);
+    # los tamaños mayores muestran cómo escala el calendario con muchas estaciones y cabinas
+    for n_pendientes in [10, 2_000, 100_000]:
+        print(f"\n{n_pendientes} sucesos pendientes:")
+        for nombre, (nanosegundos, bytes_suceso) in medir(n_pendientes, 200_000).items():
+            print(f"  {nombre:<28} {nanosegundos:8.0f} ns por extracción + programación   {bytes_suceso:6.0f} bytes por suceso")
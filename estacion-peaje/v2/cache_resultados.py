@@ -0,0 +1,117 @@
+import json
+import math
+import time
+import sqlite3
+import types
+import hashlib
+from enum import Enum
+from collections.abc import Mapping
+
+# Cache en disco de los resultados de réplicas, direccionado por contenido: la clave es un hash de todo lo que determina el
+# resultado (la configuración del escenario, las tablas del modelo, la semilla y la versión del modelo), y el valor las
+# métricas de la réplica (ver SimulacionCabinas.resultados_replica). Repetir un análisis o ampliar un barrido sólo simula
+# las réplicas nuevas. Es una base SQLite (un solo archivo, que pueden usar varios procesos a la vez) con una fila por
+# réplica; cada lectura actualiza el último uso de la fila, y al guardar se borran las menos usadas recientemente (LRU)
+# hasta que el total quede dentro de tamano_maximo bytes y celdas_maximas filas
+VERSION_MODELO = 2  # Incrementar si cambia el modelo, para no reutilizar resultados simulados con la versión anterior
+TAMANO_MAXIMO = 256 * 2**20  # 256 MB de resultados (unas 500.000 réplicas)
+CLAVES_POR_CONSULTA = 500  # SQLite limita la cantidad de parámetros de una consulta
+
+# Representación de la configuración que no depende de la identidad de los objetos, para calcular las claves
+def forma_canonica(valor):
+    if isinstance(valor, Enum):
+        return valor.name
+    # Una clase (por ejemplo una disciplina de cola propia) o una función se identifica por su nombre calificado: si cambia
+    # su código la clave no cambia, así que hay que incrementar VERSION_MODELO o vaciar el cache
+    if isinstance(valor, (type, types.FunctionType, types.BuiltinFunctionType)):
+        return f'{valor.__module__}.{valor.__qualname__}'
+    if isinstance(valor, Mapping):
+        return sorted(([forma_canonica(clave), forma_canonica(v)] for clave, v in valor.items()), key=repr)
+    if isinstance(valor, (list, tuple)):
+        return [forma_canonica(v) for v in valor]
+    if hasattr(valor, '__dict__'):
+        return [type(valor).__name__, forma_canonica(vars(valor))]
+    if isinstance(valor, float) and not math.isfinite(valor):
+        return repr(valor)
+    return valor
+
+# Clave de un resultado: hash SHA-256 de la versión del modelo y de las partes dadas (configuración, tablas, semilla, ...)
+def clave_contenido(*partes):
+    contenido = json.dumps([VERSION_MODELO, forma_canonica(partes)])
+    return hashlib.sha256(contenido.encode()).hexdigest()
+
+class CacheResultados:
+    def __init__(self, ruta, tamano_maximo=TAMANO_MAXIMO, celdas_maximas=None):
+        self.ruta = ruta
+        self.tamano_maximo = tamano_maximo
+        self.celdas_maximas = celdas_maximas
+        self.conexion = sqlite3.connect(ruta, timeout=60)
+        self.conexion.execute('PRAGMA journal_mode=WAL')  # Lectores y un escritor a la vez, desde distintos procesos
+        with self.conexion:
+            self.conexion.execute('CREATE TABLE IF NOT EXISTS celdas (clave TEXT PRIMARY KEY, resultado TEXT NOT NULL, '
+                                  'tamano INTEGER NOT NULL, ultimo_uso REAL NOT NULL)')
+            self.conexion.execute('CREATE INDEX IF NOT EXISTS celdas_ultimo_uso ON celdas (ultimo_uso)')
+
+    def __len__(self):
+        return self.conexion.execute('SELECT COUNT(*) FROM celdas').fetchone()[0]
+
+    def tamano(self):
+        return self.conexion.execute('SELECT COALESCE(SUM(tamano), 0) FROM celdas').fetchone()[0]
+
+    def leer(self, clave):
+        return self.leer_varias([clave]).get(clave)
+
+    # {clave: resultado} de las claves que están en el cache (las que faltan no aparecen)
+    def leer_varias(self, claves):
+        claves = list(dict.fromkeys(claves))
+        resultados = {}
+        for inicio in range(0, len(claves), CLAVES_POR_CONSULTA):
+            grupo = claves[inicio:inicio + CLAVES_POR_CONSULTA]
+            consulta = f"SELECT clave, resultado FROM celdas WHERE clave IN ({', '.join('?' * len(grupo))})"
+            resultados.update((clave, json.loads(resultado)) for clave, resultado in self.conexion.execute(consulta, grupo))
+        if resultados:
+            ahora = time.time()
+            with self.conexion:
+                self.conexion.executemany('UPDATE celdas SET ultimo_uso = ? WHERE clave = ?', [(ahora, clave) for clave in resultados])
+        return resultados
+
+    def guardar(self, clave, resultado):
+        self.guardar_varias({clave: resultado})
+
+    def guardar_varias(self, resultados):
+        ahora = time.time()
+        filas = []
+        for clave, resultado in resultados.items():
+            texto = json.dumps(resultado)
+            filas.append((clave, texto, len(texto) + len(clave), ahora))
+        with self.conexion:  # Una transacción: si se interrumpe no queda ningún resultado a medio escribir
+            self.conexion.executemany('INSERT OR REPLACE INTO celdas (clave, resultado, tamano, ultimo_uso) VALUES (?, ?, ?, ?)', filas)
+        self.desalojar()
+
+    # Borra las filas usadas hace más tiempo hasta respetar los límites de tamaño y de cantidad
+    def desalojar(self):
+        celdas, tamano = self.conexion.execute('SELECT COUNT(*), COALESCE(SUM(tamano), 0) FROM celdas').fetchone()
+        maximo_celdas = self.celdas_maximas if self.celdas_maximas is not None else celdas
+        if tamano <= self.tamano_maximo and celdas <= maximo_celdas:
+            return 0
+        borrar = []
+        for clave, tamano_celda in self.conexion.execute('SELECT clave, tamano FROM celdas ORDER BY ultimo_uso'):
+            if tamano <= self.tamano_maximo and celdas <= maximo_celdas:
+                break
+            borrar.append((clave,))
+            tamano -= tamano_celda
+            celdas -= 1
+        with self.conexion:
+            self.conexion.executemany('DELETE FROM celdas WHERE clave = ?', borrar)
+        return len(borrar)
+
+    def vaciar(self):
+        with self.conexion:
+            self.conexion.execute('DELETE FROM celdas')
+
+    def cerrar(self):
+        self.conexion.close()
+
+# Un CacheResultados a partir de una ruta (o el mismo cache si ya está abierto)
+def abrir_cache(cache):
+    return cache if isinstance(cache, CacheResultados) else CacheResultados(cache)
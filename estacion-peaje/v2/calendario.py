@@ -0,0 +1,32 @@
+import heapq
+
+# Códigos enteros de los tipos de suceso (se comparan más rápido que los textos 'llegada' / 'salida')
+LLEGADA = 0
+SALIDA = 1
+CAMBIO_CAPACIDAD = 2  # Apertura o cierre programado de cabinas en una estación
+
+# Calendario de sucesos: cola de prioridad basada en heaps cuyos elementos son tuplas
+# (tiempo, secuencia, código de suceso, estación, tipo de vehículo, dato).
+# El dato depende del suceso: la cabina que se libera en una salida o la nueva cantidad de cabinas en un cambio de capacidad.
+# El heap compara las tuplas de forma nativa en C: primero por tiempo y, ante un empate, por el número de secuencia,
+# que es único y por lo tanto nunca deja que la comparación llegue a los campos siguientes.
+# Así no hace falta un objeto Suceso por evento ni un método __lt__ escrito en Python
+class CalendarioSucesos:
+    __slots__ = ('sucesos', 'secuencia')
+
+    def __init__(self):
+        self.sucesos = []
+        self.secuencia = 0  # Contador de sucesos programados, desempata los sucesos simultáneos en orden de programación
+
+    def programar(self, tiempo, codigo, estacion=0, tipo_vehiculo=None, dato=None):
+        heapq.heappush(self.sucesos, (tiempo, self.secuencia, codigo, estacion, tipo_vehiculo, dato))
+        self.secuencia += 1
+
+    def extraer(self):
+        return heapq.heappop(self.sucesos)  # Extrae el primer suceso de la cola de prioridad
+
+    def __len__(self):
+        return len(self.sucesos)
+
+    def __iter__(self):
+        return iter(self.sucesos)  # Recorre los sucesos pendientes (sin orden garantizado)
@@ -1,9 +1,33 @@
-import random
-import heapq
+import os
+import math
+import argparse
+import time
+import logging
 import statistics
-import scipy.stats as stats
-import matplotlib.pyplot as plt
+import numpy as np
 from enum import Enum
+from concurrent.futures import ProcessPoolExecutor
+from muestreo import BancoMuestras
+from calendario import CalendarioSucesos, LLEGADA, SALIDA, CAMBIO_CAPACIDAD
+from colas import crear_cola
+from estadisticas import AcumuladorTemporal, EstadisticaEnLinea, EstadisticasClase, SerieLotes, SerieTemporal
+from estado_estacionario import analizar_serie
+from reduccion_varianza import intervalo_media, variable_control
+from tasas import TablaTasas, perfil_horarios_pico, SEGUNDOS_DIA, RESOLUCION
+from resultados import ResultadosSimulacion, ResultadosReplicas
+from graficos import grafico_espera, graficador_segundo_plano
+import puntos_control
+from trazas import RegistroTrazas, INICIO_SERVICIO
+from semillas import semilla_maestra, generar_semillas
+from distribucion_t import cuantil_t, intervalo_t
+from perfilado import PerfilSimulacion
+from nucleo import usar_nucleo, ejecutar_nucleo
+from lindley import simular_lindley, LOTE
+from cache_resultados import abrir_cache, clave_contenido
+
+# Los mensajes de la simulación van al logger 'peaje' en lugar de la consola: el que usa el módulo como biblioteca elige
+# qué ve con el nivel (INFO: resumen de cada experimento, DEBUG: además el resumen de cada réplica). Sin configurar logging no se muestra nada
+registro = logging.getLogger('peaje')
 
 # Definición de tipos de vehículo y tasas de llegada
 class Vehiculo(Enum):
@@ -29,145 +53,740 @@ TIEMPOS_ENTRE_LLEGADAS = {
     }
 }
 
-# Distribuciones del tiempo de atención usando la librería random
+# Distribuciones del tiempo de atención: (nombre de la distribución registrada en muestreo.py, parámetros)
 TIEMPOS_SERVICIO = {
-    Vehiculo.GRAN_PORTE: lambda: random.uniform(45, 55),  # Distribución uniforme
-    Vehiculo.GRANDE: lambda: random.expovariate(1 / 30),  # Distribución exponencial
-    Vehiculo.PEQUENO: lambda: random.triangular(15, 20, 35),  # Distribución triangular
-    Vehiculo.MOTOCICLETA: lambda: random.expovariate(1 / 30)     # Distribución exponencial
+    Vehiculo.GRAN_PORTE: ('uniforme', (45, 55)),  # Distribución uniforme
+    Vehiculo.GRANDE: ('exponencial', (30,)),  # Distribución exponencial (media de 30 segundos)
+    Vehiculo.PEQUENO: ('triangular', (15, 20, 35)),  # Distribución triangular
+    Vehiculo.MOTOCICLETA: ('exponencial', (30,))     # Distribución exponencial (media de 30 segundos)
+}
+
+# Prioridades para la disciplina de cola 'prioridad' (menor número = se atiende antes): primero los de servicio más corto
+PRIORIDADES_VEHICULO = {
+    Vehiculo.MOTOCICLETA: 0,
+    Vehiculo.PEQUENO: 1,
+    Vehiculo.GRANDE: 2,
+    Vehiculo.GRAN_PORTE: 3
 }
 
 # Períodos de tiempo pico
 horarios_pico_mañana = [(7, 9)]  # De 7hs a 9hs
 horarios_pico_vespertino = [(19, 20)]  # De 19hs a 20hs
 
-# Sucesos: momentos en los que se producen cambios en el sistema
-class Suceso:
-    def __init__(self, tiempo, tipo_suceso, tipo_vehiculo=None, tiempo_llegada=None):
-        self.tiempo = tiempo
-        self.tiempo_llegada = tiempo_llegada    # Usado para conocer el tiempo de llegada de los sucesos 'salida'
-        self.tipo_suceso = tipo_suceso
-        self.tipo_vehiculo = tipo_vehiculo
-        
-    # El método __lt__ permite que los objetos Suceso se ordenen en una cola de prioridad basada en el atributo "tiempo". En el contexto de una cola de prioridad (heap), esto asegura que los sucesos se procesen en el orden correcto basado en el tiempo en el que ocurren.
-    def __lt__(self, otro_suceso):
-        return self.tiempo < otro_suceso.tiempo
+# Estación de peaje: cantidad de cabinas, horarios pico (cambian las tasas de llegada) y plan diario de cabinas.
+# El plan es una lista de franjas (hora_inicio, hora_fin, cabinas) en las que se habilitan más (o menos) cabinas que las habituales.
+# Cada estación puede tener sus propias tasas ({'pico': {...}, 'no_pico': {...}} como TIEMPOS_ENTRE_LLEGADAS), otros horarios
+# pico los fines de semana, o directamente una TablaTasas armada a mano con cualquier perfil de llegadas
+class Estacion:
+    def __init__(self, nombre, cabinas=1, horarios_pico=(), plan_cabinas=(), tasas=None, horarios_pico_fin_de_semana=None, tabla=None, resolucion=RESOLUCION):
+        self.nombre = nombre
+        self.cabinas = cabinas  # Cabinas habilitadas fuera de las franjas del plan
+        self.horarios_pico = list(horarios_pico)
+        self.plan_cabinas = list(plan_cabinas)
+        self.tasas = tasas
+        self.horarios_pico_fin_de_semana = horarios_pico_fin_de_semana
+        self.tabla = tabla
+        self.resolucion = resolucion
+
+    # Tabla de tasas de llegada precalculada de la estación (se consulta en O(1) en cada llegada)
+    def tabla_tasas(self, tasas_por_defecto):
+        if self.tabla is not None:
+            return self.tabla
+        perfil = perfil_horarios_pico(self.tasas or tasas_por_defecto, self.horarios_pico, self.horarios_pico_fin_de_semana)
+        return TablaTasas.desde_perfil(perfil, dias=1 if self.horarios_pico_fin_de_semana is None else 7, resolucion=self.resolucion)
+
+    def capacidad_en(self, hora):
+        for inicio, fin, cabinas in self.plan_cabinas:
+            if inicio <= hora < fin:
+                return cabinas
+        return self.cabinas
+
+    # Cambios de capacidad de un día, como lista ordenada de (segundo del día, cabinas habilitadas desde ese momento)
+    def cambios_capacidad(self):
+        horas = sorted({hora % 24 for inicio, fin, _ in self.plan_cabinas for hora in (inicio, fin)})
+        return [(hora * 3600, self.capacidad_en(hora)) for hora in horas]
+
+    def max_cabinas(self):
+        return max([self.cabinas] + [cabinas for _, _, cabinas in self.plan_cabinas])
+
+# Estaciones A y D del peaje: una cabina habitual y tres en su hora pico (lo que intentaba control_cabinas en las versiones con simpy)
+ESTACIONES_PEAJE = [
+    Estacion('A', cabinas=1, horarios_pico=horarios_pico_mañana, plan_cabinas=[(7, 9, 3)]),
+    Estacion('D', cabinas=1, horarios_pico=horarios_pico_vespertino, plan_cabinas=[(19, 20, 3)])
+]
+
+# Sin estaciones explícitas se simula una única estación con una cabina y ambos horarios pico
+def estaciones_por_defecto(horarios_pico_mañana, horarios_pico_vespertino):
+    return [Estacion('A', cabinas=1, horarios_pico=horarios_pico_mañana + horarios_pico_vespertino)]
+
+SUCESOS_ENTRE_CONTROLES = 100000  # Con puntos de control, cada cuántos sucesos se mira si ya pasó el intervalo de guardado
 
 class SimulacionCabinas:
-    def __init__(self, tiempo_final, horarios_pico_mañana, horarios_pico_vespertino, multa_espera):
+    def __init__(self, tiempo_final, horarios_pico_mañana, horarios_pico_vespertino, multa_espera, semilla=None, disciplina='fifo', estaciones=None,
+                 guardar_trazas=False, cuantiles_espera=(), series_estacionarias=False, antiteticas=False, costo_cabina_extra=100, limite_espera=3*60,
+                 directorio_trazas=None, formato_trazas='npy', perfilar=False, acelerar=None, tiempos_servicio=None, tiempos_entre_llegadas=None,
+                 prioridades=None, estadisticas_por_tipo=False):
+        # Parámetros del escenario (todo menos la semilla, el perfilado y el núcleo, que no cambian los resultados), para crear
+        # réplicas iguales en este u otros procesos
+        self.configuracion = dict(tiempo_final=tiempo_final, horarios_pico_mañana=horarios_pico_mañana, horarios_pico_vespertino=horarios_pico_vespertino,
+                                  multa_espera=multa_espera, disciplina=disciplina, estaciones=estaciones,
+                                  guardar_trazas=guardar_trazas, cuantiles_espera=cuantiles_espera, series_estacionarias=series_estacionarias, antiteticas=antiteticas,
+                                  costo_cabina_extra=costo_cabina_extra, limite_espera=limite_espera,
+                                  directorio_trazas=directorio_trazas, formato_trazas=formato_trazas,
+                                  tiempos_servicio=tiempos_servicio, tiempos_entre_llegadas=tiempos_entre_llegadas, prioridades=prioridades,
+                                  estadisticas_por_tipo=estadisticas_por_tipo)
+        if estaciones is None:
+            estaciones = estaciones_por_defecto(horarios_pico_mañana, horarios_pico_vespertino)
         self.tiempo_actual = 0
+        self.estaciones = estaciones
+        # Tipos de vehículo del modelo: los que tienen distribución de servicio (por defecto las tablas de este módulo; un
+        # escenario cargado de un archivo trae las suyas, ver escenarios.py)
+        self.tiempos_servicio = tiempos_servicio or TIEMPOS_SERVICIO
+        self.tiempos_entre_llegadas = tiempos_entre_llegadas or TIEMPOS_ENTRE_LLEGADAS
+        self.vehiculos = list(self.tiempos_servicio)
+        # Muestras pre-generadas por bloques, con flujos independientes por estación y tipo de vehículo (antiteticas=True da la réplica antitética)
+        self.semilla = semilla_maestra(semilla)  # Sin semilla se toma una nueva, que queda registrada en los resultados
+        self.banco = BancoMuestras(self.semilla, self.tiempos_servicio, self.vehiculos, len(estaciones), antiteticas=antiteticas)
         self.tiempo_final = tiempo_final
         self.horarios_pico_mañana = horarios_pico_mañana
         self.horarios_pico_vespertino = horarios_pico_vespertino
-        self.cola_sucesos = []  # Cola de prioridad basada en heaps
-        self.cabinas_libres = 1  # Número de cabinas disponibles inicialmente
-        self.cola_vehiculos = []
-        self.vehiculos_atendidos = 0    
-        self.tiempos_espera = []    # (es una lista, para tener los tiempos individuales de cada vehiculo y calcular estadísticas)
+        self.calendario = CalendarioSucesos()  # Sucesos: momentos en los que se producen cambios en el sistema (cola de prioridad basada en heaps)
+        # Estado de cada estación (las listas se indexan por número de estación)
+        self.capacidad = [estacion.capacidad_en(0) for estacion in estaciones]  # Cabinas habilitadas en este momento
+        self.cabinas_ocupadas = [[False] * estacion.max_cabinas() for estacion in estaciones]  # Si cada cabina está atendiendo un vehículo
+        self.cambios_plan = [estacion.cambios_capacidad() for estacion in estaciones]
+        self.tablas_tasas = [estacion.tabla_tasas(self.tiempos_entre_llegadas) for estacion in estaciones]
+        self.estadistica_capacidad = [AcumuladorTemporal(0, capacidad) for capacidad in self.capacidad]  # Para calcular el tiempo de cabinas extra
+        # Vehículos esperando: 'fifo', 'prioridad' (por tipo de vehículo) o 'carril_exclusivo' (carril propio para motocicletas)
+        self.colas = [crear_cola(disciplina, prioridades=prioridades or PRIORIDADES_VEHICULO, tipo_carril=Vehiculo.MOTOCICLETA) for _ in estaciones]
+        self.vehiculos_atendidos = 0
+        self.vehiculos_llegados = 0
         self.multa_espera_excesiva = multa_espera  # Multa por tiempo de espera excesivo (por segundo)
-        self.costo_cabina_extra = 100  # Costo por habilitar una cabina extra
-        self.LIMITE_ESPERA = 3 * 60  # Límite de espera de 3 minutos
+        self.costo_cabina_extra = costo_cabina_extra  # Costo por habilitar una cabina extra (por bloque de 10 minutos)
+        self.LIMITE_ESPERA = limite_espera  # Límite de espera (3 minutos por defecto)
+        # Estadísticas de los tiempos de espera calculadas a medida que se atiende cada vehículo (la memoria no crece con la simulación).
+        # Incluye cuántos vehículos superan el límite de espera y el tiempo total por encima del límite.
+        # Los cuantiles P² se piden aparte (por ejemplo cuantiles_espera=(0.5, 0.95)) porque cada uno cuesta unos 2 µs por vehículo
+        self.estadistica_espera = EstadisticaEnLinea(limite=self.LIMITE_ESPERA, cuantiles=cuantiles_espera, ancho_histograma=30, intervalos_histograma=120)
+        self.tiempos_espera = [] if guardar_trazas else None    # Tiempos individuales de cada vehículo, sólo si se piden (guardar_trazas=True)
+        # Traza completa de sucesos en disco en formato columnar, sólo si se pide un directorio (puede incluir {semilla} para
+        # que cada réplica escriba en el suyo). Ver trazas.py
+        self.trazas = None
+        if directorio_trazas is not None:
+            self.trazas = RegistroTrazas(directorio_trazas.format(semilla=self.semilla), [estacion.nombre for estacion in estaciones],
+                                         list(Vehiculo) + [tipo for tipo in self.vehiculos if not isinstance(tipo, Vehiculo)], formato_trazas)
+        # Contadores y tiempos del ciclo de sucesos, sólo si se piden (ver perfilado.py)
+        self.perfil = PerfilSimulacion() if perfilar else None
+        # Núcleo compilado con Numba para el ciclo de sucesos (ver nucleo.py): None lo usa si está instalado y la corrida lo admite
+        self.acelerar = acelerar
+        self.cabinas_en_servicio = 0    # Cabinas atendiendo un vehículo, sumando todas las estaciones
+        self.estadistica_ocupacion = [AcumuladorTemporal() for _ in estaciones]  # Cabinas atendiendo en cada estación, ponderado por tiempo
+        # Utilización de cada cabina sin costo extra por suceso: el tiempo atendiendo es la suma de los tiempos de servicio que
+        # tomó (menos lo que falta de la atención en curso, ver tiempo_ocupado), y si está habilitada cambia sólo con el plan.
+        # Los vehículos en la estación (L) no se acumulan aparte: L = Lq + cabinas ocupadas
+        self.tiempo_servicio_cabinas = [[0.0] * len(ocupadas) for ocupadas in self.cabinas_ocupadas]
+        self.habilitacion_cabinas = [[AcumuladorTemporal(0, int(cabina < capacidad)) for cabina in range(len(ocupadas))]
+                                     for ocupadas, capacidad in zip(self.cabinas_ocupadas, self.capacidad)]
+        # Por tipo de vehículo (sumando las estaciones), sólo si se pide porque agrega unos 4 cambios de estado por vehículo:
+        # en cola y en el sistema ponderados por tiempo, espera y tiempo en el sistema. Para el tiempo en el sistema se guarda
+        # la llegada del vehículo que atiende cada cabina
+        self.estadisticas_tipo = {tipo: EstadisticasClase() for tipo in self.vehiculos} if estadisticas_por_tipo else None
+        self.llegadas_en_atencion = [[0.0] * len(ocupadas) for ocupadas in self.cabinas_ocupadas] if estadisticas_por_tipo else None
+        # Series para el análisis de estado estacionario (ver ejecutar_estado_estacionario): medias de a 5 esperas y cabinas ocupadas promedio por hora
+        self.serie_espera = SerieLotes(5) if series_estacionarias else None
+        self.serie_ocupacion = SerieTemporal(3600) if series_estacionarias else None
         self.programar_sucesos_iniciales()
 
-    def ejecutar(self):
-        while self.tiempo_actual < self.tiempo_final:
-            suceso = heapq.heappop(self.cola_sucesos)   # Extrae el primer suceso de la cola de prioridad
-            self.tiempo_actual = suceso.tiempo
+    # Con punto_control (una ruta de archivo) el estado completo se guarda cada intervalo_punto_control segundos de reloj
+    # y al terminar; SimulacionCabinas.reanudar(punto_control) continúa la corrida desde el último guardado
+    def ejecutar(self, punto_control=None, intervalo_punto_control=300):
+        if punto_control is None:
+            if usar_nucleo(self, self.acelerar):
+                ejecutar_nucleo(self)
+            else:
+                self.avanzar()
+        else:
+            ultimo_guardado = time.monotonic()
+            while self.avanzar(SUCESOS_ENTRE_CONTROLES):
+                if time.monotonic() - ultimo_guardado >= intervalo_punto_control:
+                    puntos_control.guardar(punto_control, self)
+                    ultimo_guardado = time.monotonic()
+        self.tiempo_actual = max(self.tiempo_actual, self.tiempo_final)
+        if self.trazas is not None:
+            self.trazas.cerrar()
+        if punto_control is not None:
+            puntos_control.guardar(punto_control, self)
+        if registro.isEnabledFor(logging.DEBUG):
+            self.informar()
+        return self.resultados()
+
+    # Procesa los sucesos anteriores al tiempo final (como máximo "sucesos"). Devuelve True si quedan sucesos por procesar.
+    # El reloj termina exactamente en el tiempo final, así dos escenarios con la misma semilla cubren el mismo período
+    # y reciben las mismas llegadas
+    def avanzar(self, sucesos=None):
+        if self.perfil is not None:
+            return self.perfil.avanzar(self, sucesos)
+        calendario = self.calendario
+        if sucesos is None:
+            while calendario and calendario.sucesos[0][0] < self.tiempo_final:
+                suceso = calendario.extraer()   # Extrae el primer suceso de la cola de prioridad
+                self.tiempo_actual = suceso[0]
+                self.procesar_suceso(suceso)
+            return False
+        for _ in range(sucesos):
+            if not (calendario and calendario.sucesos[0][0] < self.tiempo_final):
+                return False
+            suceso = calendario.extraer()
+            self.tiempo_actual = suceso[0]
             self.procesar_suceso(suceso)
-        print(f"Simulación finalizada: {self.vehiculos_atendidos} vehículos atendidos.")
-        self.calcular_costos()
+        return bool(calendario) and calendario.sucesos[0][0] < self.tiempo_final
+
+    # Carga una corrida guardada con ejecutar(punto_control=...) y la termina, guardando en el mismo archivo
+    @staticmethod
+    def reanudar(punto_control, intervalo_punto_control=300):
+        simulacion = puntos_control.cargar(punto_control)
+        return simulacion, simulacion.ejecutar(punto_control, intervalo_punto_control)
+
+    # Resultados de la corrida, para usarlos desde otro código sin leer la consola
+    def resultados(self):
+        multas, costo_total_con_cabina_extra = self.costos()
+        largo_cola = {}
+        largo_sistema = {}
+        utilizacion = {}
+        utilizacion_cabinas = {}
+        for numero, (estacion, cola, ocupacion, capacidad) in enumerate(zip(self.estaciones, self.colas, self.estadistica_ocupacion,
+                                                                          self.estadistica_capacidad)):
+            largo_cola[estacion.nombre] = cola.estadistica_largo.promedio(self.tiempo_actual)
+            largo_sistema[estacion.nombre] = largo_cola[estacion.nombre] + ocupacion.promedio(self.tiempo_actual)
+            capacidad_promedio = capacidad.promedio(self.tiempo_actual)
+            utilizacion[estacion.nombre] = ocupacion.promedio(self.tiempo_actual) / capacidad_promedio if capacidad_promedio > 0 else 0.0
+            utilizacion_cabinas[estacion.nombre] = self.utilizacion_cabinas(numero)
+        por_tipo = None
+        if self.estadisticas_tipo is not None:
+            por_tipo = {tipo: clase.resumen(self.tiempo_actual) for tipo, clase in self.estadisticas_tipo.items()}
+        return ResultadosSimulacion(tiempo_final=self.tiempo_actual, vehiculos_llegados=self.vehiculos_llegados,
+                                    vehiculos_atendidos=self.vehiculos_atendidos, espera=self.estadistica_espera.resumen(),
+                                    multas=multas, costo_con_cabina_extra=costo_total_con_cabina_extra,
+                                    costo_plan_cabinas=self.costo_cabinas_extra(), largo_cola=largo_cola, utilizacion=utilizacion,
+                                    largo_sistema=largo_sistema, utilizacion_cabinas=utilizacion_cabinas, por_tipo=por_tipo,
+                                    semilla=self.semilla, perfil=self.perfil.resumen(self) if self.perfil is not None else None)
+
+    # Utilización de cada cabina de la estación: tiempo atendiendo sobre tiempo habilitada (una cabina que nunca se habilitó
+    # da 0). Puede pasar de 1 si la cabina se cerró con un vehículo en atención, que termina de atender (regla "Wait" de Arena)
+    def utilizacion_cabinas(self, estacion):
+        utilizaciones = []
+        for ocupado, habilitacion in zip(self.tiempo_ocupado(estacion), self.habilitacion_cabinas[estacion]):
+            habilitada = habilitacion.promedio(self.tiempo_actual) * (self.tiempo_actual - habilitacion.tiempo_inicio)
+            utilizaciones.append(ocupado / habilitada if habilitada > 0 else 0.0)
+        return utilizaciones
+
+    # Tiempo que atendió cada cabina de la estación hasta ahora: la suma de sus tiempos de servicio menos lo que todavía
+    # falta de la atención en curso (la salida pendiente en el calendario)
+    def tiempo_ocupado(self, estacion):
+        ocupado = list(self.tiempo_servicio_cabinas[estacion])
+        for tiempo, _, codigo, estacion_suceso, _, cabina in self.calendario:
+            if codigo == SALIDA and estacion_suceso == estacion:
+                ocupado[cabina] -= tiempo - self.tiempo_actual
+        return ocupado
+
+    # Resumen de la corrida en el log (nivel DEBUG, o el que se pida)
+    def informar(self, nivel=logging.DEBUG):
+        registro.log(nivel, "Simulación finalizada: %d vehículos atendidos.", self.vehiculos_atendidos)
+        espera = self.estadistica_espera
+        registro.log(nivel, "Tiempo de espera: promedio %.2f s, desvío %.2f s, máximo %.2f s", espera.media, espera.desviacion(), espera.maximo)
+        if espera.cuantiles:
+            registro.log(nivel, "Cuantiles del tiempo de espera: %s", ", ".join(f"{p:.0%}: {espera.cuantil(p):.2f} s" for p in espera.cuantiles))
+        registro.log(nivel, "Vehículos que superan %d minutos de espera: %d (%.2f%%)",
+                     self.LIMITE_ESPERA // 60, espera.excedidos, espera.excedidos / max(espera.n, 1) * 100)
+        for numero, (estacion, cola, ocupacion) in enumerate(zip(self.estaciones, self.colas, self.estadistica_ocupacion)):
+            largo_cola = cola.estadistica_largo
+            registro.log(nivel, "Estación %s - largo promedio de la cola: %.2f vehículos (máximo %d) - cabinas ocupadas promedio: %.2f",
+                         estacion.nombre, largo_cola.promedio(self.tiempo_actual), largo_cola.maximo, ocupacion.promedio(self.tiempo_actual))
+            registro.log(nivel, "Estación %s - vehículos en la estación promedio: %.2f - utilización de cada cabina: %s",
+                         estacion.nombre, largo_cola.promedio(self.tiempo_actual) + ocupacion.promedio(self.tiempo_actual),
+                         ", ".join(f"{utilizacion:.1%}" for utilizacion in self.utilizacion_cabinas(numero)))
+        if self.estadisticas_tipo is not None:
+            for tipo, clase in self.estadisticas_tipo.items():
+                resumen = clase.resumen(self.tiempo_actual)
+                registro.log(nivel, "%s - en cola promedio: %.2f - en el sistema promedio: %.2f - espera: %.2f s - tiempo en el sistema: %.2f s (%d atendidos)",
+                             tipo.value if isinstance(tipo, Vehiculo) else tipo, resumen['largo_cola'], resumen['largo_sistema'],
+                             resumen['espera'], resumen['tiempo_sistema'], resumen['atendidos'])
+        if self.perfil is not None:
+            perfil = self.perfil.resumen(self)
+            registro.log(nivel, "Perfil: %.0f sucesos/s (%s), máximo de %d sucesos pendientes", perfil['sucesos_por_segundo'],
+                         ", ".join(f"{nombre}: {cantidad}" for nombre, cantidad in perfil['sucesos'].items()), perfil['maximo_calendario'])
+            for nombre, tiempos in perfil['manejadores'].items():
+                registro.log(nivel, "  %-26s %9d llamadas  %8.3f s total  %8.3f s propio", nombre, tiempos['llamadas'], tiempos['total'], tiempos['propio'])
+        self.calcular_costos(nivel)
 
     def procesar_suceso(self, suceso):
-        if suceso.tipo_suceso == 'llegada':
-            self.procesar_llegada(suceso)
-        elif suceso.tipo_suceso == 'salida':
-            self.procesar_salida(suceso)
-
-    def procesar_llegada(self, suceso):
-        if self.cabinas_libres > 0:
-            self.cabinas_libres -= 1
-            tiempo_salida = self.tiempo_actual + TIEMPOS_SERVICIO[suceso.tipo_vehiculo]()
-            heapq.heappush(self.cola_sucesos, Suceso(tiempo_salida, 'salida', suceso.tipo_vehiculo))
+        tiempo, _, codigo, estacion, tipo_vehiculo, dato = suceso
+        if codigo == LLEGADA:
+            self.procesar_llegada(estacion, tipo_vehiculo)
+        elif codigo == SALIDA:
+            self.procesar_salida(estacion, dato, tipo_vehiculo)
+        elif codigo == CAMBIO_CAPACIDAD:
+            self.procesar_cambio_capacidad(estacion, dato)
+
+    def procesar_llegada(self, estacion, tipo_vehiculo):
+        self.vehiculos_llegados += 1
+        if self.trazas is not None:
+            self.trazas.registrar(self.tiempo_actual, LLEGADA, estacion, tipo_vehiculo)
+        cabina = self.cabina_libre(estacion)
+        if self.estadisticas_tipo is not None:
+            self.llegada_tipo(tipo_vehiculo, cabina is None)
+        if cabina is not None:
+            self.iniciar_servicio(estacion, cabina, self.tiempo_actual, tipo_vehiculo)
         else:
-            self.cola_vehiculos.append(suceso)  # Si no hay cabinas libres, se encola
-        self.proxima_llegada(suceso.tipo_vehiculo)
+            self.colas[estacion].encolar(self.tiempo_actual, self.tiempo_actual, tipo_vehiculo)  # Si no hay cabinas libres, se encola
+        self.proxima_llegada(estacion, tipo_vehiculo)
 
-    def proxima_llegada(self, tipo_vehiculo):
-        tasa_arribo = self.obtener_tasa_arribo(tipo_vehiculo)
-        tiempo_llegada = self.tiempo_actual + random.expovariate(tasa_arribo)   # Todas las llegadas siguen una distribución exponencial
-        heapq.heappush(self.cola_sucesos, Suceso(tiempo_llegada, 'llegada', tipo_vehiculo))
+    # Las llegadas son procesos de Poisson con tasa variable según la hora (proceso no homogéneo), ver TablaTasas.proxima_llegada
+    def proxima_llegada(self, estacion, tipo_vehiculo):
+        exponencial = self.banco.entre_llegadas[estacion][tipo_vehiculo].siguiente()
+        tiempo_llegada = self.tablas_tasas[estacion].proxima_llegada(tipo_vehiculo, self.tiempo_actual, exponencial)
+        if tiempo_llegada < math.inf:
+            self.calendario.programar(tiempo_llegada, LLEGADA, estacion, tipo_vehiculo)
 
-    def obtener_tasa_arribo(self, tipo_vehiculo):
-        if self.es_hora_pico():
-            return TIEMPOS_ENTRE_LLEGADAS['pico'][tipo_vehiculo]
-        else:
-            return TIEMPOS_ENTRE_LLEGADAS['no_pico'][tipo_vehiculo]
+    def obtener_tasa_arribo(self, estacion, tipo_vehiculo):
+        return self.tablas_tasas[estacion].tasa(tipo_vehiculo, self.tiempo_actual)
 
-    def procesar_salida(self, suceso):
-        self.vehiculos_atendidos += 1
-        self.cabinas_libres += 1
-        if self.cola_vehiculos:
-            vehiculo_saliente = self.cola_vehiculos.pop(0)  # Se elimina vehiculo de la cola
-            tiempo_espera = self.tiempo_actual - vehiculo_saliente.tiempo
+    # Primera cabina habilitada y libre de la estación (None si están todas ocupadas)
+    def cabina_libre(self, estacion):
+        ocupadas = self.cabinas_ocupadas[estacion]
+        for cabina in range(self.capacidad[estacion]):
+            if not ocupadas[cabina]:
+                return cabina
+        return None
+
+    def iniciar_servicio(self, estacion, cabina, tiempo_llegada, tipo_vehiculo):
+        tiempo_espera = self.tiempo_actual - tiempo_llegada
+        self.estadistica_espera.agregar(tiempo_espera)
+        if self.tiempos_espera is not None:
             self.tiempos_espera.append(tiempo_espera)
-            tiempo_salida = self.tiempo_actual + TIEMPOS_SERVICIO[vehiculo_saliente.tipo_vehiculo]()
-            heapq.heappush(self.cola_sucesos, Suceso(tiempo_salida, 'salida', vehiculo_saliente.tipo_vehiculo, tiempo_llegada=suceso.tiempo))
+        if self.trazas is not None:
+            self.trazas.registrar(self.tiempo_actual, INICIO_SERVICIO, estacion, tipo_vehiculo, cabina, tiempo_espera)
+        self.cabinas_ocupadas[estacion][cabina] = True
+        self.cabinas_en_servicio += 1
+        ocupacion = self.estadistica_ocupacion[estacion]
+        ocupacion.actualizar(self.tiempo_actual, ocupacion.valor + 1)
+        if self.estadisticas_tipo is not None:
+            self.estadisticas_tipo[tipo_vehiculo].espera.agregar(tiempo_espera)
+            self.llegadas_en_atencion[estacion][cabina] = tiempo_llegada
+        if self.serie_espera is not None:
+            self.serie_espera.agregar(tiempo_espera)
+            self.serie_ocupacion.actualizar(self.tiempo_actual, self.cabinas_en_servicio)
+        tiempo_servicio = self.banco.servicio[estacion][tipo_vehiculo].siguiente()
+        self.tiempo_servicio_cabinas[estacion][cabina] += tiempo_servicio
+        self.calendario.programar(self.tiempo_actual + tiempo_servicio, SALIDA, estacion, tipo_vehiculo, cabina)
+
+    def procesar_salida(self, estacion, cabina, tipo_vehiculo=None):
+        self.vehiculos_atendidos += 1
+        if self.trazas is not None:
+            self.trazas.registrar(self.tiempo_actual, SALIDA, estacion, tipo_vehiculo, cabina)
+        self.cabinas_ocupadas[estacion][cabina] = False
+        self.cabinas_en_servicio -= 1
+        ocupacion = self.estadistica_ocupacion[estacion]
+        ocupacion.actualizar(self.tiempo_actual, ocupacion.valor - 1)
+        if self.estadisticas_tipo is not None:
+            self.salida_tipo(tipo_vehiculo, self.llegadas_en_atencion[estacion][cabina])
+        if self.serie_ocupacion is not None:
+            self.serie_ocupacion.actualizar(self.tiempo_actual, self.cabinas_en_servicio)
+        cola = self.colas[estacion]
+        # Si la cabina fue cerrada mientras atendía, termina con el vehículo actual y no toma otro (como la regla "Wait" de Arena)
+        if cola and cabina < self.capacidad[estacion]:
+            tiempo_llegada_saliente, tipo_vehiculo_saliente = cola.desencolar(self.tiempo_actual)  # Se elimina vehiculo de la cola (O(1))
+            if self.estadisticas_tipo is not None:
+                self.desencolado_tipo(tipo_vehiculo_saliente)
+            self.iniciar_servicio(estacion, cabina, tiempo_llegada_saliente, tipo_vehiculo_saliente)
+
+    # Estadísticas por tipo de vehículo (sólo con estadisticas_por_tipo=True): cambios de los vehículos de la clase en cola
+    # y en el sistema, y tiempo en el sistema de cada vehículo que sale
+    def llegada_tipo(self, tipo_vehiculo, encolado):
+        clase = self.estadisticas_tipo[tipo_vehiculo]
+        clase.en_sistema.actualizar(self.tiempo_actual, clase.en_sistema.valor + 1)
+        if encolado:
+            clase.en_cola.actualizar(self.tiempo_actual, clase.en_cola.valor + 1)
+
+    def desencolado_tipo(self, tipo_vehiculo):
+        en_cola = self.estadisticas_tipo[tipo_vehiculo].en_cola
+        en_cola.actualizar(self.tiempo_actual, en_cola.valor - 1)
+
+    def salida_tipo(self, tipo_vehiculo, tiempo_llegada):
+        clase = self.estadisticas_tipo[tipo_vehiculo]
+        clase.en_sistema.actualizar(self.tiempo_actual, clase.en_sistema.valor - 1)
+        clase.tiempo_sistema.agregar(self.tiempo_actual - tiempo_llegada)
+
+    def procesar_cambio_capacidad(self, estacion, dato):
+        cabinas, indice_plan = dato
+        self.cambiar_capacidad(estacion, cabinas)
+        if indice_plan is not None:
+            self.programar_cambio_plan(estacion, indice_plan + 1)
 
-    def es_hora_pico(self):
-        hora_actual = (self.tiempo_actual // 3600) % 24  # Convertir tiempo actual en horas del día
-        for inicio, fin in self.horarios_pico_mañana + self.horarios_pico_vespertino:
-            if inicio <= hora_actual < fin:
-                return True
-        return False
+    # Abre o cierra cabinas: las nuevas cabinas toman vehículos de la cola en el momento, las cerradas terminan su atención en curso
+    def cambiar_capacidad(self, estacion, cabinas):
+        ocupadas = self.cabinas_ocupadas[estacion]
+        if cabinas > len(ocupadas):
+            nuevas = cabinas - len(ocupadas)
+            ocupadas.extend([False] * nuevas)
+            self.tiempo_servicio_cabinas[estacion].extend([0.0] * nuevas)
+            self.habilitacion_cabinas[estacion].extend(AcumuladorTemporal() for _ in range(nuevas))
+            if self.llegadas_en_atencion is not None:
+                self.llegadas_en_atencion[estacion].extend([0.0] * nuevas)
+        self.capacidad[estacion] = cabinas
+        if self.trazas is not None:
+            self.trazas.registrar(self.tiempo_actual, CAMBIO_CAPACIDAD, estacion, cabina=cabinas)
+        self.estadistica_capacidad[estacion].actualizar(self.tiempo_actual, cabinas)
+        for cabina, habilitacion in enumerate(self.habilitacion_cabinas[estacion]):
+            habilitacion.actualizar(self.tiempo_actual, int(cabina < cabinas))
+        cola = self.colas[estacion]
+        for cabina in range(cabinas):
+            if not cola:
+                break
+            if not ocupadas[cabina]:
+                tiempo_llegada, tipo_vehiculo = cola.desencolar(self.tiempo_actual)
+                if self.estadisticas_tipo is not None:
+                    self.desencolado_tipo(tipo_vehiculo)
+                self.iniciar_servicio(estacion, cabina, tiempo_llegada, tipo_vehiculo)
+
+    # Programa un cambio de capacidad fuera del plan diario (por ejemplo, abrir una cabina extra ante una congestión puntual)
+    def programar_cambio_capacidad(self, tiempo, estacion, cabinas):
+        self.calendario.programar(tiempo, CAMBIO_CAPACIDAD, estacion, dato=(cabinas, None))
+
+    # Programa el cambio número "indice" del plan diario de la estación; al terminar la lista sigue con el primero del día siguiente
+    def programar_cambio_plan(self, estacion, indice):
+        cambios = self.cambios_plan[estacion]
+        dia = self.tiempo_actual // SEGUNDOS_DIA
+        if indice == len(cambios):
+            indice = 0
+            dia += 1
+        segundo, cabinas = cambios[indice]
+        self.calendario.programar(dia * SEGUNDOS_DIA + segundo, CAMBIO_CAPACIDAD, estacion, dato=(cabinas, indice))
 
     def programar_sucesos_iniciales(self):
-        for tipo_vehiculo in TIEMPOS_ENTRE_LLEGADAS['no_pico'].keys():
-            tiempo_llegada = self.tiempo_actual + random.expovariate(TIEMPOS_ENTRE_LLEGADAS['no_pico'][tipo_vehiculo])
-            heapq.heappush(self.cola_sucesos, Suceso(tiempo_llegada, 'llegada', tipo_vehiculo))
+        for estacion in range(len(self.estaciones)):
+            for tipo_vehiculo in self.vehiculos:
+                self.proxima_llegada(estacion, tipo_vehiculo)
+            cambios = self.cambios_plan[estacion]
+            if cambios:
+                # El estado a las 0hs ya está aplicado; se programa el primer cambio posterior
+                self.programar_cambio_plan(estacion, next((indice for indice, (segundo, _) in enumerate(cambios) if segundo > 0), len(cambios)))
+
+    # Tiempo (en segundos) que estuvieron habilitadas cabinas por encima de las habituales de cada estación
+    def tiempo_cabinas_extra(self):
+        return sum(max(0, estadistica.promedio(self.tiempo_actual) - estacion.cabinas) * self.tiempo_actual
+                   for estacion, estadistica in zip(self.estaciones, self.estadistica_capacidad))
+
+    # Costo de las cabinas extra del plan: se paga por cada bloque de 10 minutos (o fracción) de cabina extra habilitada
+    def costo_cabinas_extra(self):
+        return math.ceil(round(self.tiempo_cabinas_extra() / (60*10), 6)) * self.costo_cabina_extra
 
-    def calcular_costos(self):
-        tiempo_total_espera = sum(self.tiempos_espera)
-        tiempo_total_habilitacion = sum([((suceso.tiempo - suceso.tiempo_llegada) - self.LIMITE_ESPERA) for suceso in self.cola_sucesos if suceso.tipo_suceso == 'salida' and suceso.tiempo_llegada != None and (suceso.tiempo - suceso.tiempo_llegada) > self.LIMITE_ESPERA])
+    # Costos según el criterio del trabajo: multa por cada segundo de espera por encima del límite, contra habilitar una
+    # cabina extra un bloque de 10 minutos por cada 10 minutos de espera excedida. Devuelve (multas, costo con cabina extra)
+    def costos(self):
+        tiempo_total_habilitacion = self.estadistica_espera.exceso_total  # Suma de lo que cada vehículo esperó por encima del límite
         multas = tiempo_total_habilitacion * self.multa_espera_excesiva
         costo_total_con_cabina_extra = (tiempo_total_habilitacion // (60*10)) * self.costo_cabina_extra
+        return multas, costo_total_con_cabina_extra
 
-        print(f"Costo total sin cabina extra (multas): ${multas:.2f}")
-        print(f"Costo total con cabina extra: ${costo_total_con_cabina_extra:.2f}")
+    def calcular_costos(self, nivel=logging.INFO):
+        multas, costo_total_con_cabina_extra = self.costos()
+
+        registro.log(nivel, "Costo total sin cabina extra (multas): $%.2f", multas)
+        registro.log(nivel, "Costo total con cabina extra: $%.2f", costo_total_con_cabina_extra)
+        if self.tiempo_cabinas_extra() > 0:
+            registro.log(nivel, "Costo de las cabinas extra del plan de cabinas: $%.2f", self.costo_cabinas_extra())
         if costo_total_con_cabina_extra < multas:
-            print("Es más económico habilitar una cabina extra.")
+            registro.log(nivel, "Es más económico habilitar una cabina extra.")
         else:
-            print("Es más económico pagar las multas por tiempos de espera excesivos.")
-        print("-----------------------------------------------------------------")
+            registro.log(nivel, "Es más económico pagar las multas por tiempos de espera excesivos.")
+        registro.log(nivel, "-----------------------------------------------------------------")
+        return multas, costo_total_con_cabina_extra
+
+    # Métricas de la réplica que se devuelven a quien la ejecutó (también desde otro proceso)
+    def resultados_replica(self):
+        multas, costo_total_con_cabina_extra = self.costos()
+        return {
+            'espera': self.estadistica_espera.media,  # Tiempo promedio de espera
+            'excedidos': self.estadistica_espera.excedidos,
+            'vehiculos_atendidos': self.vehiculos_atendidos,
+            'multas': multas,
+            'costo_con_cabina_extra': costo_total_con_cabina_extra,
+            'diferencia_costos': multas - costo_total_con_cabina_extra,  # Positiva: conviene habilitar la cabina extra
+            'costo_plan_cabinas': self.costo_cabinas_extra(),
+            'costo_total': multas + self.costo_cabinas_extra(),  # Costo de la política simulada: multas más las cabinas extra de su plan
+            'llegadas': self.vehiculos_llegados,
+            'llegadas_esperadas': self.llegadas_esperadas(),  # Valor esperado exacto de 'llegadas', sirve como variable de control
+            # Ponderados por tiempo, sumando las estaciones: vehículos en cola (Lq), en el sistema (L), y cabinas ocupadas sobre
+            # cabinas habilitadas (para dimensionar las cabinas por utilización y no sólo por las esperas)
+            'largo_cola': sum(cola.estadistica_largo.promedio(self.tiempo_actual) for cola in self.colas),
+            'largo_sistema': sum(cola.estadistica_largo.promedio(self.tiempo_actual) + ocupacion.promedio(self.tiempo_actual)
+                                 for cola, ocupacion in zip(self.colas, self.estadistica_ocupacion)),
+            'utilizacion': self.utilizacion_total(),
+            'semilla': self.semilla  # Con esta semilla y la misma configuración se repite exactamente la réplica
+        }
+
+    def utilizacion_total(self):
+        capacidad = sum(estadistica.promedio(self.tiempo_actual) for estadistica in self.estadistica_capacidad)
+        return sum(ocupacion.promedio(self.tiempo_actual) for ocupacion in self.estadistica_ocupacion) / capacidad if capacidad > 0 else 0.0
 
-    def mostrar_grafico_espera(self, tiempos_espera):
+    # Cantidad esperada de llegadas hasta el tiempo final según las tablas de tasas de todas las estaciones
+    def llegadas_esperadas(self):
+        return sum(tabla.llegadas_esperadas(tipo_vehiculo, 0, self.tiempo_final) for tabla in self.tablas_tasas for tipo_vehiculo in tabla.tasas)
+
+    # Histograma de los tiempos de espera. Con archivo se dibuja en un hilo en segundo plano sin abrir ventanas y se devuelve
+    # un Future con la ruta; sin archivo se muestra en una ventana (plt.show bloquea hasta cerrarla)
+    def mostrar_grafico_espera(self, tiempos_espera, archivo=None):
+        if archivo is not None:
+            return graficador_segundo_plano().graficar(grafico_espera, list(tiempos_espera), self.LIMITE_ESPERA, archivo)
+        import matplotlib.pyplot as plt
         plt.hist(tiempos_espera, bins=50, edgecolor='black')  # 50 intervalos
-        plt.axvline(self.LIMITE_ESPERA, color='red', linestyle='dashed', linewidth=1, label='Límite de 3 minutos')
+        plt.axvline(self.LIMITE_ESPERA, color='red', linestyle='dashed', linewidth=1, label=f'Límite de {self.LIMITE_ESPERA // 60} minutos')
         plt.xlabel('Tiempo de espera (segundos)')
         plt.ylabel('Número de vehículos')
         plt.title('Distribución de los tiempos de espera de los vehículos')
         plt.legend()
         plt.show()
 
-    def ejecutar_n_veces(self, n):
-        tiempos_promedio_espera = []    # Lista para almacenar los tiempos promedio de espera de cada simulación
-        for _ in range(n):
-            simulacion = SimulacionCabinas(self.tiempo_final, self.horarios_pico_mañana, self.horarios_pico_vespertino, multa_espera)
-            simulacion.ejecutar()
-            tiempos_promedio_espera.append(statistics.mean(simulacion.tiempos_espera))  # Almacena el promedio
+    # Ejecuta una réplica por semilla, en este proceso o repartidas en un grupo de procesos, y devuelve sus resultados en orden.
+    # configuracion reemplaza parámetros del escenario sólo para estas réplicas (por ejemplo antiteticas=True).
+    # Con punto_control las réplicas se ejecutan por lotes y los resultados terminados se guardan en ese archivo; si el archivo
+    # ya existe (de un lote interrumpido con las mismas semillas) sólo se ejecutan las réplicas que faltan.
+    # Con cache (ruta de la base o CacheResultados) sólo se simulan las réplicas que no estén guardadas de una corrida anterior
+    # del mismo escenario con la misma semilla, y las nuevas se agregan al cache (no se usa con punto_control ni con trazas,
+    # que son un efecto de ejecutar cada réplica)
+    def ejecutar_replicas(self, semillas, procesos=1, ejecutor=None, configuracion=None, punto_control=None, intervalo_punto_control=60,
+                          semilla=None, cache=None):
+        configuracion = dict(self.configuracion, **(configuracion or {}))
+        if punto_control is not None:
+            return self.ejecutar_replicas_con_control(semillas, procesos, ejecutor, configuracion, punto_control, intervalo_punto_control, semilla)
+        if cache is not None and configuracion['directorio_trazas'] is None:
+            try:
+                claves = [clave_replica(configuracion, semilla_replica) for semilla_replica in semillas]
+            except (TypeError, ValueError) as error:  # La configuración tiene valores que no se pueden representar en la clave
+                registro.warning("No se usa el cache de resultados: %s", error)
+            else:
+                return self.ejecutar_replicas_con_cache(semillas, claves, procesos, ejecutor, configuracion, abrir_cache(cache))
+        parametros = [(configuracion, semilla_replica) for semilla_replica in semillas]
+        if ejecutor is None and procesos == 1:
+            return [ejecutar_replica(parametros_replica) for parametros_replica in parametros]
+        if ejecutor is None:
+            procesos = procesos or os.cpu_count()
+            with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+                return self.ejecutar_replicas(semillas, procesos, ejecutor, configuracion)
+        # map devuelve los resultados en el orden de las réplicas, no en el orden en que terminan
+        return list(ejecutor.map(ejecutar_replica, parametros, chunksize=max(1, len(parametros) // ((procesos or os.cpu_count()) * 4))))
+
+    def ejecutar_replicas_con_cache(self, semillas, claves, procesos, ejecutor, configuracion, cache):
+        resultados = cache.leer_varias(claves)
+        pendientes = {clave: semilla_replica for clave, semilla_replica in zip(claves, semillas) if clave not in resultados}
+        registro.info("Cache %s: %d réplicas guardadas y %d por simular", cache.ruta, len(claves) - len(pendientes), len(pendientes))
+        if pendientes:
+            nuevos = dict(zip(pendientes, self.ejecutar_replicas(list(pendientes.values()), procesos, ejecutor, configuracion)))
+            cache.guardar_varias(nuevos)
+            resultados.update(nuevos)
+        return [resultados[clave] for clave in claves]
+
+    # semilla es la semilla maestra de la que salen las de las réplicas; sólo se guarda, para poder recuperarla al reanudar
+    def ejecutar_replicas_con_control(self, semillas, procesos, ejecutor, configuracion, punto_control, intervalo_punto_control, semilla=None):
+        semillas = list(semillas)
+        resultados = {}  # {número de réplica: resultados}
+        if puntos_control.existe(punto_control):
+            estado = puntos_control.cargar(punto_control)
+            if estado['semillas'] != semillas:
+                raise ValueError(f"El punto de control {punto_control} corresponde a otras réplicas (otras semillas)")
+            resultados = estado['resultados']
+            registro.info("Reanudando desde %s: %d de %d réplicas terminadas", punto_control, len(resultados), len(semillas))
+        pendientes = [replica for replica in range(len(semillas)) if replica not in resultados]
+        procesos = procesos or os.cpu_count()
+        lote = max(1, procesos * 4)
+        propio = ejecutor is None and procesos > 1  # Un único grupo de procesos para todos los lotes
+        if propio:
+            ejecutor = ProcessPoolExecutor(max_workers=procesos)
+        try:
+            ultimo_guardado = time.monotonic()
+            for inicio in range(0, len(pendientes), lote):
+                replicas = pendientes[inicio:inicio + lote]
+                terminadas = self.ejecutar_replicas([semillas[replica] for replica in replicas], procesos, ejecutor, configuracion)
+                resultados.update(zip(replicas, terminadas))
+                if time.monotonic() - ultimo_guardado >= intervalo_punto_control or len(resultados) == len(semillas):
+                    puntos_control.guardar(punto_control, {'semilla': semilla, 'semillas': semillas, 'resultados': resultados})
+                    ultimo_guardado = time.monotonic()
+        finally:
+            if propio:
+                ejecutor.shutdown()
+        return [resultados[replica] for replica in range(len(semillas))]
+
+    # grafico: None no dibuja nada, 'mostrar' abre la ventana de matplotlib y una ruta de archivo lo guarda en segundo plano.
+    # Con punto_control se puede reanudar un lote interrumpido llamando de nuevo con el mismo archivo (y la misma semilla:
+    # si no se indicó ninguna, se usa la guardada)
+    def ejecutar_n_veces(self, n, semilla=None, procesos=1, confianza=0.95, grafico=None, punto_control=None, cache=None):
+        # Cada réplica recibe una semilla propia derivada de la semilla maestra, así los resultados no dependen de
+        # qué proceso ejecute cada réplica: con la misma semilla, la ejecución serie y la paralela dan lo mismo
+        if semilla is None and puntos_control.existe(punto_control):
+            semilla = puntos_control.cargar(punto_control)['semilla']
+        semilla = semilla_maestra(semilla)
+        semillas = generar_semillas(semilla, n)
+        resultados = self.ejecutar_replicas(semillas, procesos, punto_control=punto_control, semilla=semilla, cache=cache)
+        return self.resumir_replicas(resultados, confianza, grafico, semilla, semillas)
+
+    # Réplicas de una estación con una cabina y cola FIFO resueltas todas juntas con la recursión de Lindley (ver lindley.py),
+    # en segundos aunque sean miles. Mismo resultado que ejecutar_n_veces, pero las réplicas no tienen semilla propia:
+    # se repiten con la semilla maestra y el mismo lote
+    def ejecutar_n_veces_vectorizado(self, n, semilla=None, confianza=0.95, grafico=None, lote=LOTE):
+        semilla = semilla_maestra(semilla)
+        metricas = {metrica: valores.tolist() for metrica, valores in simular_lindley(self, n, semilla, lote).items()}
+        resultados = [dict(zip(metricas, valores)) for valores in zip(*metricas.values())]
+        return self.resumir_replicas(resultados, confianza, grafico, semilla)
+
+    # Intervalo de confianza del tiempo promedio de espera de las réplicas, informe y gráfico
+    def resumir_replicas(self, resultados, confianza, grafico, semilla, semillas=None):
+        tiempos_promedio_espera = [resultado['espera'] for resultado in resultados]
 
         promedio_espera = statistics.mean(tiempos_promedio_espera)  # Promedio de los tiempos promedios
-        intervalo_confianza = stats.t.interval(0.95, len(tiempos_promedio_espera)-1, loc=promedio_espera, scale=stats.sem(tiempos_promedio_espera))
-        # Utiliza la distribución t de student para calcular el intervalo de confianza
-        # Recibe como primer parámetro el nivel de confianza, el segundo es el número de grados de libertad (n-1)
-        # loc son los
-        # scale es el parámetro de escala, y le paso el error estándar de la media (SEM) de los tiempos promedios
-
-        print("\nResultados de las simulaciones:")
-        print(f"Tiempo promedio de espera: {promedio_espera:.2f} segundos")
-        print(f"Intervalo de confianza del 95%: ({intervalo_confianza[0]:.2f}, {intervalo_confianza[1]:.2f})")
-        self.mostrar_grafico_espera(tiempos_promedio_espera)
-
-# Crear y correr la simulación
-multa_espera = 1  # Multa por tiempo de espera excesivo (por segundo)
-simulacion = SimulacionCabinas(24*60*60, horarios_pico_mañana, horarios_pico_vespertino, multa_espera)  # Simulación para 24 horas
-simulacion.ejecutar_n_veces(150)
\ No newline at end of file
+        _, *intervalo_confianza = intervalo_t(tiempos_promedio_espera, confianza)
+        # Utiliza la distribución t de student (con n-1 grados de libertad) y el error estándar de la media de los tiempos
+        # promedios para calcular el intervalo de confianza (ver distribucion_t.py)
+
+        registro.info("Resultados de las simulaciones:")
+        registro.info("Tiempo promedio de espera: %.2f segundos", promedio_espera)
+        registro.info("Intervalo de confianza del %.0f%%: (%.2f, %.2f)", confianza * 100, intervalo_confianza[0], intervalo_confianza[1])
+        futuro_grafico = None
+        if grafico == 'mostrar':
+            self.mostrar_grafico_espera(tiempos_promedio_espera)
+        elif grafico is not None:
+            futuro_grafico = self.mostrar_grafico_espera(tiempos_promedio_espera, archivo=grafico)
+        return ResultadosReplicas(promedio_espera=promedio_espera, intervalo_confianza=(float(intervalo_confianza[0]), float(intervalo_confianza[1])),
+                                  confianza=confianza, replicas=resultados, grafico=futuro_grafico, semilla=semilla, semillas=semillas)
+
+    # Regla de parada secuencial: ejecuta réplicas por lotes hasta que el semiancho del intervalo de confianza de la métrica
+    # elegida sea menor que el objetivo (relativo a la media, o absoluto si se indica semiancho_absoluto), o hasta agotar
+    # max_replicas. Métricas: las claves de resultados_replica, por ejemplo 'espera' o 'diferencia_costos' (multas - cabina extra)
+    def ejecutar_hasta_precision(self, semiancho_relativo=0.05, metrica='espera', confianza=0.95, semiancho_absoluto=None,
+                                 min_replicas=10, max_replicas=10000, lote=None, semilla=None, procesos=1):
+        semilla = semilla_maestra(semilla)  # Fija la semilla maestra para que todos los lotes sigan la misma secuencia
+        procesos = procesos or os.cpu_count()
+        lote = lote or max(min_replicas, 2 * procesos)
+        valores = []
+        ejecutor = ProcessPoolExecutor(max_workers=procesos) if procesos > 1 else None  # Un único grupo de procesos para todos los lotes
+        try:
+            while True:
+                cantidad = min(lote, max_replicas - len(valores))
+                resultados = self.ejecutar_replicas(generar_semillas(semilla, cantidad, inicio=len(valores)), procesos, ejecutor)
+                valores.extend(resultado[metrica] for resultado in resultados)
+                media = statistics.mean(valores)
+                semiancho = cuantil_t(0.5 + confianza / 2, len(valores) - 1) * statistics.stdev(valores) / math.sqrt(len(valores))
+                objetivo = semiancho_absoluto if semiancho_absoluto is not None else semiancho_relativo * abs(media)
+                objetivo_cumplido = len(valores) >= min_replicas and semiancho <= objetivo
+                if objetivo_cumplido or len(valores) >= max_replicas:
+                    break
+        finally:
+            if ejecutor is not None:
+                ejecutor.shutdown()
+
+        registro.info("Resultados de la regla de parada secuencial (%s):", metrica)
+        registro.info("Réplicas necesarias: %d%s", len(valores), '' if objetivo_cumplido else ' (se alcanzó el máximo sin llegar a la precisión pedida)')
+        registro.info("Media: %.2f - Intervalo de confianza del %.0f%%: (%.2f, %.2f)", media, confianza * 100, media - semiancho, media + semiancho)
+        return {'metrica': metrica, 'media': media, 'semiancho': semiancho, 'intervalo': (media - semiancho, media + semiancho),
+                'replicas': len(valores), 'objetivo_cumplido': objetivo_cumplido, 'semilla': semilla}
+
+    # Compara esta política (A) con otra simulación (B), por ejemplo el mismo peaje con y sin cabinas extra en la hora pico,
+    # con el intervalo de confianza de la diferencia pareada A - B de la métrica elegida (por defecto el costo total).
+    # crn=True usa las mismas semillas en las dos políticas (números aleatorios comunes); antiteticas=True agrega a cada réplica
+    # su antitética y usa el promedio del par; control=True corrige con la cantidad de llegadas de cada política, de media conocida.
+    # reduccion_crn compara la varianza de la diferencia con la que tendría simulando las políticas por separado (var A + var B)
+    def comparar_politicas(self, alternativa, n, metrica='costo_total', crn=True, antiteticas=False, control=False,
+                           confianza=0.95, semilla=None, procesos=1):
+        semilla = semilla_maestra(semilla)
+        semillas_a = generar_semillas(semilla, n)
+        semillas_b = semillas_a if crn else generar_semillas(semilla, n, inicio=n)
+        procesos = procesos or os.cpu_count()
+        ejecutor = ProcessPoolExecutor(max_workers=procesos) if procesos > 1 else None  # Un único grupo de procesos para todas las corridas
+        try:
+            corridas = [(simulacion.ejecutar_replicas(semillas, procesos, ejecutor),
+                         simulacion.ejecutar_replicas(semillas, procesos, ejecutor, {'antiteticas': True}) if antiteticas else None)
+                        for simulacion, semillas in ((self, semillas_a), (alternativa, semillas_b))]
+        finally:
+            if ejecutor is not None:
+                ejecutor.shutdown()
+
+        # Una observación por réplica (o por par antitético) de cada política: la métrica y el desvío de las llegadas respecto de su media
+        def observaciones(resultados, antiteticos, funcion):
+            valores = np.array([funcion(resultado) for resultado in resultados], dtype=float)
+            if antiteticos is not None:
+                valores = (valores + np.array([funcion(resultado) for resultado in antiteticos], dtype=float)) / 2
+            return valores
+
+        a, b = (observaciones(*corrida, lambda resultado: resultado[metrica]) for corrida in corridas)
+        diferencias = a - b
+        if control:
+            desvios = [observaciones(*corrida, lambda resultado: resultado['llegadas'] - resultado['llegadas_esperadas']) for corrida in corridas]
+            resultado = variable_control(diferencias, np.column_stack(desvios), confianza=confianza)
+        else:
+            resultado = intervalo_media(diferencias, confianza)
+        varianza_independiente = a.var(ddof=1) + b.var(ddof=1)
+        resultado.update(metrica=metrica, media_a=float(a.mean()), media_b=float(b.mean()), corridas=2 * n * (2 if antiteticas else 1),
+                         reduccion_crn=float(1 - diferencias.var(ddof=1) / varianza_independiente) if varianza_independiente > 0 else 0.0,
+                         semilla=semilla)
+
+        registro.info("Comparación de políticas (%s, %s números aleatorios comunes%s%s):", metrica, 'con' if crn else 'sin',
+                      ', con variables antitéticas' if antiteticas else '', ', con variable de control' if control else '')
+        registro.info("Política A: %.2f - Política B: %.2f", resultado['media_a'], resultado['media_b'])
+        registro.info("Diferencia A - B: %.2f - Intervalo de confianza del %.0f%%: (%.2f, %.2f)", resultado['media'], confianza * 100,
+                      resultado['intervalo'][0], resultado['intervalo'][1])
+        registro.info("Varianza de la diferencia: %.1f%% menor que simulando las políticas por separado", resultado['reduccion_crn'] * 100)
+        if resultado['intervalo'][0] > 0:
+            registro.info("La política B es más económica.")
+        elif resultado['intervalo'][1] < 0:
+            registro.info("La política A es más económica.")
+        else:
+            registro.info("Con estas réplicas no se puede distinguir qué política es más económica.")
+        return resultado
+
+    # Modo de estado estacionario: en lugar de muchas réplicas cortas, una sola corrida larga (por ejemplo 365 días) de la que se
+    # descarta el calentamiento con MSER-5 y se calculan intervalos de confianza por medias de lotes no solapados, para el tiempo
+    # de espera y para las cabinas ocupadas (utilización)
+    def ejecutar_estado_estacionario(self, tiempo_final=None, lotes=20, confianza=0.95, semilla=None):
+        configuracion = dict(self.configuracion, series_estacionarias=True)
+        if tiempo_final is not None:
+            configuracion['tiempo_final'] = tiempo_final
+        simulacion = SimulacionCabinas(semilla=semilla, **configuracion)
+        simulacion.ejecutar()
+        simulacion.serie_ocupacion.actualizar(simulacion.tiempo_actual, simulacion.cabinas_en_servicio)  # Cierra las horas completas
+        espera = analizar_serie(simulacion.serie_espera.medias, lotes, confianza, agrupamiento=5)
+        ocupacion = analizar_serie(simulacion.serie_ocupacion.medias, lotes, confianza)
+        capacidad_promedio = sum(estadistica.promedio(simulacion.tiempo_actual) for estadistica in simulacion.estadistica_capacidad)
+        ocupacion['utilizacion'] = ocupacion['media'] / capacidad_promedio
+
+        registro.info("Resultados en estado estacionario (%d lotes, confianza del %.0f%%):", lotes, confianza * 100)
+        registro.info("Tiempo de espera: %.2f s (%.2f, %.2f) - calentamiento descartado: %s vehículos", espera['media'],
+                      espera['intervalo'][0], espera['intervalo'][1], espera['truncamiento'])
+        registro.info("Cabinas ocupadas: %.3f (%.3f, %.3f) - utilización %.1f%% - calentamiento descartado: %s horas", ocupacion['media'],
+                      ocupacion['intervalo'][0], ocupacion['intervalo'][1], ocupacion['utilizacion'] * 100, ocupacion['truncamiento'])
+        return {'espera': espera, 'cabinas_ocupadas': ocupacion, 'semilla': simulacion.semilla}
+
+# Clave de los resultados de una réplica en el cache: todo lo que los determina, la configuración del escenario (estaciones,
+# horarios pico, cabinas, multas, horizonte, ...), las tasas de llegada y distribuciones de servicio de cada tipo de vehículo
+# (las de la configuración si las trae, si no las de este módulo) y la semilla (el núcleo compilado da los mismos resultados,
+# así que no forma parte de la clave)
+def clave_replica(configuracion, semilla):
+    return clave_contenido(configuracion, TIEMPOS_ENTRE_LLEGADAS, TIEMPOS_SERVICIO, semilla)
+
+# Ejecuta una réplica completa y devuelve sus resultados. Es una función de módulo para poder enviarla a otros procesos
+def ejecutar_replica(parametros):
+    configuracion, semilla = parametros
+    simulacion = SimulacionCabinas(semilla=semilla, **configuracion)
+    simulacion.ejecutar()
+    return simulacion.resultados_replica()
+
+# Crear y correr la simulación (el if evita que los procesos trabajadores vuelvan a lanzarla al importar el módulo)
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')  # Muestra los resúmenes en la consola (DEBUG agrega el de cada réplica)
+    argumentos = argparse.ArgumentParser(description='Simulación del peaje: 150 réplicas de un día')
+    argumentos.add_argument('--cache', default=None, help='base SQLite donde guardar y reutilizar los resultados de las réplicas '
+                                                           '(por ejemplo cache_peaje.sqlite); sin esta opción no se escribe nada en disco')
+    opciones = argumentos.parse_args()
+    multa_espera = 1  # Multa por tiempo de espera excesivo (por segundo)
+    simulacion = SimulacionCabinas(24*60*60, horarios_pico_mañana, horarios_pico_vespertino, multa_espera)  # Simulación para 24 horas
+    # procesos=None usa todos los núcleos disponibles; con --cache, volver a correr el mismo escenario no simula nada
+    simulacion.ejecutar_n_veces(150, semilla=2024, procesos=None, grafico='mostrar', cache=opciones.cache)
@@ -0,0 +1,121 @@
+from collections import deque
+from estadisticas import AcumuladorTemporal
+
+# Colas de espera de vehículos. Cada vehículo se guarda como una tupla (tiempo de llegada, tipo de vehículo).
+# Todas las disciplinas encolan y desencolan en O(1) (deque) y llevan el largo de la cola ponderado por tiempo (Lq)
+class Cola:
+    def __init__(self):
+        self.largo = 0
+        self.estadistica_largo = AcumuladorTemporal()
+
+    def encolar(self, tiempo, tiempo_llegada, tipo_vehiculo):
+        self.agregar((tiempo_llegada, tipo_vehiculo))
+        self.largo += 1
+        self.estadistica_largo.actualizar(tiempo, self.largo)
+
+    def desencolar(self, tiempo):
+        vehiculo = self.quitar()
+        self.largo -= 1
+        self.estadistica_largo.actualizar(tiempo, self.largo)
+        return vehiculo
+
+    def __len__(self):
+        return self.largo
+
+    # Cada disciplina define cómo se guarda un vehículo y cuál sale primero
+    def agregar(self, vehiculo):
+        raise NotImplementedError
+
+    def quitar(self):
+        raise NotImplementedError
+
+# Primero en llegar, primero en ser atendido
+class ColaFIFO(Cola):
+    def __init__(self):
+        super().__init__()
+        self.vehiculos = deque()
+
+    def agregar(self, vehiculo):
+        self.vehiculos.append(vehiculo)
+
+    def quitar(self):
+        return self.vehiculos.popleft()
+
+    # Vehículos que deja el núcleo compilado (nucleo.py) al terminar, como arreglos de tiempos de llegada e índices en
+    # tipos_vehiculo. Se pasan a tuplas recién si la simulación vuelve a usar la cola: mientras tanto agregar y quitar
+    # de la instancia tapan a los de la clase, así el ciclo de sucesos no paga ninguna verificación
+    def diferir_vehiculos(self, tiempos, indices_tipos, tipos_vehiculo):
+        self.largo = len(self.vehiculos) + len(tiempos)
+        self.pendientes = (tiempos, indices_tipos, tipos_vehiculo)
+        self.agregar = self.agregar_pendientes
+        self.quitar = self.quitar_pendientes
+
+    def cargar_pendientes(self):
+        tiempos, indices_tipos, tipos_vehiculo = self.pendientes
+        self.vehiculos.extend(zip(tiempos.tolist(), map(tipos_vehiculo.__getitem__, indices_tipos.tolist())))
+        del self.pendientes, self.agregar, self.quitar
+
+    def agregar_pendientes(self, vehiculo):
+        self.cargar_pendientes()
+        self.agregar(vehiculo)
+
+    def quitar_pendientes(self):
+        self.cargar_pendientes()
+        return self.quitar()
+
+# Prioridad por tipo de vehículo: una fila FIFO por nivel de prioridad (menor número = se atiende antes). Los tipos que
+# no están en prioridades (por ejemplo los vehículos especiales de un escenario) van a la fila de menor prioridad
+class ColaPrioridad(Cola):
+    def __init__(self, prioridades):
+        super().__init__()
+        if not prioridades:
+            raise ValueError("La disciplina 'prioridad' necesita el nivel de prioridad de al menos un tipo de vehículo")
+        self.prioridades = prioridades  # {tipo de vehículo: nivel de prioridad}
+        self.filas = {nivel: deque() for nivel in sorted(set(prioridades.values()))}  # Ordenadas de mayor a menor prioridad
+        self.nivel_minimo = max(self.filas)
+
+    def agregar(self, vehiculo):
+        self.filas[self.prioridades.get(vehiculo[1], self.nivel_minimo)].append(vehiculo)
+
+    def quitar(self):
+        for fila in self.filas.values():
+            if fila:
+                return fila.popleft()
+
+# Carril exclusivo para un tipo de vehículo (por ejemplo las motocicletas): los vehículos de ese tipo hacen su propia fila
+# y la cabina toma alternadamente de cada carril (como un cierre "cremallera"). Si un carril está vacío se atiende el otro
+class ColaCarrilExclusivo(Cola):
+    def __init__(self, tipo_carril):
+        super().__init__()
+        self.tipo_carril = tipo_carril
+        self.carril_exclusivo = deque()
+        self.carril_general = deque()
+        self.turno_exclusivo = True  # Indica de qué carril sale el próximo vehículo cuando ambos tienen espera
+
+    def agregar(self, vehiculo):
+        if vehiculo[1] == self.tipo_carril:
+            self.carril_exclusivo.append(vehiculo)
+        else:
+            self.carril_general.append(vehiculo)
+
+    def quitar(self):
+        if self.carril_exclusivo and (self.turno_exclusivo or not self.carril_general):
+            self.turno_exclusivo = False
+            return self.carril_exclusivo.popleft()
+        self.turno_exclusivo = True
+        return self.carril_general.popleft()
+
+DISCIPLINAS = ['fifo', 'prioridad', 'carril_exclusivo']
+
+# Crea la cola de la disciplina pedida. También acepta una subclase de Cola, para usar disciplinas propias
+# (se pasa la clase y no una instancia porque cada réplica necesita su propia cola vacía)
+def crear_cola(disciplina, prioridades=None, tipo_carril=None):
+    if isinstance(disciplina, type) and issubclass(disciplina, Cola):
+        return disciplina()
+    if disciplina == 'fifo':
+        return ColaFIFO()
+    if disciplina == 'prioridad':
+        return ColaPrioridad(prioridades)
+    if disciplina == 'carril_exclusivo':
+        return ColaCarrilExclusivo(tipo_carril)
+    raise ValueError(f"Disciplina de cola desconocida: '{disciplina}'. Disponibles: {', '.join(DISCIPLINAS)}")
@@ -0,0 +1,73 @@
+import math
+from statistics import NormalDist
+
+# Cuantiles de la t de Student sin scipy, para que los procesos que sólo simulan réplicas arranquen con la biblioteca estándar
+# y NumPy. Los niveles de confianza habituales (80%, 90%, 95%, 98%, 99% y 99,9% de dos colas) con hasta 30 grados de libertad
+# salen de una tabla; con más grados de libertad, de la expansión de Cornish-Fisher alrededor del cuantil normal (Abramowitz y
+# Stegun 26.7.5), con error relativo menor que 1e-6 desde 30 grados de libertad. Cualquier otro caso se delega en scipy,
+# que recién ahí se importa
+GRADOS_TABLA = 30
+
+# {probabilidad acumulada: (cuantil con 1, 2, ..., GRADOS_TABLA grados de libertad)}
+TABLA_T = {
+    0.9: (
+        3.077683537, 1.885618083, 1.637744354, 1.533206274, 1.475884049, 1.439755747, 1.414923928, 1.39681531, 1.383028738, 1.372183641,
+        1.363430318, 1.356217334, 1.350171289, 1.345030374, 1.340605608, 1.336757167, 1.33337939, 1.330390944, 1.327728209, 1.325340707,
+        1.323187874, 1.321236742, 1.31946024, 1.317835934, 1.316345073, 1.314971864, 1.313702913, 1.312526782, 1.311433647, 1.310415025,
+    ),
+    0.95: (
+        6.313751515, 2.91998558, 2.353363435, 2.131846786, 2.015048373, 1.943180281, 1.894578605, 1.859548038, 1.833112933, 1.812461123,
+        1.795884819, 1.782287556, 1.770933396, 1.761310136, 1.753050356, 1.745883676, 1.739606726, 1.734063607, 1.729132812, 1.724718243,
+        1.720742903, 1.717144374, 1.713871528, 1.71088208, 1.708140761, 1.70561792, 1.703288446, 1.701130934, 1.699127027, 1.697260887,
+    ),
+    0.975: (
+        12.70620474, 4.30265273, 3.182446305, 2.776445105, 2.570581836, 2.446911851, 2.364624252, 2.306004135, 2.262157163, 2.228138852,
+        2.20098516, 2.17881283, 2.160368656, 2.144786688, 2.131449546, 2.119905299, 2.109815578, 2.10092204, 2.093024054, 2.085963447,
+        2.079613845, 2.073873068, 2.06865761, 2.063898562, 2.059538553, 2.055529439, 2.051830516, 2.048407142, 2.045229642, 2.042272456,
+    ),
+    0.99: (
+        31.82051595, 6.964556734, 4.540702859, 3.746947388, 3.364929999, 3.142668403, 2.997951567, 2.896459448, 2.821437925, 2.763769458,
+        2.718079184, 2.680997993, 2.650308838, 2.624494068, 2.602480295, 2.583487185, 2.566933984, 2.55237963, 2.539483191, 2.527977003,
+        2.517648016, 2.508324553, 2.499866739, 2.492159473, 2.485107175, 2.478629824, 2.472659912, 2.467140098, 2.46202136, 2.457261542,
+    ),
+    0.995: (
+        63.65674116, 9.924843201, 5.84090931, 4.604094871, 4.032142984, 3.707428021, 3.499483297, 3.355387331, 3.249835542, 3.169272673,
+        3.105806516, 3.054539589, 3.012275839, 2.976842734, 2.946712883, 2.920781622, 2.89823052, 2.878440473, 2.860934606, 2.84533971,
+        2.831359558, 2.818756061, 2.807335684, 2.796939505, 2.787435814, 2.778714533, 2.770682957, 2.763262455, 2.756385904, 2.749995654,
+    ),
+    0.9995: (
+        636.6192488, 31.59905458, 12.92397864, 8.610301581, 6.868826626, 5.958816179, 5.407882521, 5.041305433, 4.780912586, 4.586893859,
+        4.436979338, 4.317791284, 4.220831728, 4.140454113, 4.072765196, 4.014996327, 3.965126272, 3.921645825, 3.883405853, 3.849516275,
+        3.819277164, 3.792130672, 3.767626804, 3.745398619, 3.72514395, 3.706611743, 3.689591713, 3.673906401, 3.659405019, 3.645958635,
+    ),
+}
+
+def cornish_fisher(probabilidad, grados):
+    x = NormalDist().inv_cdf(probabilidad)
+    g1 = (x ** 3 + x) / 4
+    g2 = (5 * x ** 5 + 16 * x ** 3 + 3 * x) / 96
+    g3 = (3 * x ** 7 + 19 * x ** 5 + 17 * x ** 3 - 15 * x) / 384
+    g4 = (79 * x ** 9 + 776 * x ** 7 + 1482 * x ** 5 - 1920 * x ** 3 - 945 * x) / 92160
+    return x + g1 / grados + g2 / grados ** 2 + g3 / grados ** 3 + g4 / grados ** 4
+
+# Igual que scipy.stats.t.ppf(probabilidad, grados)
+def cuantil_t(probabilidad, grados):
+    if grados <= 0:
+        return math.nan
+    tabla = TABLA_T.get(round(probabilidad, 10))
+    if tabla is not None and grados <= GRADOS_TABLA and grados == int(grados):
+        return tabla[int(grados) - 1]
+    if grados > GRADOS_TABLA and 1e-4 <= probabilidad <= 1 - 1e-4:
+        return cornish_fisher(probabilidad, grados)
+    import scipy.stats as stats
+    return float(stats.t.ppf(probabilidad, grados))
+
+# Intervalo de confianza de la media de los valores con la t de Student, como scipy.stats.t.interval con el error estándar
+def intervalo_t(valores, confianza=0.95):
+    n = len(valores)
+    media = math.fsum(valores) / n
+    if n < 2:
+        return media, math.nan, math.nan
+    desvio = math.sqrt(math.fsum((valor - media) ** 2 for valor in valores) / (n - 1))
+    semiancho = cuantil_t(0.5 + confianza / 2, n - 1) * desvio / math.sqrt(n)
+    return media, media - semiancho, media + semiancho
@@ -0,0 +1,241 @@
+import os
+import math
+import logging
+import argparse
+import numpy as np
+from muestreo import DISTRIBUCIONES
+from tasas import TablaTasas, SEGUNDOS_DIA, RESOLUCION
+from codigo_final_v2 import SimulacionCabinas, Estacion, Vehiculo
+from colas import DISCIPLINAS
+
+# Escenarios declarativos: un archivo TOML (o YAML, si está instalado PyYAML) describe las estaciones, sus cabinas y plan de
+# cabinas, los tipos de vehículo con sus distribuciones de llegada y de servicio, los perfiles horarios y las reglas de costo.
+# cargar_escenario lo valida y lo compila a lo que usa el simulador: una TablaTasas por estación (la tasa de cada tipo de
+# vehículo en cada intervalo de 15 minutos, o de simulacion.resolucion segundos) y las tablas de distribuciones con las que cada réplica arma su BancoMuestras.
+# El resultado es sólo datos (números, listas, diccionarios), así que la configuración viaja a los procesos trabajadores
+# sin funciones ni lambdas. Ejemplo completo en escenario_peaje.toml; el formato es:
+#
+#   [simulacion]                      dias (o tiempo_final en segundos), disciplina, replicas, semilla
+#   [costos]                          multa_espera ($ por segundo sobre el límite), limite_espera (segundos), costo_cabina_extra
+#   [vehiculos.GRANDE]                un tipo de vehículo (los nombres de Vehiculo usan ese tipo; otros nombres crean uno nuevo)
+#   entre_llegadas = {distribucion = "exponencial", pico = 40, no_pico = 70}   tiempo medio entre llegadas por régimen
+#   servicio = {distribucion = "exponencial", parametros = [30]}             cualquier distribución registrada en muestreo.py
+#   servicio = {distribucion = "mezcla", parametros = [[0.5, "uniforme", [45, 55]], [0.5, "exponencial", [30]]]}
+#   prioridad = 2                     para la disciplina 'prioridad' (menor = se atiende antes)
+#   [[estaciones]]                    nombre, cabinas, plan_cabinas = [[7, 9, 3]] (hora inicio, hora fin, cabinas)
+#   horarios_pico = [[7, 9]]          franjas del régimen "pico"; el resto del día es regimen_base (por defecto "no_pico")
+#   franjas = [[6, 7, "valle"]]       franjas de cualquier régimen (se suman a horarios_pico)
+#   franjas_fin_de_semana = [...]     si está, sábados y domingos usan estas franjas en lugar de las de días hábiles
+#
+# Las llegadas son procesos de Poisson con tasa constante por franja (tiempos entre llegadas exponenciales), como en el
+# simulador; un régimen sin tiempo medio para un tipo de vehículo significa que ese tipo no llega en esas franjas
+REGIMEN_BASE = 'no_pico'
+CLAVES = {
+    'escenario': {'nombre', 'simulacion', 'costos', 'vehiculos', 'estaciones'},
+    'simulacion': {'dias', 'tiempo_final', 'disciplina', 'replicas', 'semilla', 'resolucion'},
+    'costos': {'multa_espera', 'limite_espera', 'costo_cabina_extra'},
+    'vehiculo': {'entre_llegadas', 'servicio', 'prioridad'},
+    'servicio': {'distribucion', 'parametros'},
+    'estacion': {'nombre', 'cabinas', 'plan_cabinas', 'horarios_pico', 'franjas', 'franjas_fin_de_semana', 'regimen_base'},
+}
+
+class ErrorEscenario(ValueError):
+    pass
+
+# Escenario compilado: configuracion son los argumentos de SimulacionCabinas (menos la semilla)
+class Escenario:
+    def __init__(self, nombre, configuracion, replicas=30, semilla=None):
+        self.nombre = nombre
+        self.configuracion = configuracion
+        self.replicas = replicas
+        self.semilla = semilla
+
+    def simulacion(self, **cambios):
+        return SimulacionCabinas(**dict(self.configuracion, **cambios))
+
+def leer_archivo(ruta):
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == '.toml':
+        try:
+            import tomllib
+        except ImportError:  # Python < 3.11
+            import tomli as tomllib
+        with open(ruta, 'rb') as archivo:
+            return tomllib.load(archivo)
+    if extension in ('.yaml', '.yml'):
+        try:
+            import yaml
+        except ImportError:
+            raise ErrorEscenario(f"{ruta}: para leer escenarios YAML hace falta PyYAML (pip install pyyaml)") from None
+        with open(ruta) as archivo:
+            return yaml.safe_load(archivo)
+    raise ErrorEscenario(f"{ruta}: formato de escenario desconocido '{extension}' (se admiten .toml, .yaml y .yml)")
+
+def cargar_escenario(ruta):
+    datos = leer_archivo(ruta)
+    return compilar_escenario(datos, nombre=os.path.splitext(os.path.basename(ruta))[0], origen=ruta)
+
+# Valida el escenario ya leído (un diccionario) y lo compila. Los errores dicen dónde está el problema: archivo: sección: mensaje
+def compilar_escenario(datos, nombre=None, origen='escenario'):
+    def error(lugar, mensaje):
+        return ErrorEscenario(f"{origen}: {lugar}: {mensaje}")
+
+    def seccion(valor, lugar, tipo):
+        if valor is None:
+            valor = {}
+        if not isinstance(valor, dict):
+            raise error(lugar, "tiene que ser una tabla")
+        desconocidas = set(valor) - CLAVES[tipo]
+        if desconocidas:
+            raise error(lugar, f"claves desconocidas {sorted(desconocidas)} (se admiten {sorted(CLAVES[tipo])})")
+        return valor
+
+    def numero(valor, lugar, minimo=0, entero=False):
+        if isinstance(valor, bool) or not isinstance(valor, (int, float)) or (entero and not isinstance(valor, int)):
+            raise error(lugar, f"tiene que ser un número{' entero' if entero else ''}, no {valor!r}")
+        if not valor >= minimo or not math.isfinite(valor):
+            raise error(lugar, f"tiene que ser mayor o igual que {minimo}, no {valor!r}")
+        return valor
+
+    def franjas(valor, lugar, con_valor):
+        compiladas = []
+        for indice, franja in enumerate(valor or []):
+            largo = 3 if con_valor else 2
+            if not isinstance(franja, (list, tuple)) or len(franja) != largo:
+                raise error(f"{lugar}[{indice}]", f"tiene que ser [hora_inicio, hora_fin{', valor' if con_valor else ''}]")
+            inicio = numero(franja[0], f"{lugar}[{indice}]")
+            fin = numero(franja[1], f"{lugar}[{indice}]")
+            if not inicio < fin <= 24:
+                raise error(f"{lugar}[{indice}]", f"la franja tiene que cumplir inicio < fin <= 24, no [{inicio}, {fin}]")
+            compiladas.append((inicio, fin) + tuple(franja[2:]))
+        return compiladas
+
+    # Parámetros de una distribución de servicio; los de una mezcla son componentes [peso, distribución, [parámetros]]
+    def parametros_distribucion(distribucion, parametros, lugar):
+        if distribucion not in DISTRIBUCIONES:
+            raise error(lugar, f"distribución desconocida {distribucion!r} (registradas: {', '.join(DISTRIBUCIONES)})")
+        if not isinstance(parametros, (list, tuple)):
+            raise error(f"{lugar}.parametros", "tiene que ser una lista")
+        if distribucion != 'mezcla':
+            return tuple(numero(parametro, f"{lugar}.parametros") for parametro in parametros)
+        componentes = []
+        for indice, componente in enumerate(parametros):
+            lugar_componente = f"{lugar}.parametros[{indice}]"
+            if not isinstance(componente, (list, tuple)) or len(componente) != 3:
+                raise error(lugar_componente, "tiene que ser [peso, distribución, [parámetros]]")
+            peso, distribucion_componente, parametros_componente = componente
+            componentes.append((numero(peso, lugar_componente), distribucion_componente,
+                                parametros_distribucion(distribucion_componente, parametros_componente, lugar_componente)))
+        if not sum(peso for peso, _, _ in componentes) > 0:
+            raise error(f"{lugar}.parametros", "la mezcla necesita al menos una componente con peso positivo")
+        return tuple(componentes)
+
+    datos = seccion(datos, 'escenario', 'escenario')
+    simulacion = seccion(datos.get('simulacion'), 'simulacion', 'simulacion')
+    costos = seccion(datos.get('costos'), 'costos', 'costos')
+    if 'dias' in simulacion and 'tiempo_final' in simulacion:
+        raise error('simulacion', "se indica dias o tiempo_final, no ambos")
+    tiempo_final = simulacion['tiempo_final'] if 'tiempo_final' in simulacion else numero(simulacion.get('dias', 1), 'simulacion.dias') * SEGUNDOS_DIA
+    numero(tiempo_final, 'simulacion.tiempo_final')
+    disciplina = simulacion.get('disciplina', 'fifo')
+    if disciplina not in DISCIPLINAS:
+        raise error('simulacion.disciplina', f"disciplina desconocida '{disciplina}' (disponibles: {', '.join(DISCIPLINAS)})")
+    resolucion = numero(simulacion.get('resolucion', RESOLUCION), 'simulacion.resolucion', minimo=1, entero=True)
+    if SEGUNDOS_DIA % resolucion:
+        raise error('simulacion.resolucion', f"tiene que dividir exactamente a un día ({SEGUNDOS_DIA} segundos)")
+
+    # Tipos de vehículo: distribuciones de servicio (para BancoMuestras) y tasas de cada régimen (para las TablaTasas)
+    vehiculos = datos.get('vehiculos')
+    if not isinstance(vehiculos, dict) or not vehiculos:
+        raise error('vehiculos', "hace falta al menos un tipo de vehículo")
+    tiempos_servicio = {}
+    tasas_regimen = {}  # {régimen: {tipo de vehículo: tasa}}
+    prioridades = {}
+    for nombre_vehiculo, vehiculo in vehiculos.items():
+        lugar = f"vehiculos.{nombre_vehiculo}"
+        vehiculo = seccion(vehiculo, lugar, 'vehiculo')
+        tipo = Vehiculo[nombre_vehiculo] if nombre_vehiculo in Vehiculo.__members__ else nombre_vehiculo
+        servicio = seccion(vehiculo.get('servicio'), f"{lugar}.servicio", 'servicio')
+        distribucion = servicio.get('distribucion')
+        parametros = parametros_distribucion(distribucion, servicio.get('parametros', []), f"{lugar}.servicio")
+        try:
+            muestras = DISTRIBUCIONES[distribucion](np.linspace(0, 0.999, 5), *parametros)  # Prueba de los parámetros
+        except TypeError:
+            raise error(f"{lugar}.servicio", f"parámetros {list(parametros)} inválidos para la distribución '{distribucion}'") from None
+        if not (muestras >= 0).all():
+            raise error(f"{lugar}.servicio", f"los parámetros {list(parametros)} dan tiempos de servicio negativos")
+        tiempos_servicio[tipo] = (distribucion, parametros)
+        entre_llegadas = vehiculo.get('entre_llegadas') or {}
+        if not isinstance(entre_llegadas, dict):
+            raise error(f"{lugar}.entre_llegadas", "tiene que ser una tabla {régimen = tiempo medio entre llegadas}")
+        entre_llegadas = dict(entre_llegadas)
+        if entre_llegadas.pop('distribucion', 'exponencial') != 'exponencial':
+            raise error(f"{lugar}.entre_llegadas", "las llegadas son procesos de Poisson: la distribución tiene que ser 'exponencial'")
+        for regimen, media in entre_llegadas.items():
+            media = numero(media, f"{lugar}.entre_llegadas.{regimen}")
+            tasas_regimen.setdefault(regimen, {})[tipo] = 1 / media if media > 0 else 0.0
+        if 'prioridad' in vehiculo:
+            prioridades[tipo] = numero(vehiculo['prioridad'], f"{lugar}.prioridad", entero=True)
+    if disciplina == 'prioridad' and len(prioridades) != len(tiempos_servicio):
+        raise error('vehiculos', "con la disciplina 'prioridad' cada tipo de vehículo necesita su prioridad")
+
+    # Estaciones: cabinas, plan de cabinas y la TablaTasas de su perfil horario
+    estaciones_datos = datos.get('estaciones')
+    if not isinstance(estaciones_datos, list) or not estaciones_datos:
+        raise error('estaciones', "hace falta al menos una estación ([[estaciones]])")
+    estaciones = []
+    for numero_estacion, estacion in enumerate(estaciones_datos):
+        lugar = f"estaciones[{numero_estacion}]"
+        estacion = seccion(estacion, lugar, 'estacion')
+        nombre_estacion = str(estacion.get('nombre', chr(ord('A') + numero_estacion)))
+        cabinas = numero(estacion.get('cabinas', 1), f"{lugar}.cabinas", minimo=1, entero=True)
+        plan_cabinas = franjas(estacion.get('plan_cabinas'), f"{lugar}.plan_cabinas", con_valor=True)
+        for inicio, fin, cabinas_franja in plan_cabinas:
+            numero(cabinas_franja, f"{lugar}.plan_cabinas", entero=True)
+        horarios_pico = franjas(estacion.get('horarios_pico'), f"{lugar}.horarios_pico", con_valor=False)
+        regimen_base = estacion.get('regimen_base', REGIMEN_BASE)
+        habiles = [(inicio, fin, 'pico') for inicio, fin in horarios_pico] + franjas(estacion.get('franjas'), f"{lugar}.franjas", con_valor=True)
+        fin_de_semana = None
+        if 'franjas_fin_de_semana' in estacion:
+            fin_de_semana = franjas(estacion['franjas_fin_de_semana'], f"{lugar}.franjas_fin_de_semana", con_valor=True)
+        for regimen in {regimen_base} | {franja[2] for franja in habiles + (fin_de_semana or [])}:
+            if regimen not in tasas_regimen:
+                raise error(lugar, f"el régimen '{regimen}' no tiene tiempos entre llegadas en ningún tipo de vehículo")
+        perfil = perfil_franjas(tasas_regimen, list(tiempos_servicio), habiles, fin_de_semana, regimen_base)
+        tabla = TablaTasas.desde_perfil(perfil, dias=1 if fin_de_semana is None else 7, resolucion=resolucion)
+        estaciones.append(Estacion(nombre_estacion, cabinas=cabinas, horarios_pico=horarios_pico, plan_cabinas=plan_cabinas,
+                                   tabla=tabla, resolucion=resolucion))
+
+    configuracion = dict(tiempo_final=tiempo_final, horarios_pico_mañana=[], horarios_pico_vespertino=[],
+                         multa_espera=numero(costos.get('multa_espera', 1), 'costos.multa_espera'),
+                         costo_cabina_extra=numero(costos.get('costo_cabina_extra', 100), 'costos.costo_cabina_extra'),
+                         limite_espera=numero(costos.get('limite_espera', 3*60), 'costos.limite_espera'),
+                         disciplina=disciplina, estaciones=estaciones, tiempos_servicio=tiempos_servicio, prioridades=prioridades or None)
+    semilla = simulacion.get('semilla')
+    if semilla is not None:
+        numero(semilla, 'simulacion.semilla', entero=True)
+    return Escenario(datos.get('nombre', nombre), configuracion, numero(simulacion.get('replicas', 30), 'simulacion.replicas', minimo=1, entero=True), semilla)
+
+# Perfil para TablaTasas.desde_perfil: en cada hora, las tasas del régimen de la franja que la contiene (la primera que
+# coincida) o del régimen base. Sólo se usa al compilar; lo que llega a la simulación es la tabla
+def perfil_franjas(tasas_regimen, vehiculos, habiles, fin_de_semana, regimen_base):
+    def perfil(dia_semana, hora):
+        franjas_dia = habiles if fin_de_semana is None or dia_semana < 5 else fin_de_semana
+        regimen = next((regimen for inicio, fin, regimen in franjas_dia if inicio <= hora < fin), regimen_base)
+        return {vehiculo: tasas_regimen[regimen].get(vehiculo, 0.0) for vehiculo in vehiculos}
+    return perfil
+
+# Corre las réplicas de un escenario:  python escenarios.py escenario_peaje.toml [--replicas 150] [--procesos 4]
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    argumentos = argparse.ArgumentParser(description='Simula un escenario descripto en un archivo TOML o YAML')
+    argumentos.add_argument('archivo')
+    argumentos.add_argument('--replicas', type=int, default=None, help='por defecto, las del archivo')
+    argumentos.add_argument('--semilla', type=int, default=None, help='por defecto, la del archivo')
+    argumentos.add_argument('--procesos', type=int, default=None, help='por defecto, todos los núcleos')
+    argumentos.add_argument('--cache', default=None, help='base SQLite de resultados de réplicas (ver cache_resultados.py)')
+    opciones = argumentos.parse_args()
+    escenario = cargar_escenario(opciones.archivo)
+    logging.getLogger('peaje').info("Escenario %s", escenario.nombre)
+    escenario.simulacion().ejecutar_n_veces(opciones.replicas or escenario.replicas, semilla=opciones.semilla if opciones.semilla is not None else escenario.semilla,
+                                            procesos=opciones.procesos, cache=opciones.cache)
@@ -0,0 +1,207 @@
+from array import array
+
+# Acumulador de una variable que cambia en instantes discretos y se mantiene constante entre cambios
+# (largo de la cola, cabinas ocupadas, etc.). Se actualiza sólo cuando la variable cambia: acumula el área bajo la curva
+# valor(t) para obtener el promedio ponderado por tiempo, como las estadísticas "time-persistent" de Arena
+class AcumuladorTemporal:
+    __slots__ = ('tiempo_inicio', 'tiempo_ultimo', 'valor', 'area', 'maximo')
+
+    def __init__(self, tiempo_inicio=0, valor=0):
+        self.tiempo_inicio = tiempo_inicio
+        self.tiempo_ultimo = tiempo_inicio  # Instante del último cambio
+        self.valor = valor
+        self.area = 0.0
+        self.maximo = valor
+
+    def actualizar(self, tiempo, valor):
+        self.area += self.valor * (tiempo - self.tiempo_ultimo)
+        self.tiempo_ultimo = tiempo
+        self.valor = valor
+        if valor > self.maximo:
+            self.maximo = valor
+
+    def promedio(self, tiempo_final):
+        duracion = tiempo_final - self.tiempo_inicio
+        if duracion <= 0:
+            return self.valor
+        return (self.area + self.valor * (tiempo_final - self.tiempo_ultimo)) / duracion
+
+# Estimador del cuantil p con el algoritmo P² (Jain y Chlamtac, 1985): mantiene sólo 5 marcadores cuyas alturas se ajustan
+# con interpolación parabólica en cada observación, sin guardar los datos
+class CuantilP2:
+    __slots__ = ('p', 'n', 'alturas', 'posiciones', 'incrementos')
+
+    def __init__(self, p):
+        self.p = p
+        self.n = 0
+        self.alturas = []  # Las primeras 5 observaciones se guardan tal cual
+        self.posiciones = [1, 2, 3, 4, 5]
+        self.incrementos = (0, p / 2, p, (1 + p) / 2, 1)  # La posición deseada del marcador i es 1 + (n - 1) * incrementos[i]
+
+    def agregar(self, x):
+        self.n += 1
+        alturas = self.alturas
+        if self.n <= 5:
+            alturas.append(x)
+            alturas.sort()
+            return
+        # Celda k en la que cae la observación (ajustando los extremos si es un nuevo mínimo o máximo)
+        if x < alturas[0]:
+            alturas[0] = x
+            k = 0
+        elif x >= alturas[4]:
+            alturas[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= alturas[k + 1]:
+                k += 1
+        posiciones = self.posiciones
+        for i in range(k + 1, 5):
+            posiciones[i] += 1
+        # Ajuste de los tres marcadores centrales si se alejaron de su posición deseada
+        n_menos_1 = self.n - 1
+        for i in (1, 2, 3):
+            d = 1 + n_menos_1 * self.incrementos[i] - posiciones[i]
+            if (d >= 1 and posiciones[i + 1] - posiciones[i] > 1) or (d <= -1 and posiciones[i - 1] - posiciones[i] < -1):
+                d = 1 if d > 0 else -1
+                parabolica = alturas[i] + d / (posiciones[i + 1] - posiciones[i - 1]) * (
+                    (posiciones[i] - posiciones[i - 1] + d) * (alturas[i + 1] - alturas[i]) / (posiciones[i + 1] - posiciones[i])
+                    + (posiciones[i + 1] - posiciones[i] - d) * (alturas[i] - alturas[i - 1]) / (posiciones[i] - posiciones[i - 1]))
+                if alturas[i - 1] < parabolica < alturas[i + 1]:
+                    alturas[i] = parabolica
+                else:
+                    alturas[i] += d * (alturas[i + d] - alturas[i]) / (posiciones[i + d] - posiciones[i])  # Interpolación lineal
+                posiciones[i] += d
+
+    def valor(self):
+        alturas = self.alturas
+        if self.n < 5:
+            if not alturas:
+                return float('nan')
+            return alturas[min(len(alturas) - 1, int(self.p * len(alturas)))]
+        return alturas[2]
+
+# Histograma de intervalos fijos [0, ancho), [ancho, 2*ancho), ...; lo que supera el último intervalo se cuenta como desborde
+class Histograma:
+    __slots__ = ('ancho', 'conteos', 'desborde')
+
+    def __init__(self, ancho, intervalos):
+        self.ancho = ancho
+        self.conteos = [0] * intervalos
+        self.desborde = 0
+
+    def agregar(self, x):
+        intervalo = int(x // self.ancho)
+        if intervalo < len(self.conteos):
+            self.conteos[intervalo] += 1
+        else:
+            self.desborde += 1
+
+# Estadísticas de una serie de observaciones (por ejemplo, los tiempos de espera) calculadas a medida que llegan,
+# sin guardar las observaciones: media y varianza con el algoritmo de Welford, mínimo, máximo, cantidad de observaciones
+# que superan un límite (y cuánto lo superan en total), cuantiles P² e histograma de intervalos fijos
+class EstadisticaEnLinea:
+    __slots__ = ('n', 'media', 'm2', 'minimo', 'maximo', 'limite', 'excedidos', 'exceso_total', 'cuantiles', 'histograma')
+
+    def __init__(self, limite=None, cuantiles=(0.5, 0.9, 0.95), ancho_histograma=None, intervalos_histograma=50):
+        self.n = 0
+        self.media = 0.0
+        self.m2 = 0.0  # Suma de los cuadrados de las diferencias con la media
+        self.minimo = float('inf')
+        self.maximo = float('-inf')
+        self.limite = limite
+        self.excedidos = 0
+        self.exceso_total = 0.0
+        self.cuantiles = {p: CuantilP2(p) for p in cuantiles}
+        self.histograma = Histograma(ancho_histograma, intervalos_histograma) if ancho_histograma else None
+
+    def agregar(self, x):
+        self.n += 1
+        delta = x - self.media
+        self.media += delta / self.n
+        self.m2 += delta * (x - self.media)
+        if x < self.minimo:
+            self.minimo = x
+        if x > self.maximo:
+            self.maximo = x
+        if self.limite is not None and x > self.limite:
+            self.excedidos += 1
+            self.exceso_total += x - self.limite
+        for estimador in self.cuantiles.values():
+            estimador.agregar(x)
+        if self.histograma is not None:
+            self.histograma.agregar(x)
+
+    def varianza(self):
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    def desviacion(self):
+        return self.varianza() ** 0.5
+
+    def cuantil(self, p):
+        return self.cuantiles[p].valor()
+
+    def resumen(self):
+        return {'n': self.n, 'media': self.media, 'desviacion': self.desviacion(), 'minimo': self.minimo, 'maximo': self.maximo,
+                'excedidos': self.excedidos, 'exceso_total': self.exceso_total,
+                **{f'p{round(p * 100):02d}': estimador.valor() for p, estimador in self.cuantiles.items()}}
+
+# Estadísticas de una clase de vehículo (un tipo de Vehiculo), como las de entidad de Arena: vehículos de la clase en cola y
+# en el sistema ponderados por tiempo (Lq y L, actualizados sólo cuando un vehículo de la clase llega, empieza a ser
+# atendido o sale), y la espera y el tiempo en el sistema de cada vehículo
+class EstadisticasClase:
+    __slots__ = ('en_cola', 'en_sistema', 'espera', 'tiempo_sistema')
+
+    def __init__(self):
+        self.en_cola = AcumuladorTemporal()
+        self.en_sistema = AcumuladorTemporal()
+        self.espera = EstadisticaEnLinea(cuantiles=())
+        self.tiempo_sistema = EstadisticaEnLinea(cuantiles=())
+
+    def resumen(self, tiempo_final):
+        return {'largo_cola': self.en_cola.promedio(tiempo_final), 'largo_sistema': self.en_sistema.promedio(tiempo_final),
+                'espera': self.espera.media, 'tiempo_sistema': self.tiempo_sistema.media, 'atendidos': self.tiempo_sistema.n}
+
+# Serie de observaciones agrupadas de a "tamano": sólo se guarda la media de cada grupo (MSER-5 usa grupos de 5).
+# Para corridas largas ocupa tamano veces menos memoria que guardar cada observación
+class SerieLotes:
+    __slots__ = ('tamano', 'suma', 'cuenta', 'medias')
+
+    def __init__(self, tamano=5):
+        self.tamano = tamano
+        self.suma = 0.0
+        self.cuenta = 0
+        self.medias = array('d')
+
+    def agregar(self, x):
+        self.suma += x
+        self.cuenta += 1
+        if self.cuenta == self.tamano:
+            self.medias.append(self.suma / self.tamano)
+            self.suma = 0.0
+            self.cuenta = 0
+
+# Serie de promedios ponderados por tiempo de una variable discreta en intervalos consecutivos de igual duración
+# (por ejemplo, cabinas ocupadas promedio de cada hora). Como AcumuladorTemporal, se actualiza sólo cuando la variable cambia
+class SerieTemporal:
+    __slots__ = ('duracion', 'fin_intervalo', 'tiempo_ultimo', 'valor', 'area', 'medias')
+
+    def __init__(self, duracion, tiempo_inicio=0, valor=0):
+        self.duracion = duracion
+        self.fin_intervalo = tiempo_inicio + duracion
+        self.tiempo_ultimo = tiempo_inicio
+        self.valor = valor
+        self.area = 0.0
+        self.medias = array('d')
+
+    def actualizar(self, tiempo, valor):
+        while tiempo >= self.fin_intervalo:  # Cierra los intervalos que terminaron desde el último cambio
+            self.area += self.valor * (self.fin_intervalo - self.tiempo_ultimo)
+            self.medias.append(self.area / self.duracion)
+            self.area = 0.0
+            self.tiempo_ultimo = self.fin_intervalo
+            self.fin_intervalo += self.duracion
+        self.area += self.valor * (tiempo - self.tiempo_ultimo)
+        self.tiempo_ultimo = tiempo
+        self.valor = valor
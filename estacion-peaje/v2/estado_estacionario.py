@@ -0,0 +1,47 @@
+import numpy as np
+from distribucion_t import cuantil_t
+
+# Análisis de estado estacionario de una única corrida larga:
+# 1) se elimina el período de calentamiento con la regla MSER (White, 1997), que elige el punto de truncamiento d que
+#    minimiza el error estándar de la media de lo que queda: MSER(d) = sum((x_i - media_d)^2, i > d) / (n - d)^2.
+#    Aplicada sobre medias de grupos de 5 observaciones es MSER-5
+# 2) con lo que queda se arman lotes no solapados y el intervalo de confianza se calcula con las medias de los lotes,
+#    que son aproximadamente independientes si los lotes son bastante largos
+# Con horarios pico la serie tiene un ciclo diario: conviene que cada lote abarque varios días de simulación
+
+# Devuelve la cantidad de elementos iniciales a descartar. Sólo se buscan truncamientos en la primera mitad de la serie
+def truncamiento_mser(serie):
+    x = np.asarray(serie, dtype=float)
+    n = len(x)
+    if n < 4:
+        return 0
+    # Sumas desde cada posición hasta el final, para evaluar todos los truncamientos en O(n)
+    suma = np.cumsum(x[::-1])[::-1]
+    suma_cuadrados = np.cumsum((x * x)[::-1])[::-1]
+    restantes = np.arange(n, 0, -1)  # Cantidad de elementos que quedan al truncar en d
+    mitad = n // 2
+    media = suma[:mitad] / restantes[:mitad]
+    mser = (suma_cuadrados[:mitad] - restantes[:mitad] * media * media) / restantes[:mitad] ** 2
+    return int(np.argmin(mser))
+
+# Intervalo de confianza por medias de lotes no solapados (los elementos que sobran al final se descartan)
+def medias_por_lotes(serie, lotes=20, confianza=0.95):
+    x = np.asarray(serie, dtype=float)
+    tamano = len(x) // lotes
+    if tamano == 0:
+        raise ValueError(f"La serie tiene {len(x)} elementos, no alcanza para {lotes} lotes")
+    medias = x[:tamano * lotes].reshape(lotes, tamano).mean(axis=1)
+    media = float(medias.mean())
+    semiancho = float(cuantil_t(0.5 + confianza / 2, lotes - 1) * medias.std(ddof=1) / np.sqrt(lotes))
+    # Autocorrelación de orden 1 entre medias de lotes: si es alta, los lotes son cortos y el intervalo es optimista
+    autocorrelacion = float(np.corrcoef(medias[:-1], medias[1:])[0, 1]) if lotes > 2 and medias.std() > 0 else 0.0
+    return {'media': media, 'semiancho': semiancho, 'intervalo': (media - semiancho, media + semiancho),
+            'lotes': lotes, 'tamano_lote': tamano, 'autocorrelacion_lotes': autocorrelacion}
+
+# Trunca el calentamiento con MSER y calcula el intervalo por medias de lotes. "agrupamiento" es cuántas observaciones
+# originales representa cada elemento de la serie (5 para MSER-5), sólo para informar el truncamiento en observaciones
+def analizar_serie(serie, lotes=20, confianza=0.95, agrupamiento=1):
+    truncamiento = truncamiento_mser(serie)
+    resultado = medias_por_lotes(serie[truncamiento:], lotes, confianza)
+    resultado['truncamiento'] = truncamiento * agrupamiento
+    return resultado
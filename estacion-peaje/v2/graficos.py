@@ -0,0 +1,38 @@
+from concurrent.futures import ThreadPoolExecutor
+
+# Gráficos sin interfaz: se dibujan sobre una Figure propia (no pasan por pyplot ni abren ventanas) y se guardan en un archivo.
+# Así se pueden generar desde un hilo en segundo plano mientras la simulación sigue ejecutándose. matplotlib se importa con el
+# primer gráfico, no al importar el simulador
+
+def grafico_espera(tiempos_espera, limite, archivo):
+    from matplotlib.figure import Figure
+    figura = Figure()
+    ejes = figura.subplots()
+    ejes.hist(tiempos_espera, bins=50, edgecolor='black')  # 50 intervalos
+    ejes.axvline(limite, color='red', linestyle='dashed', linewidth=1, label=f'Límite de {limite // 60} minutos')
+    ejes.set_xlabel('Tiempo de espera (segundos)')
+    ejes.set_ylabel('Número de vehículos')
+    ejes.set_title('Distribución de los tiempos de espera de los vehículos')
+    ejes.legend()
+    figura.savefig(archivo)
+    return archivo
+
+# Dibuja los gráficos de a uno en un hilo aparte. graficar devuelve un Future: future.result() espera a que se guarde el archivo
+class GraficadorSegundoPlano:
+    def __init__(self):
+        self.ejecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='graficos')
+
+    def graficar(self, funcion, *argumentos):
+        return self.ejecutor.submit(funcion, *argumentos)
+
+    def cerrar(self, esperar=True):
+        self.ejecutor.shutdown(wait=esperar)
+
+graficador = None
+
+# Graficador compartido del proceso, se crea con el primer gráfico pedido
+def graficador_segundo_plano():
+    global graficador
+    if graficador is None:
+        graficador = GraficadorSegundoPlano()
+    return graficador
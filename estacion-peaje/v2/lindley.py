@@ -0,0 +1,111 @@
+import math
+import numpy as np
+from nucleo import llegadas_a_tomar
+from semillas import generar_semillas
+
+# Réplicas vectorizadas para una estación con una sola cabina y cola FIFO. En ese caso no hace falta el ciclo de sucesos:
+# la espera del vehículo n sale de la recursión de Lindley W[n] = max(0, W[n-1] + S[n-1] - A[n]), con S el servicio y A el
+# tiempo entre llegadas. Las réplicas de un lote son las filas de arreglos (réplica, vehículo) (cada réplica contigua en memoria,
+# así ordenar y acumular recorre memoria seguida) y la recursión se resuelve para todas a la vez en su forma cerrada: con
+# X[n] = suma de (S[k-1] - A[k]) hasta n (y X[0] = 0), W[n] = X[n] - min(X[0..n]), es decir una suma acumulada y un mínimo
+# acumulado por réplica, sin ningún ciclo de Python por vehículo.
+# Las llegadas son las mismas que en SimulacionCabinas (procesos de Poisson no homogéneos por tipo de vehículo generados por
+# inversión de la tasa acumulada de la tabla, superpuestos y ordenados) y las métricas las de resultados_replica: sólo cuentan
+# en la espera los vehículos que empiezan a ser atendidos antes del tiempo final, y como atendidos los que salen antes.
+# Los resultados son equivalentes estadísticamente a los del simulador, no idénticos: las muestras salen de otros flujos,
+# y cada lote de réplicas usa un generador derivado de la semilla maestra (las réplicas no tienen semilla propia)
+LOTE = 500  # Réplicas por pasada: acota la memoria (unos 5 arreglos de réplicas x vehículos de 8 bytes)
+
+# Una estación, una cabina siempre (sin plan que la cambie), cola FIFO y sin variables antitéticas
+def admite_lindley(simulacion):
+    if len(simulacion.estaciones) != 1:
+        return False
+    estacion = simulacion.estaciones[0]
+    configuracion = simulacion.configuracion
+    return (configuracion['disciplina'] == 'fifo' and not configuracion['antiteticas']
+            and {estacion.cabinas} | {cabinas for _, _, cabinas in estacion.plan_cabinas} == {1})
+
+# Bordes de los intervalos de la tabla hasta cubrir el tiempo final y la tasa acumulada (llegadas esperadas) en cada borde
+def tasa_acumulada(tabla, tipo_vehiculo, tiempo_final):
+    intervalos = max(1, int(math.ceil(tiempo_final / tabla.resolucion)))
+    tasas = np.resize(np.asarray(tabla.tasas[tipo_vehiculo], dtype=float), intervalos)  # La tabla se repite cada período
+    bordes = np.arange(intervalos + 1) * float(tabla.resolucion)
+    return bordes, np.concatenate(([0.0], np.cumsum(tasas * tabla.resolucion)))
+
+# Tiempos de llegada (réplica, vehículo) de un tipo de vehículo hasta el tiempo final y sus tiempos de servicio: las sumas
+# acumuladas de exponenciales de media 1 son un proceso de Poisson de tasa 1, que la inversa de la tasa acumulada lleva al
+# proceso no homogéneo. Se devuelven sólo las columnas necesarias para la réplica con más llegadas; las posiciones posteriores
+# al tiempo final quedan en infinito
+def llegadas_tipo(generador, flujo_servicio, bordes, acumulada, tiempo_final, replicas, largo):
+    total = np.interp(tiempo_final, bordes, acumulada)
+    unitarias = np.cumsum(generador.exponential(size=(replicas, largo)), axis=1)
+    while (unitarias[:, -1] < total).any():  # Alguna réplica necesita más llegadas que las pedidas
+        unitarias = np.concatenate((unitarias, unitarias[:, -1:] + np.cumsum(generador.exponential(size=(replicas, largo)), axis=1)), axis=1)
+    unitarias = unitarias[:, :max(1, int((unitarias < total).sum(axis=1).max()))]
+    tiempos = np.interp(unitarias, acumulada, bordes)
+    tiempos[unitarias >= total] = math.inf
+    return tiempos, flujo_servicio.inversa(generador.random(tiempos.shape), *flujo_servicio.parametros)
+
+# Métricas de resultados_replica de un lote de réplicas, como {métrica: arreglo con un valor por réplica}
+def simular_lote(simulacion, generador, replicas):
+    tiempo_final = simulacion.tiempo_final
+    limite = simulacion.LIMITE_ESPERA
+    tabla = simulacion.tablas_tasas[0]
+    flujos_servicio = simulacion.banco.servicio[0]
+    # Llegadas de todos los tipos superpuestas y ordenadas dentro de cada réplica, cada una con su tiempo de servicio
+    # (con la distribución del tipo de vehículo, como los flujos del banco)
+    llegadas = [llegadas_tipo(generador, flujos_servicio[tipo_vehiculo], *tasa_acumulada(tabla, tipo_vehiculo, tiempo_final), tiempo_final,
+                              replicas, llegadas_a_tomar(tabla, tipo_vehiculo, 0, tiempo_final))
+                for tipo_vehiculo in tabla.tasas if any(tabla.tasas[tipo_vehiculo])]
+    if not llegadas:
+        llegadas = [(np.full((replicas, 1), math.inf), np.zeros((replicas, 1)))]  # Ningún tipo de vehículo llega a la estación
+    tiempos = np.concatenate([tiempos_tipo for tiempos_tipo, _ in llegadas], axis=1)
+    orden = np.argsort(tiempos, axis=1, kind='stable')
+    tiempos = np.take_along_axis(tiempos, orden, axis=1)
+    validas = tiempos < tiempo_final
+    largo = max(1, int(validas.sum(axis=1).max()))
+    tiempos, validas, orden = tiempos[:, :largo], validas[:, :largo], orden[:, :largo]
+    servicio = np.take_along_axis(np.concatenate([servicio_tipo for _, servicio_tipo in llegadas], axis=1), orden, axis=1)
+    # Recursión de Lindley para todas las réplicas; las posiciones sin llegada se completan con el tiempo final (se descartan)
+    tiempos_llegada = np.where(validas, tiempos, tiempo_final)
+    paso = np.zeros((replicas, largo))
+    paso[:, 1:] = servicio[:, :-1] - np.diff(tiempos_llegada, axis=1)
+    recorrido = np.cumsum(paso, axis=1)
+    espera = recorrido - np.minimum.accumulate(recorrido, axis=1)
+    # Métricas de calcular_costos con operaciones sobre las filas
+    inicio = tiempos_llegada + espera
+    atendidos = validas & (inicio < tiempo_final)
+    n_atendidos = atendidos.sum(axis=1)
+    exceso = np.where(atendidos, np.maximum(espera - limite, 0.0), 0.0).sum(axis=1)
+    multas = exceso * simulacion.multa_espera_excesiva
+    costo_con_cabina_extra = (exceso // (60*10)) * simulacion.costo_cabina_extra
+    costo_plan_cabinas = np.zeros(replicas)  # Con una sola cabina no hay cabinas extra
+    # Promedios ponderados por tiempo como áreas: cada vehículo suma a Lq lo que esperó y a L lo que estuvo en el sistema
+    # hasta el tiempo final; la diferencia es el tiempo que la cabina estuvo ocupada
+    area_cola = np.where(validas, np.minimum(inicio, tiempo_final) - tiempos_llegada, 0.0).sum(axis=1)
+    area_sistema = np.where(validas, np.minimum(inicio + servicio, tiempo_final) - tiempos_llegada, 0.0).sum(axis=1)
+    return {
+        'espera': np.where(atendidos, espera, 0.0).sum(axis=1) / np.maximum(n_atendidos, 1),
+        'excedidos': (atendidos & (espera > limite)).sum(axis=1),
+        'vehiculos_atendidos': (validas & (inicio + servicio < tiempo_final)).sum(axis=1),
+        'multas': multas,
+        'costo_con_cabina_extra': costo_con_cabina_extra,
+        'diferencia_costos': multas - costo_con_cabina_extra,
+        'costo_plan_cabinas': costo_plan_cabinas,
+        'costo_total': multas + costo_plan_cabinas,
+        'llegadas': validas.sum(axis=1),
+        'llegadas_esperadas': np.full(replicas, simulacion.llegadas_esperadas()),
+        'largo_cola': area_cola / tiempo_final,
+        'largo_sistema': area_sistema / tiempo_final,
+        'utilizacion': (area_sistema - area_cola) / tiempo_final,
+    }
+
+# Métricas de "replicas" réplicas como {métrica: arreglo con un valor por réplica}. Con la misma semilla y el mismo lote se
+# repiten exactamente
+def simular_lindley(simulacion, replicas, semilla, lote=LOTE):
+    if not admite_lindley(simulacion):
+        raise ValueError("La recursión de Lindley sólo admite una estación con una cabina fija, cola FIFO y sin variables antitéticas")
+    lotes = []
+    for numero, semilla_lote in enumerate(generar_semillas(semilla, math.ceil(replicas / lote))):
+        lotes.append(simular_lote(simulacion, np.random.default_rng(semilla_lote), min(lote, replicas - numero * lote)))
+    return {metrica: np.concatenate([metricas[metrica] for metricas in lotes]) for metrica in lotes[0]}
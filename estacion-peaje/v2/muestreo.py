@@ -0,0 +1,157 @@
+import numpy as np
+
+TAMANO_BLOQUE = 4096  # Cantidad de muestras que se generan de una sola vez en cada flujo
+UNO_MENOS_EPSILON = np.nextafter(1.0, 0.0)  # Mayor número de punto flotante menor que 1
+
+# Registro de distribuciones: cada una se define por su función inversa de la distribución acumulada, que recibe un
+# arreglo de uniformes en [0, 1) y los parámetros de la distribución. Así se generan bloques enteros de muestras con
+# operaciones vectorizadas de NumPy en lugar de una llamada de Python por muestra
+# Opcionalmente se registran también la media y el segundo momento E[X^2], que usa la evaluación analítica (analitico.py)
+DISTRIBUCIONES = {}
+MOMENTOS = {}
+
+def registrar_distribucion(nombre, inversa, momentos=None):
+    DISTRIBUCIONES[nombre] = inversa
+    if momentos is not None:
+        MOMENTOS[nombre] = momentos
+
+# (media, segundo momento) de una distribución registrada
+def momentos_distribucion(distribucion, parametros):
+    if distribucion not in MOMENTOS:
+        raise ValueError(f"La distribución '{distribucion}' no tiene momentos registrados")
+    return MOMENTOS[distribucion](*parametros)
+
+def inversa_uniforme(u, minimo, maximo):
+    return minimo + (maximo - minimo) * u
+
+def inversa_exponencial(u, media):
+    return -media * np.log1p(-u)  # log1p(-u) = log(1 - u), con u en [0, 1) nunca se evalúa log(0)
+
+def inversa_triangular(u, minimo, moda, maximo):
+    corte = (moda - minimo) / (maximo - minimo)  # Probabilidad acumulada en la moda
+    return np.where(u < corte,
+                    minimo + np.sqrt(u * (maximo - minimo) * (moda - minimo)),
+                    maximo - np.sqrt((1 - u) * (maximo - minimo) * (maximo - moda)))
+
+def momentos_uniforme(minimo, maximo):
+    return (minimo + maximo) / 2, (minimo * minimo + minimo * maximo + maximo * maximo) / 3
+
+def momentos_exponencial(media):
+    return media, 2 * media * media
+
+def momentos_triangular(minimo, moda, maximo):
+    media = (minimo + moda + maximo) / 3
+    varianza = (minimo ** 2 + moda ** 2 + maximo ** 2 - minimo * moda - minimo * maximo - moda * maximo) / 18
+    return media, varianza + media * media
+
+# Mezcla de distribuciones registradas: los parámetros son componentes (peso, distribución, parámetros). Cada uniforme elige
+# la componente según en qué tramo de los pesos acumulados cae, y su posición dentro del tramo, reescalada a [0, 1), es la
+# uniforme de la componente (así cada muestra sigue usando una sola uniforme)
+def inversa_mezcla(u, *componentes):
+    u = np.asarray(u, dtype=float)
+    pesos = np.array([peso for peso, _, _ in componentes], dtype=float)
+    acumulados = np.cumsum(pesos) / pesos.sum()
+    inicios = np.concatenate(([0.0], acumulados[:-1]))
+    elegidas = np.minimum(np.searchsorted(acumulados, u, side='right'), len(componentes) - 1)
+    uniformes = np.minimum((u - inicios[elegidas]) / (acumulados[elegidas] - inicios[elegidas]), UNO_MENOS_EPSILON)
+    muestras = np.empty(u.shape)
+    for indice, (_, distribucion, parametros) in enumerate(componentes):
+        seleccion = elegidas == indice
+        muestras[seleccion] = DISTRIBUCIONES[distribucion](uniformes[seleccion], *parametros)
+    return muestras
+
+def momentos_mezcla(*componentes):
+    total = sum(peso for peso, _, _ in componentes)
+    momentos = [(peso / total, momentos_distribucion(distribucion, parametros)) for peso, distribucion, parametros in componentes]
+    return sum(peso * media for peso, (media, _) in momentos), sum(peso * segundo for peso, (_, segundo) in momentos)
+
+registrar_distribucion('uniforme', inversa_uniforme, momentos_uniforme)
+registrar_distribucion('exponencial', inversa_exponencial, momentos_exponencial)
+registrar_distribucion('triangular', inversa_triangular, momentos_triangular)
+registrar_distribucion('mezcla', inversa_mezcla, momentos_mezcla)
+
+# Flujo de muestras de una distribución: guarda un bloque pre-generado y un cursor que avanza en cada muestra.
+# Cuando el cursor llega al final del bloque se genera el siguiente bloque completo
+class FlujoMuestras:
+    __slots__ = ('generador', 'inversa', 'parametros', 'tamano_bloque', 'antiteticas', 'bloque', 'arreglo', 'resto', 'cursor')
+
+    def __init__(self, generador, distribucion, parametros, tamano_bloque=TAMANO_BLOQUE, antiteticas=False):
+        if distribucion not in DISTRIBUCIONES:
+            raise ValueError(f"Distribución desconocida: '{distribucion}'. Registradas: {', '.join(DISTRIBUCIONES)}")
+        self.generador = generador
+        self.inversa = DISTRIBUCIONES[distribucion]
+        self.parametros = tuple(parametros)
+        self.tamano_bloque = tamano_bloque
+        self.antiteticas = antiteticas  # Usa 1 - u en lugar de u: cada muestra queda en el extremo opuesto de la distribución
+        self.bloque = []
+        self.arreglo = np.empty(0)  # El bloque como arreglo de NumPy, para tomar()
+        self.resto = None  # Posición en el bloque que dejó tomar(), que todavía no lo pasó a lista
+        self.cursor = tamano_bloque  # El primer bloque se genera recién con la primera muestra pedida
+
+    def siguiente(self):
+        cursor = self.cursor
+        if cursor == self.tamano_bloque:
+            self.rellenar()
+            cursor = self.cursor
+        self.cursor = cursor + 1
+        return self.bloque[cursor]
+
+    def rellenar(self):
+        if self.resto is not None:
+            self.cursor, self.resto = self.resto, None
+        else:
+            self.arreglo = self.generar_bloque()
+            self.cursor = 0
+        self.bloque = self.arreglo.tolist()  # tolist: indexar una lista de floats es más rápido que un arreglo
+
+    def generar_bloque(self):
+        uniformes = self.generador.random(self.tamano_bloque)
+        if self.antiteticas:
+            uniformes = np.minimum(1.0 - uniformes, UNO_MENOS_EPSILON)  # Se mantiene en [0, 1) como las uniformes originales
+        return np.asarray(self.inversa(uniformes, *self.parametros), dtype=float)
+
+    # Las próximas n muestras como un arreglo de NumPy (las mismas que darían n llamadas a siguiente), para el núcleo
+    # compilado de nucleo.py. Los bloques nuevos se generan enteros y lo que sobra del último queda para las próximas muestras
+    # (como arreglo: se pasa a lista recién si después se piden muestras con siguiente())
+    def tomar(self, n):
+        cursor = self.cursor if self.resto is None else self.resto
+        partes = [self.arreglo[cursor:cursor + n]]
+        cursor += len(partes[0])
+        faltan = n - len(partes[0])
+        while faltan > 0:
+            self.arreglo = self.generar_bloque()
+            partes.append(self.arreglo[:faltan])
+            cursor = min(faltan, self.tamano_bloque)
+            faltan -= cursor
+        self.resto = cursor if cursor < self.tamano_bloque else None
+        self.cursor = self.tamano_bloque
+        return np.concatenate(partes)
+
+# Banco de muestras de una simulación: por cada estación y tipo de vehículo, un flujo de tiempos de servicio y uno de
+# tiempos entre llegadas, cada uno con su propio generador derivado de la semilla de la simulación.
+# Los flujos se indexan primero por estación y luego por tipo de vehículo: banco.servicio[estacion][tipo_vehiculo]
+# Como cada flujo tiene su propia semilla, dos escenarios simulados con la misma semilla usan exactamente las mismas llegadas y
+# tiempos de servicio para cada tipo de vehículo (números aleatorios comunes), aunque sus colas evolucionen distinto.
+# Con antiteticas=True todas las muestras salen de 1 - u: es la réplica antitética de la que usa la misma semilla
+class BancoMuestras:
+    def __init__(self, semilla, tiempos_servicio, vehiculos, estaciones=1, tamano_bloque=TAMANO_BLOQUE, antiteticas=False):
+        self.servicio = []
+        self.entre_llegadas = []
+        for secuencia_estacion in np.random.SeedSequence(semilla).spawn(estaciones):
+            servicio = {}
+            entre_llegadas = {}
+            for vehiculo, secuencia in zip(vehiculos, secuencia_estacion.spawn(len(vehiculos))):
+                secuencia_llegadas, secuencia_servicio = secuencia.spawn(2)
+                # Las llegadas se generan con media 1 y se escalan por la tasa vigente, que cambia entre hora pico y no pico
+                entre_llegadas[vehiculo] = FlujoMuestras(np.random.default_rng(secuencia_llegadas), 'exponencial', (1.0,), tamano_bloque, antiteticas)
+                if vehiculo in tiempos_servicio:
+                    distribucion, parametros = tiempos_servicio[vehiculo]
+                    servicio[vehiculo] = FlujoMuestras(np.random.default_rng(secuencia_servicio), distribucion, parametros, tamano_bloque, antiteticas)
+            self.servicio.append(servicio)
+            self.entre_llegadas.append(entre_llegadas)
+
+    def tiempo_servicio(self, estacion, tipo_vehiculo):
+        return self.servicio[estacion][tipo_vehiculo].siguiente()
+
+    def tiempo_entre_llegadas(self, estacion, tipo_vehiculo, tasa_arribo):
+        return self.entre_llegadas[estacion][tipo_vehiculo].siguiente() / tasa_arribo
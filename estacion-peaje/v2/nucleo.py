@@ -0,0 +1,432 @@
+import math
+import numpy as np
+from calendario import CalendarioSucesos, LLEGADA, SALIDA, CAMBIO_CAPACIDAD
+from colas import ColaFIFO
+from tasas import SEGUNDOS_DIA
+
+# Núcleo compilado del ciclo de sucesos de SimulacionCabinas: el mismo modelo (tipos de vehículo, tabla de tasas con horas
+# pico, plan de cabinas, c cabinas por estación, cola FIFO) sobre arreglos tipados de NumPy, compilado con Numba en modo
+# nopython si está instalado. Sin Numba las mismas funciones corren como Python común (mucho más lento que el simulador
+# normal, sirve sólo para verificar el núcleo), así que la selección automática lo usa únicamente con Numba.
+# Los resultados son idénticos a los del simulador normal con la misma semilla, no sólo equivalentes estadísticamente:
+# - las muestras salen de los mismos flujos de BancoMuestras (FlujoMuestras.tomar), en el mismo orden
+# - los sucesos pendientes son pocos y de estructura fija (una llegada por estación y tipo de vehículo, una salida por
+#   cabina, un cambio del plan por estación), así que en lugar del heap se guarda el próximo suceso de cada estación y se
+#   busca el mínimo entre estaciones, desempatando por número de secuencia como el calendario
+# - las estadísticas se acumulan con las mismas fórmulas (Welford, áreas de los AcumuladorTemporal) y se copian al final
+#   en los objetos de la simulación, así resultados(), informar() y resultados_replica() no cambian
+# No admite otras disciplinas de cola, trazas, cuantiles P², series de estado estacionario, estadísticas por tipo de vehículo,
+# perfilado ni puntos de control
+try:
+    import numba
+except ImportError:
+    numba = None
+
+NUMBA_DISPONIBLE = numba is not None
+SIN_SECUENCIA = 2 ** 62  # Mayor que cualquier número de secuencia
+
+# error_model='numpy': las divisiones no verifican un divisor cero (el modelo nunca divide por cero), una rama menos por suceso
+def compilar(funcion):
+    return numba.njit(cache=True, error_model='numpy')(funcion) if numba is not None else funcion
+
+# Muestras extra por flujo sobre las llegadas esperadas, en desvíos de Poisson (si no alcanzan se piden más y se sigue)
+MARGEN_DESVIOS = 8
+MARGEN_MINIMO = 64
+
+# x // divisor, igual que en Python pero sin el fmod de la división entera de floats en cada suceso: como la división
+# redondea de forma monótona y los enteros son representables, el piso del cociente sólo puede diferir del exacto si el
+# cociente redondeado cae justo en un entero, y en ese caso se usa la división entera
+@compilar
+def division_entera(x, divisor):
+    cociente = x / divisor
+    piso = math.floor(cociente)
+    if piso == cociente:
+        return x // divisor
+    return float(piso)
+
+# Igual que TablaTasas.proxima_llegada, sobre la fila de tasas de un tipo de vehículo
+@compilar
+def proxima_llegada_nucleo(tasas, resolucion, tiempo, exponencial):
+    n_intervalos = tasas.shape[0]
+    intervalo = int(division_entera(tiempo, resolucion))
+    posicion = intervalo % n_intervalos
+    while True:
+        tasa = tasas[posicion]
+        fin_intervalo = (intervalo + 1) * resolucion
+        if tasa > 0:
+            disponible = tasa * (fin_intervalo - tiempo)
+            if exponencial <= disponible:
+                return tiempo + exponencial / tasa
+            exponencial -= disponible
+        tiempo = fin_intervalo
+        intervalo += 1
+        posicion += 1
+        if posicion == n_intervalos:
+            posicion = 0
+
+# Igual que TablaTasas.llegadas_esperadas, sobre la fila de tasas de un tipo de vehículo
+@compilar
+def llegadas_esperadas_nucleo(tasas, resolucion, desde, hasta):
+    n_intervalos = tasas.shape[0]
+    total = 0.0
+    intervalo = int(desde // resolucion)
+    while desde < hasta:
+        fin_intervalo = min((intervalo + 1) * resolucion, hasta)
+        total += tasas[intervalo % n_intervalos] * (fin_intervalo - desde)
+        desde = fin_intervalo
+        intervalo += 1
+    return total
+
+# Igual que AcumuladorTemporal.actualizar; cada acumulador es una fila [tiempo del último cambio, valor, área, máximo]
+@compilar
+def actualizar_acumulador(acumulador, tiempo, valor):
+    acumulador[2] += acumulador[1] * (tiempo - acumulador[0])
+    acumulador[0] = tiempo
+    acumulador[1] = valor
+    if valor > acumulador[3]:
+        acumulador[3] = valor
+
+# Igual que EstadisticaEnLinea.agregar (sin cuantiles); espera = [n, media, m2, mínimo, máximo, excedidos, exceso total]
+@compilar
+def agregar_espera(espera, histograma, ancho_histograma, limite, x):
+    espera[0] += 1
+    delta = x - espera[1]
+    espera[1] += delta / espera[0]
+    espera[2] += delta * (x - espera[1])
+    if x < espera[3]:
+        espera[3] = x
+    if x > espera[4]:
+        espera[4] = x
+    if x > limite:
+        espera[5] += 1
+        espera[6] += x - limite
+    intervalo = int(division_entera(x, ancho_histograma))
+    if intervalo < histograma.shape[0] - 1:
+        histograma[intervalo] += 1
+    else:
+        histograma[histograma.shape[0] - 1] += 1  # Desborde
+
+# Próximo suceso de una estación (menor tiempo y, ante un empate, menor secuencia) entre sus llegadas, salidas y cambio del
+# plan: queda en proximos_tiempos[e] y proximos_datos[e] = [secuencia, código (0 llegada, 1 salida, 2 cambio), tipo o cabina]
+@compilar
+def buscar_proximo(e, llegadas, secuencias_llegadas, salidas, secuencias_salidas, cambios, secuencias_cambios,
+                   proximos_tiempos, proximos_datos):
+    tiempo = cambios[e]
+    menor_secuencia = secuencias_cambios[e]
+    codigo = 2
+    indice = -1
+    for t in range(llegadas.shape[1]):
+        if llegadas[e, t] < tiempo or (llegadas[e, t] == tiempo and secuencias_llegadas[e, t] < menor_secuencia):
+            tiempo = llegadas[e, t]
+            menor_secuencia = secuencias_llegadas[e, t]
+            codigo = 0
+            indice = t
+    for c in range(salidas.shape[1]):
+        if salidas[e, c] < tiempo or (salidas[e, c] == tiempo and secuencias_salidas[e, c] < menor_secuencia):
+            tiempo = salidas[e, c]
+            menor_secuencia = secuencias_salidas[e, c]
+            codigo = 1
+            indice = c
+    proximos_tiempos[e] = tiempo
+    proximos_datos[e, 0] = menor_secuencia
+    proximos_datos[e, 1] = codigo
+    proximos_datos[e, 2] = indice
+
+# Ciclo de sucesos. Los arreglos de estado se modifican en el lugar; devuelve (tiempo actual, secuencia, estado), con
+# estado 0 si llegó al tiempo final y 1 si al próximo suceso le podrían faltar muestras pre-generadas de algún flujo.
+# Con estado 1 el suceso todavía no se procesó: agregando muestras se puede seguir llamando con el mismo estado
+@compilar
+def simular_nucleo(tiempo_actual, tiempo_final, secuencia, resolucion, limite, ancho_histograma,
+                   tasas, llegadas, secuencias_llegadas, exponenciales, indices_exponenciales, servicios, indices_servicios,
+                   salidas, secuencias_salidas, tipos_salidas, ocupadas, capacidad,
+                   cambios, secuencias_cambios, indices_cambios, segundos_plan, cabinas_plan, largos_plan,
+                   cola_tiempos, cola_tipos, cola_inicio, cola_fin,
+                   espera, histograma, acumuladores_cola, acumuladores_ocupacion, acumuladores_capacidad,
+                   acumuladores_habilitacion, tiempo_servicio_cabinas, contadores):
+    estaciones, tipos = llegadas.shape
+    max_cabinas = ocupadas.shape[1]
+    # Cada suceso modifica sólo los sucesos pendientes de su estación: se guarda el próximo de cada una y después de cada
+    # suceso se vuelve a buscar sólo el de esa estación
+    proximos_tiempos = np.empty(estaciones)
+    proximos_datos = np.empty((estaciones, 3), dtype=np.int64)
+    for e in range(estaciones):
+        buscar_proximo(e, llegadas, secuencias_llegadas, salidas, secuencias_salidas, cambios, secuencias_cambios,
+                       proximos_tiempos, proximos_datos)
+    while True:
+        tiempo = math.inf
+        menor_secuencia = SIN_SECUENCIA
+        e = 0
+        for estacion in range(estaciones):
+            if proximos_tiempos[estacion] < tiempo or (proximos_tiempos[estacion] == tiempo and proximos_datos[estacion, 0] < menor_secuencia):
+                tiempo = proximos_tiempos[estacion]
+                menor_secuencia = proximos_datos[estacion, 0]
+                e = estacion
+        if not tiempo < tiempo_final:
+            return tiempo_actual, secuencia, 0
+        codigo = proximos_datos[e, 1]
+        indice = proximos_datos[e, 2]
+        # Antes de modificar el estado, que alcancen las muestras para todo lo que el suceso podría necesitar
+        if codigo == 0:
+            if indices_exponenciales[e, indice] >= exponenciales.shape[2] or indices_servicios[e, indice] >= servicios.shape[2]:
+                return tiempo_actual, secuencia, 1
+        elif codigo == 1:
+            if cola_fin[e] > cola_inicio[e] and indices_servicios[e, cola_tipos[e, cola_inicio[e]]] >= servicios.shape[2]:
+                return tiempo_actual, secuencia, 1
+        else:
+            for t in range(tipos):
+                if indices_servicios[e, t] + cabinas_plan[e, indices_cambios[e]] > servicios.shape[2]:
+                    return tiempo_actual, secuencia, 1
+        tiempo_actual = tiempo
+        # Cabinas a las que hay que asignarles un vehículo de la cola (en una salida, la que se liberó; en un cambio, todas)
+        desde = 0
+        hasta = 0
+        if codigo == 0:
+            t = indice
+            contadores[0] += 1
+            cabina = -1
+            for c in range(capacidad[e]):
+                if not ocupadas[e, c]:
+                    cabina = c
+                    break
+            if cabina >= 0:
+                agregar_espera(espera, histograma, ancho_histograma, limite, 0.0)
+                ocupadas[e, cabina] = True
+                actualizar_acumulador(acumuladores_ocupacion[e], tiempo_actual, acumuladores_ocupacion[e, 1] + 1)
+                tiempo_servicio = servicios[e, t, indices_servicios[e, t]]
+                tiempo_servicio_cabinas[e, cabina] += tiempo_servicio
+                salidas[e, cabina] = tiempo_actual + tiempo_servicio
+                indices_servicios[e, t] += 1
+                secuencias_salidas[e, cabina] = secuencia
+                tipos_salidas[e, cabina] = t
+                secuencia += 1
+            else:
+                cola_tiempos[e, cola_fin[e]] = tiempo_actual
+                cola_tipos[e, cola_fin[e]] = t
+                cola_fin[e] += 1
+                actualizar_acumulador(acumuladores_cola[e], tiempo_actual, cola_fin[e] - cola_inicio[e])
+            exponencial = exponenciales[e, t, indices_exponenciales[e, t]]
+            indices_exponenciales[e, t] += 1
+            llegadas[e, t] = proxima_llegada_nucleo(tasas[e, t], resolucion, tiempo_actual, exponencial)
+            secuencias_llegadas[e, t] = secuencia
+            secuencia += 1
+        elif codigo == 1:
+            c = indice
+            contadores[1] += 1
+            ocupadas[e, c] = False
+            salidas[e, c] = math.inf
+            secuencias_salidas[e, c] = SIN_SECUENCIA
+            actualizar_acumulador(acumuladores_ocupacion[e], tiempo_actual, acumuladores_ocupacion[e, 1] - 1)
+            # Si la cabina fue cerrada mientras atendía, termina con el vehículo actual y no toma otro
+            if c < capacidad[e]:
+                desde = c
+                hasta = c + 1
+        else:
+            cabinas = cabinas_plan[e, indices_cambios[e]]
+            capacidad[e] = cabinas
+            actualizar_acumulador(acumuladores_capacidad[e], tiempo_actual, cabinas)
+            for c in range(max_cabinas):
+                actualizar_acumulador(acumuladores_habilitacion[e, c], tiempo_actual, 1.0 if c < cabinas else 0.0)
+            desde = 0
+            hasta = cabinas
+        for c in range(desde, hasta):
+            if cola_fin[e] == cola_inicio[e]:
+                break
+            if ocupadas[e, c]:
+                continue
+            tiempo_llegada = cola_tiempos[e, cola_inicio[e]]
+            t = cola_tipos[e, cola_inicio[e]]
+            cola_inicio[e] += 1
+            actualizar_acumulador(acumuladores_cola[e], tiempo_actual, cola_fin[e] - cola_inicio[e])
+            agregar_espera(espera, histograma, ancho_histograma, limite, tiempo_actual - tiempo_llegada)
+            ocupadas[e, c] = True
+            actualizar_acumulador(acumuladores_ocupacion[e], tiempo_actual, acumuladores_ocupacion[e, 1] + 1)
+            tiempo_servicio = servicios[e, t, indices_servicios[e, t]]
+            tiempo_servicio_cabinas[e, c] += tiempo_servicio
+            salidas[e, c] = tiempo_actual + tiempo_servicio
+            indices_servicios[e, t] += 1
+            secuencias_salidas[e, c] = secuencia
+            tipos_salidas[e, c] = t
+            secuencia += 1
+        if codigo == 2:
+            # Siguiente cambio del plan (después de asignar las cabinas, como en SimulacionCabinas); al terminar la lista
+            # sigue con el primero del día siguiente
+            siguiente = indices_cambios[e] + 1
+            dia = tiempo_actual // SEGUNDOS_DIA
+            if siguiente == largos_plan[e]:
+                siguiente = 0
+                dia += 1
+            indices_cambios[e] = siguiente
+            cambios[e] = dia * SEGUNDOS_DIA + segundos_plan[e, siguiente]
+            secuencias_cambios[e] = secuencia
+            secuencia += 1
+        buscar_proximo(e, llegadas, secuencias_llegadas, salidas, secuencias_salidas, cambios, secuencias_cambios,
+                       proximos_tiempos, proximos_datos)
+
+# Si la simulación se puede correr con el núcleo: FIFO, sin trazas, cuantiles, series, perfilado ni cambios de capacidad
+# fuera del plan, y todavía sin empezar
+def admite_nucleo(simulacion):
+    return (all(type(cola) is ColaFIFO for cola in simulacion.colas) and simulacion.trazas is None and simulacion.tiempos_espera is None
+            and not simulacion.estadistica_espera.cuantiles and simulacion.estadistica_espera.histograma is not None
+            and simulacion.serie_espera is None and simulacion.perfil is None and simulacion.estadisticas_tipo is None
+            and simulacion.vehiculos_llegados == 0
+            and all(suceso[2] == LLEGADA or (suceso[2] == CAMBIO_CAPACIDAD and suceso[5][1] is not None) for suceso in simulacion.calendario))
+
+# acelerar: None elige el núcleo si Numba está instalado y la simulación lo admite; True lo exige (sin Numba corre como
+# Python común); False nunca lo usa
+def usar_nucleo(simulacion, acelerar):
+    if acelerar is False:
+        return False
+    if acelerar is None:
+        return NUMBA_DISPONIBLE and admite_nucleo(simulacion)
+    if not admite_nucleo(simulacion):
+        raise ValueError("El núcleo compilado sólo admite colas FIFO, sin trazas, cuantiles, series estacionarias ni perfilado, "
+                         "y una simulación sin empezar")
+    return True
+
+def llegadas_a_tomar(tabla, tipo_vehiculo, desde, hasta):
+    return muestras_a_tomar(tabla.llegadas_esperadas(tipo_vehiculo, desde, hasta) if tipo_vehiculo in tabla.tasas else 0.0)
+
+def muestras_a_tomar(esperadas):
+    return int(esperadas + MARGEN_DESVIOS * math.sqrt(esperadas) + MARGEN_MINIMO)
+
+# Corre la simulación hasta el tiempo final con el núcleo y deja el estado final en el objeto, como si hubiera corrido avanzar()
+def ejecutar_nucleo(simulacion):
+    tipos = list(simulacion.banco.entre_llegadas[0])
+    estaciones = len(simulacion.estaciones)
+    indice_tipo = {tipo: indice for indice, tipo in enumerate(tipos)}
+    resolucion = float(simulacion.tablas_tasas[0].resolucion)
+    if any(tabla.resolucion != resolucion for tabla in simulacion.tablas_tasas):
+        raise ValueError("El núcleo compilado necesita la misma resolución en las tablas de tasas de todas las estaciones")
+    n_intervalos = max(tabla.n_intervalos for tabla in simulacion.tablas_tasas)
+    tasas = np.zeros((estaciones, len(tipos), n_intervalos))
+    for e, tabla in enumerate(simulacion.tablas_tasas):
+        for tipo, t in indice_tipo.items():
+            if tipo in tabla.tasas:
+                # Una tabla más corta se repite: se completa hasta n_intervalos (múltiplo si las tablas son de 1 y 7 días)
+                tasas[e, t] = np.resize(np.asarray(tabla.tasas[tipo], dtype=float), n_intervalos)
+    # Estado inicial: las llegadas y cambios de plan ya programados en el calendario
+    llegadas = np.full((estaciones, len(tipos)), math.inf)
+    secuencias_llegadas = np.full((estaciones, len(tipos)), SIN_SECUENCIA, dtype=np.int64)
+    cambios = np.full(estaciones, math.inf)
+    secuencias_cambios = np.full(estaciones, SIN_SECUENCIA, dtype=np.int64)
+    indices_cambios = np.zeros(estaciones, dtype=np.int64)
+    for tiempo, secuencia, codigo, estacion, tipo_vehiculo, dato in simulacion.calendario:
+        if codigo == LLEGADA:
+            llegadas[estacion, indice_tipo[tipo_vehiculo]] = tiempo
+            secuencias_llegadas[estacion, indice_tipo[tipo_vehiculo]] = secuencia
+        else:
+            cambios[estacion] = tiempo
+            secuencias_cambios[estacion] = secuencia
+            indices_cambios[estacion] = dato[1]
+    largos_plan = np.array([len(cambios_estacion) for cambios_estacion in simulacion.cambios_plan], dtype=np.int64)
+    segundos_plan = np.zeros((estaciones, max(largos_plan.max(), 1)))
+    cabinas_plan = np.zeros((estaciones, max(largos_plan.max(), 1)), dtype=np.int64)
+    for e, cambios_estacion in enumerate(simulacion.cambios_plan):
+        for k, (segundo, cabinas) in enumerate(cambios_estacion):
+            segundos_plan[e, k] = segundo
+            cabinas_plan[e, k] = cabinas
+    max_cabinas = max(max(len(ocupadas) for ocupadas in simulacion.cabinas_ocupadas), int(cabinas_plan.max()))
+    capacidad = np.array(simulacion.capacidad, dtype=np.int64)
+    espera_python = simulacion.estadistica_espera
+    # Muestras: las llegadas esperadas de cada flujo más un margen; si no alcanzan se duplican (siguiendo los mismos flujos)
+    # y el núcleo sigue desde donde quedó
+    largo = max(muestras_a_tomar(llegadas_esperadas_nucleo(tasas[e, t], resolucion, float(simulacion.tiempo_actual), float(simulacion.tiempo_final)))
+                for e in range(estaciones) for t in range(len(tipos)))
+    exponenciales = agregar_muestras(None, simulacion.banco.entre_llegadas, tipos, largo)
+    servicios = agregar_muestras(None, simulacion.banco.servicio, tipos, largo)
+    indices_exponenciales = np.zeros((estaciones, len(tipos)), dtype=np.int64)
+    indices_servicios = np.zeros((estaciones, len(tipos)), dtype=np.int64)
+    salidas = np.full((estaciones, max_cabinas), math.inf)
+    secuencias_salidas = np.full((estaciones, max_cabinas), SIN_SECUENCIA, dtype=np.int64)
+    tipos_salidas = np.full((estaciones, max_cabinas), -1, dtype=np.int64)
+    ocupadas = np.zeros((estaciones, max_cabinas), dtype=np.bool_)
+    cola_tiempos = np.zeros((estaciones, largo * len(tipos)))  # Cada llegada se encola a lo sumo una vez
+    cola_tipos = np.zeros((estaciones, largo * len(tipos)), dtype=np.int64)
+    cola_inicio = np.zeros(estaciones, dtype=np.int64)
+    cola_fin = np.zeros(estaciones, dtype=np.int64)
+    espera = np.array([0.0, 0.0, 0.0, math.inf, -math.inf, 0.0, 0.0])
+    histograma = np.zeros(len(espera_python.histograma.conteos) + 1, dtype=np.int64)
+    acumuladores = [np.array([[acumulador.tiempo_ultimo, acumulador.valor, acumulador.area, acumulador.maximo] for acumulador in grupo])
+                    for grupo in ([cola.estadistica_largo for cola in simulacion.colas], simulacion.estadistica_ocupacion, simulacion.estadistica_capacidad)]
+    # Por cabina, como (estación, cabina): si está habilitada y la suma de sus tiempos de servicio; las cabinas que una
+    # estación no tiene no se usan
+    habilitacion = np.zeros((estaciones, max_cabinas, 4))
+    tiempo_servicio_cabinas = np.zeros((estaciones, max_cabinas))
+    for e, (acumuladores_estacion, tiempos_estacion) in enumerate(zip(simulacion.habilitacion_cabinas, simulacion.tiempo_servicio_cabinas)):
+        for c, acumulador in enumerate(acumuladores_estacion):
+            habilitacion[e, c] = (acumulador.tiempo_ultimo, acumulador.valor, acumulador.area, acumulador.maximo)
+        tiempo_servicio_cabinas[e, :len(tiempos_estacion)] = tiempos_estacion
+    acumuladores.append(habilitacion)
+    contadores = np.zeros(2, dtype=np.int64)
+    tiempo_actual, secuencia = float(simulacion.tiempo_actual), simulacion.calendario.secuencia
+    while True:
+        tiempo_actual, secuencia, resultado = simular_nucleo(
+            tiempo_actual, float(simulacion.tiempo_final), secuencia, resolucion,
+            float(simulacion.LIMITE_ESPERA), float(espera_python.histograma.ancho),
+            tasas, llegadas, secuencias_llegadas, exponenciales, indices_exponenciales, servicios, indices_servicios,
+            salidas, secuencias_salidas, tipos_salidas, ocupadas, capacidad,
+            cambios, secuencias_cambios, indices_cambios, segundos_plan, cabinas_plan, largos_plan,
+            cola_tiempos, cola_tipos, cola_inicio, cola_fin,
+            espera, histograma, *acumuladores, tiempo_servicio_cabinas, contadores)
+        if resultado == 0:
+            break
+        largo *= 2
+        exponenciales = agregar_muestras(exponenciales, simulacion.banco.entre_llegadas, tipos, largo)
+        servicios = agregar_muestras(servicios, simulacion.banco.servicio, tipos, largo)
+        cola_tiempos = ampliar(cola_tiempos, largo * len(tipos))
+        cola_tipos = ampliar(cola_tipos, largo * len(tipos))
+    # Estado final en los objetos de la simulación
+    simulacion.tiempo_actual = tiempo_actual
+    simulacion.vehiculos_llegados += int(contadores[0])
+    simulacion.vehiculos_atendidos += int(contadores[1])
+    simulacion.capacidad = capacidad.tolist()
+    simulacion.cabinas_ocupadas = [fila[:len(anteriores)].tolist() for fila, anteriores in zip(ocupadas, simulacion.cabinas_ocupadas)]
+    simulacion.cabinas_en_servicio = int(ocupadas.sum())
+    espera_python.n, espera_python.excedidos = int(espera[0]), int(espera[5])
+    espera_python.media, espera_python.m2, espera_python.minimo, espera_python.maximo, espera_python.exceso_total = (
+        float(espera[1]), float(espera[2]), float(espera[3]), float(espera[4]), float(espera[6]))
+    espera_python.histograma.conteos = histograma[:-1].tolist()
+    espera_python.histograma.desborde = int(histograma[-1])
+    grupos = ([cola.estadistica_largo for cola in simulacion.colas], simulacion.estadistica_ocupacion, simulacion.estadistica_capacidad,
+              [acumulador for fila in simulacion.habilitacion_cabinas for acumulador in fila])
+    valores_grupos = acumuladores[:3] + [[habilitacion[e, c] for e, fila in enumerate(simulacion.habilitacion_cabinas) for c in range(len(fila))]]
+    simulacion.tiempo_servicio_cabinas = [fila[:len(anteriores)].tolist() for fila, anteriores in zip(tiempo_servicio_cabinas, simulacion.tiempo_servicio_cabinas)]
+    for grupo, valores in zip(grupos, valores_grupos):
+        for acumulador, (tiempo_ultimo, valor, area, maximo) in zip(grupo, valores):
+            acumulador.tiempo_ultimo, acumulador.area = float(tiempo_ultimo), float(area)
+            acumulador.valor, acumulador.maximo = int(valor), int(maximo)
+    for e, cola in enumerate(simulacion.colas):
+        cola.diferir_vehiculos(cola_tiempos[e, cola_inicio[e]:cola_fin[e]].copy(), cola_tipos[e, cola_inicio[e]:cola_fin[e]].copy(), tipos)
+    # Sucesos pendientes, con sus números de secuencia, para que el calendario quede como lo dejaría avanzar()
+    calendario = CalendarioSucesos()
+    for e in range(estaciones):
+        for t, tipo in enumerate(tipos):
+            if llegadas[e, t] < math.inf:
+                calendario.sucesos.append((float(llegadas[e, t]), int(secuencias_llegadas[e, t]), LLEGADA, e, tipo, None))
+        for c in range(max_cabinas):
+            if salidas[e, c] < math.inf:
+                calendario.sucesos.append((float(salidas[e, c]), int(secuencias_salidas[e, c]), SALIDA, e, tipos[tipos_salidas[e, c]], c))
+        if cambios[e] < math.inf:
+            indice = int(indices_cambios[e])
+            calendario.sucesos.append((float(cambios[e]), int(secuencias_cambios[e]), CAMBIO_CAPACIDAD, e, None, (int(cabinas_plan[e, indice]), indice)))
+    calendario.sucesos.sort()
+    calendario.secuencia = int(secuencia)
+    simulacion.calendario = calendario
+
+# Agrega a cada flujo (estación, tipo de vehículo) las muestras que faltan para llegar a "largo", continuando los flujos
+def agregar_muestras(muestras, flujos, tipos, largo):
+    actual = 0 if muestras is None else muestras.shape[2]
+    nuevas = np.full((len(flujos), len(tipos), largo), math.nan)
+    if muestras is not None:
+        nuevas[:, :, :actual] = muestras
+    for e, flujos_estacion in enumerate(flujos):
+        for t, tipo in enumerate(tipos):
+            if tipo in flujos_estacion:
+                nuevas[e, t, actual:] = flujos_estacion[tipo].tomar(largo - actual)
+    return nuevas
+
+# El mismo arreglo con más columnas (las nuevas en cero)
+def ampliar(arreglo, columnas):
+    nuevo = np.zeros((arreglo.shape[0], columnas), dtype=arreglo.dtype)
+    nuevo[:, :arreglo.shape[1]] = arreglo
+    return nuevo
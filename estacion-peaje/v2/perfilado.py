@@ -0,0 +1,132 @@
+import time
+import marshal
+from trazas import NOMBRES_SUCESOS
+
+# Perfilado del ciclo de sucesos de SimulacionCabinas (perfilar=True). Mide:
+# - cuántos sucesos de cada tipo se procesaron
+# - tiempo total (incluyendo lo que llaman) y propio de cada manejador, y quién llamó a quién
+# - el máximo de sucesos pendientes en el calendario (el largo máximo de cada cola ya lo lleva su AcumuladorTemporal)
+# Sin perfilar no hay ningún costo por suceso: avanzar sólo mira self.perfil una vez por llamada. Con perfilar, durante
+# avanzar los manejadores se reemplazan por versiones envueltas (atributos de la instancia que tapan los métodos de la clase)
+# y al terminar se quitan, así los puntos de control guardan la simulación sin ellos.
+# Medir cuesta: la corrida perfilada tarda unas 2-3 veces más y los tiempos propios incluyen el costo de las envolturas,
+# así que sirven para comparar manejadores entre sí, no como tiempos absolutos.
+# Exportación:
+# - pstats.Stats(perfil) o guardar_pstats(archivo): mismo formato que cProfile (se lee con pstats, snakeviz, etc.)
+# - guardar_pilas(archivo): pilas "plegadas" (una línea "avanzar;procesar_suceso;procesar_llegada 1234" con microsegundos
+#   de tiempo propio) que leen flamegraph.pl, speedscope e inferno
+MANEJADORES = ('procesar_suceso', 'procesar_llegada', 'procesar_salida', 'procesar_cambio_capacidad', 'proxima_llegada', 'iniciar_servicio')
+
+# Clave de una función en las estadísticas de cProfile: (archivo, línea, nombre)
+def clave_funcion(funcion):
+    codigo = funcion.__code__
+    return (codigo.co_filename, codigo.co_firstlineno, codigo.co_name)
+
+class PerfilSimulacion:
+    def __init__(self, manejadores=MANEJADORES):
+        self.manejadores = manejadores
+        self.sucesos = {}  # {código de suceso: cantidad procesada}
+        self.maximo_calendario = 0  # Máximo de sucesos pendientes en el calendario
+        self.funciones = {}  # {clave: [llamadas, tiempo propio, tiempo total, {clave del llamador: [llamadas, propio, total]}]}
+        self.pilas = {}  # {(nombre, nombre, ...): tiempo propio}
+        self.segundos = 0.0  # Tiempo total dentro de avanzar
+        self.pila = []
+
+    # Versión de un método que acumula su tiempo. Cada marco de la pila es [clave, tiempo de los llamados, camino de nombres]
+    def envolver(self, metodo):
+        clave = clave_funcion(metodo)
+        pila = self.pila
+        reloj = time.perf_counter
+
+        def envuelto(*argumentos):
+            padre = pila[-1]
+            marco = [clave, 0.0, padre[2] + (clave[2],)]
+            pila.append(marco)
+            inicio = reloj()
+            try:
+                return metodo(*argumentos)
+            finally:
+                total = reloj() - inicio
+                pila.pop()
+                padre[1] += total
+                self.acumular(marco, padre[0], total)
+        return envuelto
+
+    def acumular(self, marco, llamador, total):
+        clave, llamados, camino = marco
+        propio = total - llamados
+        funcion = self.funciones.get(clave)
+        if funcion is None:
+            funcion = self.funciones[clave] = [0, 0.0, 0.0, {}]
+        funcion[0] += 1
+        funcion[1] += propio
+        funcion[2] += total
+        if llamador is not None:
+            arista = funcion[3].get(llamador)
+            if arista is None:
+                arista = funcion[3][llamador] = [0, 0.0, 0.0]
+            arista[0] += 1
+            arista[1] += propio
+            arista[2] += total
+        self.pilas[camino] = self.pilas.get(camino, 0.0) + propio
+
+    # Igual que SimulacionCabinas.avanzar, pero contando sucesos, midiendo los manejadores y el tamaño del calendario
+    def avanzar(self, simulacion, sucesos=None):
+        calendario = simulacion.calendario
+        tiempo_final = simulacion.tiempo_final
+        raiz = [clave_funcion(type(simulacion).avanzar), 0.0, ('avanzar',)]
+        self.pila[:] = [raiz]
+        for nombre in self.manejadores:
+            setattr(simulacion, nombre, self.envolver(getattr(simulacion, nombre)))
+        procesar_suceso = simulacion.procesar_suceso
+        contadores = self.sucesos
+        maximo = self.maximo_calendario
+        restantes = -1 if sucesos is None else sucesos
+        inicio = time.perf_counter()
+        try:
+            while restantes != 0 and calendario and calendario.sucesos[0][0] < tiempo_final:
+                if len(calendario) > maximo:
+                    maximo = len(calendario)
+                suceso = calendario.extraer()
+                simulacion.tiempo_actual = suceso[0]
+                contadores[suceso[2]] = contadores.get(suceso[2], 0) + 1
+                procesar_suceso(suceso)
+                restantes -= 1
+        finally:
+            total = time.perf_counter() - inicio
+            for nombre in self.manejadores:
+                del simulacion.__dict__[nombre]
+            self.maximo_calendario = maximo
+            self.segundos += total
+            self.acumular(raiz, None, total)
+        return bool(calendario) and calendario.sucesos[0][0] < tiempo_final
+
+    # Interfaz que usa pstats.Stats(perfil): create_stats deja en self.stats el diccionario de cProfile,
+    # {clave: (llamadas primitivas, llamadas, tiempo propio, tiempo total, {llamador: (idem)})}
+    def create_stats(self):
+        self.stats = {clave: (llamadas, llamadas, propio, total,
+                              {llamador: (arista[0], arista[0], arista[1], arista[2]) for llamador, arista in llamadores.items()})
+                      for clave, (llamadas, propio, total, llamadores) in self.funciones.items()}
+
+    # Archivo en el formato de cProfile.Profile.dump_stats
+    def guardar_pstats(self, archivo):
+        self.create_stats()
+        with open(archivo, 'wb') as salida:
+            marshal.dump(self.stats, salida)
+
+    # Pilas plegadas para flamegraph.pl / speedscope, en microsegundos de tiempo propio
+    def guardar_pilas(self, archivo):
+        with open(archivo, 'w') as salida:
+            for camino, propio in sorted(self.pilas.items()):
+                if round(propio * 1e6) > 0:
+                    salida.write(f"{';'.join(camino)} {round(propio * 1e6)}\n")
+
+    # Resumen para los resultados: sucesos por tipo, tiempos por manejador y máximos del calendario y de las colas
+    def resumen(self, simulacion):
+        return {'segundos': self.segundos,
+                'sucesos': {NOMBRES_SUCESOS.get(codigo, codigo): cantidad for codigo, cantidad in sorted(self.sucesos.items())},
+                'sucesos_por_segundo': sum(self.sucesos.values()) / self.segundos if self.segundos > 0 else 0.0,
+                'manejadores': {clave[2]: {'llamadas': llamadas, 'propio': propio, 'total': total}
+                                for clave, (llamadas, propio, total, _) in sorted(self.funciones.items(), key=lambda item: -item[1][2])},
+                'maximo_calendario': self.maximo_calendario,
+                'maximo_cola': {estacion.nombre: cola.estadistica_largo.maximo for estacion, cola in zip(simulacion.estaciones, simulacion.colas)}}
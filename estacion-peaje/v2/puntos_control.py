@@ -0,0 +1,26 @@
+import os
+import pickle
+
+# Puntos de control: guardan en disco el estado completo de una corrida larga o de un lote de réplicas para poder
+# continuarlo si el proceso se interrumpe. El estado se serializa con pickle (calendario de sucesos, colas, generadores
+# aleatorios con sus bloques de muestras y acumuladores), así una corrida reanudada da exactamente los mismos resultados
+# que una sin interrupciones. Sólo se deben cargar archivos generados por uno mismo: pickle puede ejecutar código al leer
+VERSION = 1  # Incrementar si cambia el formato del estado guardado
+
+def guardar(archivo, estado):
+    temporal = archivo + '.tmp'
+    with open(temporal, 'wb') as salida:
+        pickle.dump((VERSION, estado), salida, protocol=pickle.HIGHEST_PROTOCOL)
+        salida.flush()
+        os.fsync(salida.fileno())
+    os.replace(temporal, archivo)  # Atómico: si el proceso muere mientras escribe, queda el punto de control anterior
+
+def cargar(archivo):
+    with open(archivo, 'rb') as entrada:
+        version, estado = pickle.load(entrada)
+    if version != VERSION:
+        raise ValueError(f"El punto de control {archivo} tiene la versión {version} y se esperaba la {VERSION}")
+    return estado
+
+def existe(archivo):
+    return archivo is not None and os.path.exists(archivo)
@@ -0,0 +1,43 @@
+import numpy as np
+from distribucion_t import cuantil_t
+
+# Técnicas de reducción de varianza para comparar dos políticas (por ejemplo, pagar multas contra habilitar cabinas extra):
+# - números aleatorios comunes: las dos políticas se simulan con las mismas semillas, y como cada tipo de vehículo tiene sus
+#   propios flujos de llegadas y de servicio (ver BancoMuestras), ambas reciben los mismos vehículos en los mismos instantes.
+#   La diferencia réplica a réplica tiene mucha menos varianza que la diferencia entre corridas independientes
+# - variables antitéticas: cada réplica se acompaña de otra que usa 1 - u en lugar de u, y se promedia el par
+# - variables de control: se corrige cada observación con una variable de media conocida que esté correlacionada con ella
+#   (por ejemplo, la cantidad de llegadas, cuya media sale exacta de la tabla de tasas)
+
+# Intervalo de confianza de la media con la distribución t. grados permite restar los coeficientes estimados de las variables de control
+def intervalo_media(valores, confianza=0.95, grados=None):
+    x = np.asarray(valores, dtype=float)
+    n = len(x)
+    grados = n - 1 if grados is None else grados
+    if grados < 1:
+        raise ValueError(f"Hacen falta más observaciones para el intervalo de confianza ({n} con {n - 1 - grados} variables de control)")
+    media = float(x.mean())
+    semiancho = float(cuantil_t(0.5 + confianza / 2, grados) * x.std(ddof=1) / np.sqrt(n))
+    return {'media': media, 'semiancho': semiancho, 'intervalo': (media - semiancho, media + semiancho), 'observaciones': n}
+
+# Estimador con variables de control: y_c = y - beta · (x - media_x), donde beta son los coeficientes de la regresión de y sobre
+# las variables de control x (una columna por variable, con media conocida media_x). Las columnas linealmente dependientes
+# (por ejemplo, dos controles iguales) se descartan. El intervalo usa n - 1 - q grados de libertad, con q controles
+def variable_control(valores, controles, medias_controles=None, confianza=0.95):
+    y = np.asarray(valores, dtype=float)
+    x = np.asarray(controles, dtype=float).reshape(len(y), -1)
+    if medias_controles is not None:
+        x = x - np.asarray(medias_controles, dtype=float)
+    centrados = x - x.mean(axis=0)
+    independientes = []
+    for columna in range(x.shape[1]):
+        if np.linalg.matrix_rank(centrados[:, independientes + [columna]]) == len(independientes) + 1:
+            independientes.append(columna)
+    x, centrados = x[:, independientes], centrados[:, independientes]
+    beta = np.linalg.lstsq(centrados, y - y.mean(), rcond=None)[0] if independientes else np.zeros(0)
+    corregidos = y - x @ beta
+    resultado = intervalo_media(corregidos, confianza, grados=len(y) - 1 - len(independientes))
+    resultado['beta'] = beta.tolist()
+    varianza = y.var(ddof=1)
+    resultado['reduccion'] = float(1 - corregidos.var(ddof=1) / varianza) if varianza > 0 else 0.0  # Fracción de la varianza eliminada
+    return resultado
@@ -0,0 +1,40 @@
+from dataclasses import dataclass, field
+
+# Resultados de la simulación como objetos con campos tipados, para usar el simulador como biblioteca (sin leer la consola).
+# Los resultados de cada réplica siguen viajando entre procesos como diccionarios (ver SimulacionCabinas.resultados_replica)
+
+# Resultados de una corrida de SimulacionCabinas.ejecutar
+@dataclass
+class ResultadosSimulacion:
+    tiempo_final: float
+    vehiculos_llegados: int
+    vehiculos_atendidos: int
+    espera: dict  # Resumen de los tiempos de espera (ver EstadisticaEnLinea.resumen)
+    multas: float
+    costo_con_cabina_extra: float
+    costo_plan_cabinas: float
+    largo_cola: dict  # {estación: largo promedio de la cola}
+    utilizacion: dict  # {estación: cabinas ocupadas promedio / cabinas habilitadas promedio}
+    largo_sistema: dict  # {estación: vehículos en la estación promedio, en cola y en atención}
+    utilizacion_cabinas: dict  # {estación: [utilización de cada cabina, sobre el tiempo en que estuvo habilitada]}
+    por_tipo: dict = None  # Con estadisticas_por_tipo=True, {tipo de vehículo: resumen de EstadisticasClase}
+    semilla: int = None  # Semilla de la corrida (con la misma configuración, la repite exactamente)
+    perfil: dict = field(default=None, repr=False)  # Con perfilar=True, el resumen de PerfilSimulacion
+
+    @property
+    def diferencia_costos(self):
+        return self.multas - self.costo_con_cabina_extra  # Positiva: conviene habilitar la cabina extra
+
+# Resultados de SimulacionCabinas.ejecutar_n_veces: intervalo de confianza del tiempo promedio de espera y métricas de cada réplica
+@dataclass
+class ResultadosReplicas:
+    promedio_espera: float
+    intervalo_confianza: tuple
+    confianza: float
+    replicas: list = field(repr=False)  # Un diccionario por réplica (ver SimulacionCabinas.resultados_replica)
+    grafico: object = None  # Future del gráfico si se dibujó en segundo plano (su resultado es la ruta del archivo)
+    semilla: int = None  # Semilla maestra de la que salen las semillas de las réplicas
+    semillas: list = field(default=None, repr=False)  # Semilla de cada réplica
+
+    def metrica(self, nombre):
+        return [resultado[nombre] for resultado in self.replicas]
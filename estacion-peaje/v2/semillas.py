@@ -0,0 +1,31 @@
+import random
+import numpy as np
+
+# Gestión de semillas. Todo número aleatorio de una corrida sale de una semilla maestra, de la que se derivan con
+# SeedSequence (que garantiza flujos independientes y no solapados):
+#   semilla maestra -> una semilla por réplica -> un flujo por estación -> un flujo por tipo de vehículo -> llegadas y servicio
+# Como cada réplica tiene su propia semilla, los resultados no dependen de qué proceso la ejecute ni del orden en que terminen,
+# y una réplica sola (por ejemplo, una celda de un barrido guardada en el cache) se puede repetir exactamente con su semilla.
+# Sin semilla se toma una de la entropía del sistema, pero igual queda registrada en los resultados para poder repetir la corrida
+
+# Semilla maestra concreta: la dada o una nueva tomada de la entropía del sistema
+def semilla_maestra(semilla=None):
+    return np.random.SeedSequence(semilla).entropy
+
+# Genera una semilla independiente por réplica a partir de la semilla maestra (SeedSequence garantiza flujos no solapados).
+# inicio permite continuar la secuencia: generar_semillas(s, 10) + generar_semillas(s, 10, inicio=10) == generar_semillas(s, 20)
+def generar_semillas(semilla, n, inicio=0):
+    raiz = np.random.SeedSequence(semilla, n_children_spawned=inicio)
+    return [int(secuencia.generate_state(1, np.uint64)[0]) for secuencia in raiz.spawn(n)]
+
+# Generadores del módulo random de la biblioteca estándar para los motores que lo usan (v3.py, v4.py): un generador de llegadas
+# y uno de servicio por tipo de vehículo, derivados de la semilla como los flujos de BancoMuestras, en lugar del estado global
+# de random compartido por todos. Devuelve ({tipo: generador de llegadas}, {tipo: generador de servicio})
+def generadores_por_tipo(semilla, tipos_vehiculo):
+    llegadas = {}
+    servicio = {}
+    for tipo_vehiculo, secuencia in zip(tipos_vehiculo, np.random.SeedSequence(semilla).spawn(len(tipos_vehiculo))):
+        secuencia_llegadas, secuencia_servicio = secuencia.spawn(2)
+        llegadas[tipo_vehiculo] = random.Random(int.from_bytes(secuencia_llegadas.generate_state(4).tobytes(), 'little'))
+        servicio[tipo_vehiculo] = random.Random(int.from_bytes(secuencia_servicio.generate_state(4).tobytes(), 'little'))
+    return llegadas, servicio
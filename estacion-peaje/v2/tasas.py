@@ -0,0 +1,70 @@
+import math
+
+SEGUNDOS_DIA = 24 * 60 * 60
+RESOLUCION = 15 * 60  # Duración de cada intervalo de la tabla de tasas (15 minutos)
+
+# Tabla de tasas de llegada constante por tramos. El período (un día o una semana) se divide en intervalos de igual
+# duración y cada tipo de vehículo tiene una tasa por intervalo, por lo que consultar la tasa vigente es O(1).
+# El tiempo 0 de la simulación corresponde al lunes a las 0hs
+class TablaTasas:
+    def __init__(self, tasas, resolucion=RESOLUCION):
+        self.resolucion = resolucion
+        self.tasas = {vehiculo: list(tasas_vehiculo) for vehiculo, tasas_vehiculo in tasas.items()}  # {tipo de vehículo: [tasa de cada intervalo]}
+        self.n_intervalos = len(next(iter(self.tasas.values())))
+        self.periodo = self.n_intervalos * resolucion
+        if any(len(tasas_vehiculo) != self.n_intervalos for tasas_vehiculo in self.tasas.values()):
+            raise ValueError("Todos los tipos de vehículo deben tener la misma cantidad de intervalos")
+
+    # Arma la tabla evaluando perfil(dia_semana, hora) -> {tipo de vehículo: tasa} al comienzo de cada intervalo.
+    # dias=1 repite el mismo perfil todos los días, dias=7 permite distinguir días hábiles de fines de semana (0 = lunes)
+    @classmethod
+    def desde_perfil(cls, perfil, dias=1, resolucion=RESOLUCION):
+        tasas = {}
+        for intervalo in range(int(dias * SEGUNDOS_DIA // resolucion)):
+            segundo = intervalo * resolucion
+            for vehiculo, tasa in perfil(int(segundo // SEGUNDOS_DIA), (segundo % SEGUNDOS_DIA) / 3600).items():
+                tasas.setdefault(vehiculo, []).append(tasa)
+        return cls(tasas, resolucion)
+
+    def tasa(self, tipo_vehiculo, tiempo):
+        return self.tasas[tipo_vehiculo][int(tiempo // self.resolucion) % self.n_intervalos]
+
+    # Próxima llegada de un proceso de Poisson no homogéneo por el método de inversión: se recorre la tabla desde el tiempo
+    # actual "consumiendo" una exponencial de media 1 con la tasa de cada intervalo. Es exacto aunque la tasa cambie
+    # entre dos llegadas (no usa la tasa vigente en el suceso anterior para todo el intervalo)
+    def proxima_llegada(self, tipo_vehiculo, tiempo, exponencial):
+        tasas = self.tasas[tipo_vehiculo]
+        if not any(tasas):
+            return math.inf  # Este tipo de vehículo nunca llega a la estación
+        intervalo = int(tiempo // self.resolucion)
+        while True:
+            tasa = tasas[intervalo % self.n_intervalos]
+            fin_intervalo = (intervalo + 1) * self.resolucion
+            if tasa > 0:
+                disponible = tasa * (fin_intervalo - tiempo)
+                if exponencial <= disponible:
+                    return tiempo + exponencial / tasa
+                exponencial -= disponible
+            tiempo = fin_intervalo
+            intervalo += 1
+
+    # Cantidad esperada de llegadas entre dos instantes (la integral de la tasa)
+    def llegadas_esperadas(self, tipo_vehiculo, desde, hasta):
+        tasas = self.tasas[tipo_vehiculo]
+        total = 0.0
+        intervalo = int(desde // self.resolucion)
+        while desde < hasta:
+            fin_intervalo = min((intervalo + 1) * self.resolucion, hasta)
+            total += tasas[intervalo % self.n_intervalos] * (fin_intervalo - desde)
+            desde = fin_intervalo
+            intervalo += 1
+        return total
+
+# Perfil con tasas de hora pico dentro de los horarios dados y de hora no pico fuera de ellos.
+# horarios_fin_de_semana (opcional) reemplaza a los horarios pico los sábados y domingos
+def perfil_horarios_pico(tasas, horarios_pico, horarios_fin_de_semana=None):
+    def perfil(dia_semana, hora):
+        horarios = horarios_pico if horarios_fin_de_semana is None or dia_semana < 5 else horarios_fin_de_semana
+        pico = any(inicio <= hora < fin for inicio, fin in horarios)
+        return tasas['pico'] if pico else tasas['no_pico']
+    return perfil
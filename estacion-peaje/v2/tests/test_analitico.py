@@ -0,0 +1,45 @@
+import math
+import pytest
+from analitico import erlang_c, espera_mgc, evaluar
+from codigo_final_v2 import SimulacionCabinas, Estacion, Vehiculo
+
+# Fórmula C de Erlang con factoriales, como en los libros
+def erlang_c_directa(cabinas, carga):
+    ultimo = carga ** cabinas / math.factorial(cabinas) * cabinas / (cabinas - carga)
+    return ultimo / (sum(carga ** k / math.factorial(k) for k in range(cabinas)) + ultimo)
+
+@pytest.mark.parametrize('cabinas, carga', [(1, 0.5), (2, 1.5), (3, 2.4), (10, 9.0)])
+def test_erlang_c(cabinas, carga):
+    assert erlang_c(cabinas, carga) == pytest.approx(erlang_c_directa(cabinas, carga), rel=1e-12)
+
+# Con servicio exponencial (cs^2 = 1) Allen-Cunneen y Pollaczek-Khinchine dan la espera exacta de la M/M/c
+@pytest.mark.parametrize('cabinas, tasa', [(1, 0.02), (3, 0.08)])
+def test_espera_mmc(cabinas, tasa):
+    media = 30
+    cola = espera_mgc(tasa, media, 2 * media ** 2, cabinas)
+    probabilidad = erlang_c_directa(cabinas, tasa * media)
+    assert cola['utilizacion'] == pytest.approx(tasa * media / cabinas)
+    assert cola['probabilidad_espera'] == pytest.approx(probabilidad)
+    assert cola['espera'] == pytest.approx(probabilidad / (cabinas / media - tasa))
+
+def test_cola_inestable():
+    assert espera_mgc(0.1, 30, 1800, 2)['espera'] == math.inf
+
+# Una estación con tasas constantes y servicio exponencial es una M/M/c durante todo el día: la espera media, el largo de la
+# cola y la cantidad de esperas que superan el límite (P(Wq > t) = C exp(-(c mu - lambda) t)) son exactos
+@pytest.mark.parametrize('cabinas, tasa', [(1, 0.02), (3, 0.08)])
+def test_evaluar_estacion_mmc(cabinas, tasa):
+    media, limite, dia = 30, 60, 86400
+    tasas = {Vehiculo.GRANDE: tasa / 2, Vehiculo.PEQUENO: tasa / 2}
+    servicio = {Vehiculo.GRANDE: ('exponencial', (media,)), Vehiculo.PEQUENO: ('exponencial', (media,))}
+    estacion = Estacion('M/M/c', cabinas=cabinas, tasas={'pico': tasas, 'no_pico': tasas})
+    simulacion = SimulacionCabinas(dia, [], [], multa_espera=1, limite_espera=limite, estaciones=[estacion], tiempos_servicio=servicio)
+    resultado = evaluar(simulacion.configuracion)
+    probabilidad = erlang_c_directa(cabinas, tasa * media)
+    espera = probabilidad / (cabinas / media - tasa)
+    assert resultado['confiable']
+    assert resultado['llegadas'] == pytest.approx(tasa * dia)
+    assert resultado['espera'] == pytest.approx(espera)
+    assert resultado['largo_cola'] == pytest.approx(tasa * espera)
+    assert resultado['utilizacion'] == pytest.approx(tasa * media / cabinas)
+    assert resultado['excedidos'] == pytest.approx(tasa * dia * probabilidad * math.exp(-(cabinas / media - tasa) * limite))
@@ -0,0 +1,39 @@
+import os
+import pytest
+from arena import importar_modelo, leer_salida, metricas_arena
+
+DIRECTORIO = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+MODELO = os.path.join(DIRECTORIO, 'tp_gonzalo_benito_182885.p')
+SALIDA = os.path.join(DIRECTORIO, 'tp_gonzalo_benito_182885.out')
+
+# El modelo del trabajo práctico: 5 tipos de vehículo que van en un 97% a las cabinas 1 a 3 (PickStation) y en un 3% a la
+# cabina 4, que no toma recurso
+def test_importar_modelo_del_trabajo_practico():
+    modelo = importar_modelo(MODELO)
+    assert (modelo.replicas, modelo.unidad_base, modelo.tiempo_final) == (50, 'hours', 86400)
+    assert modelo.llegadas == {'Gran Porte': ('exponencial', (60,)), 'Grandes': ('exponencial', (70,)), 'Pequeños': ('exponencial', (40,)),
+                               'Motos': ('exponencial', (380,)), 'Especial': ('exponencial', (2500,))}
+    for caminos in modelo.caminos.values():
+        assert [estaciones for _, estaciones in caminos] == [['Station 5', 'Station 6', 'Station 7'], ['Station 8']]
+        assert [probabilidad for probabilidad, _ in caminos] == pytest.approx([0.97, 0.03])
+    cabinas = {cabina.nombre: (cabina.cola, cabina.recurso, cabina.servicio) for cabina in modelo.cabinas.values()}
+    assert cabinas == {'Cabina 1': ('Cabina 1.Queue', 'Empleado A1', ('uniforme', (60, 60))),
+                       'Cabina 2': ('Cabina 2.Queue', 'Empleado A2', ('uniforme', (48, 90))),
+                       'Cabina 3': ('Cabina 3.Queue', 'Empleado A3', ('triangular', (30, 60, 120))),
+                       'Cabina 4': (None, None, ('normal', (0, 6)))}
+    assert modelo.plan_cabinas() == (3, [])
+
+# La corrida de la salida se cortó por el límite de entidades de la licencia de estudiante
+def test_leer_salida_del_trabajo_practico():
+    replicas = leer_salida(SALIDA)
+    assert len(replicas) == 1
+    replica = replicas[0]
+    assert (replica.numero, replica.replicas, replica.unidad_base) == (1, 50, 'hours')
+    assert replica.fin == pytest.approx(2.9914772 * 3600)
+    assert replica.error.startswith('Maximum of 150 entities exceeded.')
+    espera = replica.tally['Cabina 1.WaitTimePerEntity']
+    assert (espera.media, espera.semiancho, espera.minimo, espera.maximo, espera.ultimo) == (0.2923, None, 0.0, 0.5997, 179)
+    assert replica.continuas['Cabina 1.Queue.NumberInQueue'].media == 22.34
+    assert replica.salidas['Cabina 1 Number Out'] == 179
+    metricas = metricas_arena(importar_modelo(MODELO), replica)
+    assert (metricas['llegadas'], metricas['vehiculos_atendidos'], metricas['utilizacion']) == (637, 493, 1.0)
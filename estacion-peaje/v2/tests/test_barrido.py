@@ -0,0 +1,37 @@
+import pytest
+import barrido
+from barrido import grilla, hipercubo_latino, barrer
+from codigo_final_v2 import SimulacionCabinas, horarios_pico_mañana, horarios_pico_vespertino
+
+def test_grilla_combina_todos_los_valores():
+    escenarios = grilla({'multa_espera': [0.1, 0.2], 'cabinas': [1, 2, 3]})
+    assert len(escenarios) == 6
+    assert escenarios[0] == {'multa_espera': 0.1, 'cabinas': 1}
+    assert {(e['multa_espera'], e['cabinas']) for e in escenarios} == {(m, c) for m in (0.1, 0.2) for c in (1, 2, 3)}
+
+# Cada una de las n franjas del rango de cada parámetro se usa exactamente una vez
+def test_hipercubo_latino_usa_cada_franja_una_vez():
+    n = 10
+    escenarios = hipercubo_latino({'multa_espera': (0.0, 1.0), 'cabinas': (1, 10), 'disciplina': ['fifo', 'prioridad']}, n, semilla=5)
+    assert sorted(int(e['multa_espera'] * n) for e in escenarios) == list(range(n))
+    assert sorted(e['cabinas'] for e in escenarios) == list(range(1, 11))
+    assert sorted(e['disciplina'] for e in escenarios) == ['fifo'] * 5 + ['prioridad'] * 5
+    assert hipercubo_latino({'multa_espera': (0.0, 1.0)}, n, semilla=5) != hipercubo_latino({'multa_espera': (0.0, 1.0)}, n, semilla=6)
+
+# Un segundo barrido con el mismo cache no simula nada y devuelve la misma tabla; al agregar un escenario sólo se simula ese
+def test_barrido_reutiliza_el_cache(tmp_path, monkeypatch):
+    simulacion = SimulacionCabinas(6 * 3600, horarios_pico_mañana, horarios_pico_vespertino, 1)
+    cache = str(tmp_path / 'barrido.sqlite')
+    escenarios = grilla({'multa_espera': [0.1, 0.3]})
+    tabla = barrer(simulacion, escenarios, 2, semilla=4, cache=cache)
+    assert [(fila['escenario'], fila['replica']) for fila in tabla] == [(0, 0), (0, 1), (1, 0), (1, 1)]
+
+    simuladas = []
+    ejecutar_replica = barrido.ejecutar_replica
+    monkeypatch.setattr(barrido, 'ejecutar_replica', lambda parametros: simuladas.append(parametros) or ejecutar_replica(parametros))
+    assert barrer(simulacion, escenarios, 2, semilla=4, cache=cache) == tabla
+    assert simuladas == []
+
+    ampliada = barrer(simulacion, escenarios + [{'multa_espera': 0.5}], 2, semilla=4, cache=cache)
+    assert len(simuladas) == 2 and all(configuracion['multa_espera'] == 0.5 for configuracion, _ in simuladas)
+    assert ampliada[:4] == tabla
@@ -0,0 +1,53 @@
+import types
+import logging
+import codigo_final_v2
+from codigo_final_v2 import SimulacionCabinas, ESTACIONES_PEAJE, horarios_pico_mañana, horarios_pico_vespertino
+from cache_resultados import CacheResultados, clave_contenido
+from colas import ColaFIFO
+
+def simulacion_peaje(tiempo_final=86400, **configuracion):
+    return SimulacionCabinas(tiempo_final, horarios_pico_mañana, horarios_pico_vespertino, 1, estaciones=ESTACIONES_PEAJE, **configuracion)
+
+def test_cache_devuelve_las_replicas_sin_simular(tmp_path, monkeypatch):
+    ruta = str(tmp_path / 'cache.sqlite')
+    simulacion = simulacion_peaje()
+    simuladas = simulacion.ejecutar_n_veces(3, semilla=13, cache=ruta)
+    assert len(CacheResultados(ruta)) == 3
+
+    def no_simular(parametros):
+        raise AssertionError("la réplica tendría que salir del cache")
+
+    monkeypatch.setattr(codigo_final_v2, 'ejecutar_replica', no_simular)
+    guardadas = simulacion.ejecutar_n_veces(3, semilla=13, cache=ruta)
+    assert guardadas.replicas == simuladas.replicas
+
+class ColaPropia(ColaFIFO):
+    pass
+
+# Las clases se identifican por su nombre calificado y los mapeos de solo lectura como diccionarios
+def test_clave_de_clases_y_mapeos():
+    assert clave_contenido({'disciplina': ColaPropia}) == clave_contenido({'disciplina': ColaPropia})
+    assert clave_contenido({'disciplina': ColaPropia}) != clave_contenido({'disciplina': ColaFIFO})
+    assert clave_contenido(types.MappingProxyType({'a': 1})) == clave_contenido({'a': 1})
+
+def test_disciplina_propia_usa_el_cache(tmp_path):
+    ruta = str(tmp_path / 'cache.sqlite')
+    simulacion = simulacion_peaje(disciplina=ColaPropia)
+    simuladas = simulacion.ejecutar_n_veces(2, semilla=13, cache=ruta)
+    assert len(CacheResultados(ruta)) == 2
+    assert simulacion.ejecutar_n_veces(2, semilla=13, cache=ruta).replicas == simuladas.replicas
+
+# Una configuración que no se puede representar en la clave no corta la corrida: se simula sin cache
+def test_configuracion_sin_clave_simula_sin_cache(tmp_path, monkeypatch, caplog):
+    ruta = str(tmp_path / 'cache.sqlite')
+    simulacion = simulacion_peaje()
+    esperadas = simulacion.ejecutar_n_veces(2, semilla=13)
+
+    def sin_clave(configuracion, semilla):
+        raise TypeError("Object of type object is not JSON serializable")
+
+    monkeypatch.setattr(codigo_final_v2, 'clave_replica', sin_clave)
+    with caplog.at_level(logging.WARNING, logger='peaje'):
+        assert simulacion.ejecutar_n_veces(2, semilla=13, cache=ruta).replicas == esperadas.replicas
+    assert 'No se usa el cache' in caplog.text
+    assert len(CacheResultados(ruta)) == 0
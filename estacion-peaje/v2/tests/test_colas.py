@@ -0,0 +1,53 @@
+import pytest
+from codigo_final_v2 import Vehiculo
+from colas import ColaFIFO, ColaPrioridad, ColaCarrilExclusivo, crear_cola
+
+def vaciar(cola, tiempo=0):
+    return [cola.desencolar(tiempo) for _ in range(len(cola))]
+
+def test_fifo_atiende_en_orden_de_llegada():
+    cola = ColaFIFO()
+    for tiempo, tipo in enumerate([Vehiculo.GRANDE, Vehiculo.PEQUENO, Vehiculo.MOTOCICLETA]):
+        cola.encolar(tiempo, tiempo, tipo)
+    assert vaciar(cola, 3) == [(0, Vehiculo.GRANDE), (1, Vehiculo.PEQUENO), (2, Vehiculo.MOTOCICLETA)]
+
+# Menor número = mayor prioridad; dentro de un mismo nivel, en orden de llegada
+def test_prioridad_por_tipo_y_fifo_dentro_de_cada_nivel():
+    cola = ColaPrioridad({Vehiculo.MOTOCICLETA: 0, Vehiculo.PEQUENO: 1, Vehiculo.GRANDE: 2, Vehiculo.GRAN_PORTE: 2})
+    llegadas = [(0, Vehiculo.GRANDE), (1, Vehiculo.PEQUENO), (2, Vehiculo.GRAN_PORTE), (3, Vehiculo.MOTOCICLETA), (4, Vehiculo.PEQUENO)]
+    for tiempo, tipo in llegadas:
+        cola.encolar(tiempo, tiempo, tipo)
+    assert vaciar(cola, 5) == [(3, Vehiculo.MOTOCICLETA), (1, Vehiculo.PEQUENO), (4, Vehiculo.PEQUENO),
+                               (0, Vehiculo.GRANDE), (2, Vehiculo.GRAN_PORTE)]
+
+# Un tipo sin nivel de prioridad se atiende con los de menor prioridad, en orden de llegada
+def test_prioridad_de_un_tipo_sin_nivel():
+    cola = ColaPrioridad({Vehiculo.MOTOCICLETA: 0, Vehiculo.GRANDE: 1})
+    llegadas = [(0, Vehiculo.ESPECIAL), (1, Vehiculo.GRANDE), (2, Vehiculo.MOTOCICLETA)]
+    for tiempo, tipo in llegadas:
+        cola.encolar(tiempo, tiempo, tipo)
+    assert vaciar(cola, 3) == [(2, Vehiculo.MOTOCICLETA), (0, Vehiculo.ESPECIAL), (1, Vehiculo.GRANDE)]
+
+def test_prioridad_sin_niveles():
+    with pytest.raises(ValueError, match='prioridad'):
+        crear_cola('prioridad')
+
+# Con espera en los dos carriles se alterna empezando por el exclusivo; si uno se vacía se sigue con el otro
+def test_carril_exclusivo_alterna_los_carriles():
+    cola = ColaCarrilExclusivo(Vehiculo.MOTOCICLETA)
+    llegadas = [(0, Vehiculo.GRANDE), (1, Vehiculo.PEQUENO), (2, Vehiculo.MOTOCICLETA), (3, Vehiculo.GRANDE),
+                (4, Vehiculo.MOTOCICLETA), (5, Vehiculo.MOTOCICLETA)]
+    for tiempo, tipo in llegadas:
+        cola.encolar(tiempo, tiempo, tipo)
+    assert vaciar(cola, 6) == [(2, Vehiculo.MOTOCICLETA), (0, Vehiculo.GRANDE), (4, Vehiculo.MOTOCICLETA),
+                               (1, Vehiculo.PEQUENO), (5, Vehiculo.MOTOCICLETA), (3, Vehiculo.GRANDE)]
+
+# Lq ponderado por tiempo: 1 vehículo de 0 a 10, 2 de 10 a 20, 1 de 20 a 30 y 0 de 30 a 40
+def test_largo_de_la_cola_ponderado_por_tiempo():
+    cola = crear_cola('fifo')
+    cola.encolar(0, 0, Vehiculo.GRANDE)
+    cola.encolar(10, 10, Vehiculo.PEQUENO)
+    cola.desencolar(20)
+    cola.desencolar(30)
+    assert cola.estadistica_largo.promedio(40) == 1.0
+    assert cola.estadistica_largo.maximo == 2
@@ -0,0 +1,13 @@
+import os
+from codigo_final_v2 import SimulacionCabinas, ESTACIONES_PEAJE, horarios_pico_mañana, horarios_pico_vespertino
+from escenarios import cargar_escenario
+
+DIRECTORIO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# escenario_peaje.toml describe las mismas estaciones que ESTACIONES_PEAJE: tiene que dar exactamente la misma corrida
+def test_escenario_toml_igual_a_estaciones_peaje():
+    escenario = cargar_escenario(os.path.join(DIRECTORIO, 'escenario_peaje.toml'))
+    desde_archivo = escenario.simulacion(semilla=3)
+    completa = SimulacionCabinas(escenario.configuracion['tiempo_final'], horarios_pico_mañana, horarios_pico_vespertino, 1,
+                                 estaciones=ESTACIONES_PEAJE, semilla=3)
+    assert desde_archivo.ejecutar() == completa.ejecutar()
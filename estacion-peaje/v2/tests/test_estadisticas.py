@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from estadisticas import CuantilP2, EstadisticaEnLinea
+
+generador = np.random.default_rng(1)
+MUESTRAS = {
+    'exponencial': generador.exponential(30, 20000),
+    'uniforme': generador.uniform(45, 55, 20000),
+    'triangular': generador.triangular(15, 20, 35, 20000),
+    'lognormal': generador.lognormal(3, 1, 20000),
+}
+
+# El estimador P² no guarda los datos, pero con 20000 observaciones queda a menos de un 2% del cuantil exacto
+@pytest.mark.parametrize('p', [0.1, 0.5, 0.9, 0.95, 0.99])
+@pytest.mark.parametrize('distribucion', list(MUESTRAS))
+def test_cuantil_p2_contra_numpy(distribucion, p):
+    muestras = MUESTRAS[distribucion]
+    estimador = CuantilP2(p)
+    for x in muestras.tolist():
+        estimador.agregar(x)
+    assert estimador.valor() == pytest.approx(np.quantile(muestras, p), rel=0.02)
+
+def test_resumen_en_linea_contra_numpy():
+    muestras = MUESTRAS['exponencial']
+    estadistica = EstadisticaEnLinea(limite=60, ancho_histograma=10, intervalos_histograma=20)
+    for x in muestras.tolist():
+        estadistica.agregar(x)
+    assert estadistica.media == pytest.approx(muestras.mean(), rel=1e-12)
+    assert estadistica.varianza() == pytest.approx(muestras.var(ddof=1), rel=1e-9)
+    assert (estadistica.minimo, estadistica.maximo) == (muestras.min(), muestras.max())
+    assert estadistica.excedidos == (muestras > 60).sum()
+    assert estadistica.exceso_total == pytest.approx((muestras[muestras > 60] - 60).sum(), rel=1e-9)
+    conteos, _ = np.histogram(muestras, bins=np.arange(0, 210, 10))
+    assert estadistica.histograma.conteos == conteos.tolist()
+    assert estadistica.histograma.desborde == (muestras >= 200).sum()
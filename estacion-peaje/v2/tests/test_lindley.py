@@ -0,0 +1,14 @@
+import statistics
+import pytest
+from codigo_final_v2 import SimulacionCabinas, horarios_pico_mañana, horarios_pico_vespertino
+
+# La recursión de Lindley usa otros números aleatorios que el ciclo de sucesos, así que sólo coinciden en promedio:
+# cada métrica tiene que quedar a menos de 4 errores estándar
+def test_lindley_coincide_con_el_ciclo_de_sucesos():
+    simulacion = SimulacionCabinas(6 * 3600, horarios_pico_mañana, horarios_pico_vespertino, 1)
+    vectorizado = simulacion.ejecutar_n_veces_vectorizado(2000, semilla=1)
+    ciclo = simulacion.ejecutar_n_veces(100, semilla=2)
+    for metrica in ('espera', 'vehiculos_atendidos', 'llegadas', 'largo_cola', 'largo_sistema', 'utilizacion'):
+        valores = ciclo.metrica(metrica)
+        error = statistics.stdev(valores) / len(valores) ** 0.5
+        assert statistics.mean(vectorizado.metrica(metrica)) == pytest.approx(statistics.mean(valores), abs=4 * error), metrica
@@ -0,0 +1,30 @@
+import copy
+import pickle
+from codigo_final_v2 import SimulacionCabinas, ESTACIONES_PEAJE, horarios_pico_mañana, horarios_pico_vespertino
+
+def simulacion_peaje(tiempo_final=86400, **configuracion):
+    return SimulacionCabinas(tiempo_final, horarios_pico_mañana, horarios_pico_vespertino, 1, estaciones=ESTACIONES_PEAJE, **configuracion)
+
+def vaciar(cola, tiempo):
+    return [cola.desencolar(tiempo) for _ in range(len(cola))]
+
+# Sin Numba el núcleo corre como Python común: más lento, pero tiene que dar lo mismo que con Numba
+def test_nucleo_igual_al_ciclo_de_sucesos():
+    ciclo = simulacion_peaje(semilla=5, acelerar=False)
+    nucleo = simulacion_peaje(semilla=5, acelerar=True)
+    assert nucleo.ejecutar() == ciclo.ejecutar()
+    assert nucleo.resultados_replica() == ciclo.resultados_replica()
+
+# El núcleo deja los vehículos que quedaron esperando como arreglos y recién los pasa a tuplas si se vuelve a usar la cola:
+# tienen que ser los mismos que deja el ciclo de sucesos, también después de copiar o guardar la simulación
+def test_nucleo_deja_la_misma_cola():
+    ciclo = simulacion_peaje(semilla=5, acelerar=False)
+    ciclo.ejecutar()
+    esperados = [vaciar(cola, ciclo.tiempo_actual) for cola in ciclo.colas]
+    assert any(esperados)
+    for copiar in (lambda simulacion: simulacion, copy.deepcopy, lambda simulacion: pickle.loads(pickle.dumps(simulacion))):
+        nucleo = simulacion_peaje(semilla=5, acelerar=True)
+        nucleo.ejecutar()
+        nucleo = copiar(nucleo)
+        assert [len(cola) for cola in nucleo.colas] == [len(vehiculos) for vehiculos in esperados]
+        assert [vaciar(cola, nucleo.tiempo_actual) for cola in nucleo.colas] == esperados
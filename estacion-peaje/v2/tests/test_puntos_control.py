@@ -0,0 +1,27 @@
+import puntos_control
+from codigo_final_v2 import SimulacionCabinas, ESTACIONES_PEAJE, horarios_pico_mañana, horarios_pico_vespertino
+from semillas import generar_semillas
+
+def simulacion_peaje(tiempo_final=86400, **configuracion):
+    return SimulacionCabinas(tiempo_final, horarios_pico_mañana, horarios_pico_vespertino, 1, estaciones=ESTACIONES_PEAJE, **configuracion)
+
+# Una corrida reanudada desde su punto de control termina exactamente igual que una sin interrupciones
+def test_reanudar_corrida_desde_punto_de_control(tmp_path):
+    completa = simulacion_peaje(3 * 86400, semilla=9).ejecutar()
+    interrumpida = simulacion_peaje(3 * 86400, semilla=9)
+    interrumpida.avanzar(10000)
+    punto_control = str(tmp_path / 'corrida.pkl')
+    puntos_control.guardar(punto_control, interrumpida)
+    interrumpida.avanzar(5000)  # Lo simulado después del punto de control se pierde
+    _, reanudada = SimulacionCabinas.reanudar(punto_control)
+    assert reanudada == completa
+
+def test_reanudar_replicas_desde_punto_de_control(tmp_path):
+    simulacion = simulacion_peaje()
+    completas = simulacion.ejecutar_n_veces(4, semilla=11)
+    # Un lote interrumpido después de la segunda réplica
+    punto_control = str(tmp_path / 'replicas.pkl')
+    semillas = generar_semillas(11, 4)
+    puntos_control.guardar(punto_control, {'semilla': 11, 'semillas': semillas, 'resultados': dict(enumerate(completas.replicas[:2]))})
+    reanudadas = simulacion.ejecutar_n_veces(4, punto_control=punto_control)
+    assert reanudadas.replicas == completas.replicas
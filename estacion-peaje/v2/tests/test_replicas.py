@@ -0,0 +1,9 @@
+from codigo_final_v2 import SimulacionCabinas, ESTACIONES_PEAJE, horarios_pico_mañana, horarios_pico_vespertino
+
+# Las réplicas repartidas entre procesos dan exactamente lo mismo que en serie: cada una usa la semilla de su número
+def test_replicas_en_serie_y_en_paralelo():
+    simulacion = SimulacionCabinas(86400, horarios_pico_mañana, horarios_pico_vespertino, 1, estaciones=ESTACIONES_PEAJE)
+    serie = simulacion.ejecutar_n_veces(4, semilla=7)
+    paralelo = simulacion.ejecutar_n_veces(4, semilla=7, procesos=2)
+    assert paralelo.replicas == serie.replicas
+    assert paralelo.promedio_espera == serie.promedio_espera
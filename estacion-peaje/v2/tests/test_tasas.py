@@ -0,0 +1,33 @@
+import math
+import numpy as np
+import pytest
+from tasas import TablaTasas, perfil_horarios_pico, SEGUNDOS_DIA
+
+# La exponencial que no alcanza a consumirse en un intervalo sigue con la tasa del siguiente: 1 * (10 - 5) = 5 en el
+# primer intervalo y las 2 unidades restantes a tasa 2 en el segundo
+def test_proxima_llegada_cruza_el_cambio_de_tasa():
+    tabla = TablaTasas({'auto': [1.0, 2.0]}, resolucion=10)
+    assert tabla.proxima_llegada('auto', 5, 7) == 11
+    assert tabla.proxima_llegada('auto', 5, 3) == 8
+    assert tabla.proxima_llegada('auto', 15, 12) == 22  # En t = 20 la tabla vuelve a empezar, con tasa 1
+
+def test_proxima_llegada_de_un_tipo_que_no_llega():
+    assert TablaTasas({'auto': [0.0, 0.0]}, resolucion=10).proxima_llegada('auto', 0, 1) == math.inf
+
+# Llegadas por intervalo durante 200 días con un perfil de horas pico: cada conteo es Poisson con media igual a la integral
+# de la tasa, así que tiene que quedar dentro de 4 desvíos
+def test_cantidad_de_llegadas_por_intervalo():
+    tasas = {'pico': {'auto': 1 / 20}, 'no_pico': {'auto': 1 / 90}}
+    tabla = TablaTasas.desde_perfil(perfil_horarios_pico(tasas, [(7, 9), (17, 20)]))
+    dias = 200
+    generador = np.random.default_rng(3)
+    tiempo = 0.0
+    conteos = np.zeros(tabla.n_intervalos)
+    while True:
+        tiempo = tabla.proxima_llegada('auto', tiempo, generador.exponential())
+        if tiempo >= dias * SEGUNDOS_DIA:
+            break
+        conteos[int(tiempo // tabla.resolucion) % tabla.n_intervalos] += 1
+    esperadas = np.array([tabla.llegadas_esperadas('auto', inicio, inicio + tabla.resolucion) for inicio in range(0, SEGUNDOS_DIA, tabla.resolucion)]) * dias
+    assert np.all(np.abs(conteos - esperadas) <= 4 * np.sqrt(esperadas))
+    assert conteos.sum() == pytest.approx(tabla.llegadas_esperadas('auto', 0, dias * SEGUNDOS_DIA), rel=0.01)
@@ -0,0 +1,139 @@
+import os
+import json
+import math
+from array import array
+import numpy as np
+from calendario import LLEGADA, SALIDA, CAMBIO_CAPACIDAD
+
+# Registro de la traza de sucesos de una corrida en formato columnar: una columna por campo en lugar de una tupla de Python
+# por suceso. Los sucesos se acumulan en bloques de arreglos tipados (array de la biblioteca estándar, que agrega elementos
+# en C) y cada bloque lleno se escribe al disco, así la memoria no crece con la corrida. Formatos:
+# - 'npy': un archivo .npy por columna en el directorio de la traza; se leen con leer_trazas como arreglos de NumPy mapeados
+#   en memoria (np.load con mmap_mode), sin cargar la traza completa
+# - 'parquet': un único archivo trazas.parquet con un grupo de filas por bloque (requiere pyarrow)
+# Además se escribe metadatos.json con los nombres de las estaciones, de los tipos de vehículo y de los códigos de suceso
+INICIO_SERVICIO = 3  # Código de suceso propio de la traza (los demás son los del calendario)
+NOMBRES_SUCESOS = {LLEGADA: 'llegada', SALIDA: 'salida', CAMBIO_CAPACIDAD: 'cambio_capacidad', INICIO_SERVICIO: 'inicio_servicio'}
+TAMANO_BLOQUE_TRAZAS = 65536  # Sucesos por bloque
+
+# Columnas: (nombre, código de tipo de array, dtype de NumPy). Los campos que no aplican a un suceso valen -1 (o NaN la espera).
+# En los cambios de capacidad, "cabina" es la nueva cantidad de cabinas habilitadas
+COLUMNAS = (('tiempo', 'd', '<f8'), ('suceso', 'b', '|i1'), ('estacion', 'h', '<i2'), ('tipo_vehiculo', 'b', '|i1'),
+            ('cabina', 'h', '<i2'), ('espera', 'd', '<f8'))
+LARGO_ENCABEZADO = 128  # Bytes del encabezado de cada .npy, fijo para poder reescribirlo con la cantidad final de filas
+
+# Encabezado de un archivo .npy versión 1.0 (cadena mágica, versión, largo del diccionario y diccionario completado con espacios)
+def encabezado_npy(dtype, filas):
+    diccionario = "{'descr': '%s', 'fortran_order': False, 'shape': (%d,), }" % (dtype, filas)
+    relleno = LARGO_ENCABEZADO - 10 - len(diccionario) - 1
+    return b'\x93NUMPY\x01\x00' + (LARGO_ENCABEZADO - 10).to_bytes(2, 'little') + (diccionario + ' ' * relleno + '\n').encode('latin1')
+
+class RegistroTrazas:
+    def __init__(self, directorio, estaciones, tipos_vehiculo, formato='npy', tamano_bloque=TAMANO_BLOQUE_TRAZAS):
+        if formato not in ('npy', 'parquet'):
+            raise ValueError(f"Formato de trazas desconocido: '{formato}' (opciones: 'npy', 'parquet')")
+        self.directorio = directorio
+        self.formato = formato
+        self.tamano_bloque = tamano_bloque
+        self.indice_tipo = {tipo: indice for indice, tipo in enumerate(tipos_vehiculo)}
+        self.metadatos = {'formato': formato, 'estaciones': list(estaciones), 'tipos_vehiculo': [getattr(tipo, 'value', str(tipo)) for tipo in tipos_vehiculo],
+                          'sucesos': {str(codigo): nombre for codigo, nombre in NOMBRES_SUCESOS.items()}}
+        self.filas = 0  # Filas ya escritas en el disco
+        self.columnas = [array(codigo) for _, codigo, _ in COLUMNAS]
+        # El directorio y los archivos se crean recién al escribir el primer bloque o al cerrar, así una simulación que
+        # nunca se ejecuta (por ejemplo la plantilla de las réplicas) no deja nada en el disco
+        self.abierto = False
+
+    # Crea el directorio con los metadatos y abre los archivos de las columnas
+    def abrir(self):
+        os.makedirs(self.directorio, exist_ok=True)
+        with open(os.path.join(self.directorio, 'metadatos.json'), 'w') as archivo:
+            json.dump(self.metadatos, archivo, ensure_ascii=False, indent=1)
+        if self.formato == 'npy':
+            self.archivos = []
+            for nombre, _, dtype in COLUMNAS:
+                ruta = os.path.join(self.directorio, nombre + '.npy')
+                archivo = open(ruta, 'r+b' if self.filas else 'wb')
+                if self.filas:
+                    archivo.truncate(LARGO_ENCABEZADO + self.filas * np.dtype(dtype).itemsize)  # Descarta lo escrito después del punto de control
+                archivo.write(encabezado_npy(dtype, self.filas))
+                archivo.seek(0, os.SEEK_END)
+                self.archivos.append(archivo)
+        else:
+            if self.filas:
+                raise ValueError("Las trazas en formato parquet no se pueden reanudar desde un punto de control")
+            import pyarrow
+            import pyarrow.parquet
+            self.esquema = pyarrow.schema([(nombre, pyarrow.from_numpy_dtype(np.dtype(dtype))) for nombre, _, dtype in COLUMNAS])
+            self.escritor = pyarrow.parquet.ParquetWriter(os.path.join(self.directorio, 'trazas.parquet'), self.esquema)
+        self.abierto = True
+
+    def registrar(self, tiempo, suceso, estacion, tipo_vehiculo=None, cabina=-1, espera=math.nan):
+        tiempos, sucesos, estaciones, tipos, cabinas, esperas = self.columnas
+        tiempos.append(tiempo)
+        sucesos.append(suceso)
+        estaciones.append(estacion)
+        tipos.append(-1 if tipo_vehiculo is None else self.indice_tipo[tipo_vehiculo])
+        cabinas.append(cabina)
+        esperas.append(espera)
+        if len(tiempos) >= self.tamano_bloque:
+            self.volcar()
+
+    # Escribe el bloque actual en el disco y lo vacía
+    def volcar(self):
+        if not self.columnas[0]:
+            return
+        if not self.abierto:
+            self.abrir()
+        if self.formato == 'npy':
+            for archivo, columna in zip(self.archivos, self.columnas):
+                columna.tofile(archivo)
+        else:
+            import pyarrow
+            bloque = [np.frombuffer(columna, dtype=dtype) for columna, (_, _, dtype) in zip(self.columnas, COLUMNAS)]
+            self.escritor.write_table(pyarrow.Table.from_arrays(bloque, schema=self.esquema))
+        self.filas += len(self.columnas[0])
+        self.columnas = [array(codigo) for _, codigo, _ in COLUMNAS]
+
+    # Escribe lo pendiente, completa los encabezados con la cantidad de filas y cierra los archivos. Se puede seguir
+    # registrando después (en 'npy' los archivos se reabren al escribir el próximo bloque)
+    def cerrar(self):
+        if not self.abierto:
+            self.abrir()
+        self.volcar()
+        if self.formato == 'npy':
+            for archivo, (_, _, dtype) in zip(self.archivos, COLUMNAS):
+                archivo.seek(0)
+                archivo.write(encabezado_npy(dtype, self.filas))
+                archivo.close()
+            self.archivos = None
+        else:
+            self.escritor.close()
+            self.escritor = None
+        self.abierto = False
+
+    # Para los puntos de control: se guarda lo registrado hasta ahora y la cantidad de filas, sin los archivos abiertos.
+    # Al reanudar los archivos se reabren con el próximo bloque y se descarta lo que se haya escrito después del punto de control
+    def __getstate__(self):
+        if self.formato == 'npy':
+            if self.abierto or self.columnas[0]:
+                self.cerrar()
+        else:
+            self.volcar()
+        estado = dict(self.__dict__)
+        for atributo in ('archivos', 'escritor', 'esquema'):
+            estado.pop(atributo, None)
+        estado['abierto'] = False
+        return estado
+
+# Columnas de una traza como arreglos de NumPy (mapeados en memoria si es 'npy') y sus metadatos
+def leer_trazas(directorio):
+    with open(os.path.join(directorio, 'metadatos.json')) as archivo:
+        metadatos = json.load(archivo)
+    if metadatos['formato'] == 'npy':
+        columnas = {nombre: np.load(os.path.join(directorio, nombre + '.npy'), mmap_mode='r') for nombre, _, _ in COLUMNAS}
+    else:
+        import pyarrow.parquet
+        tabla = pyarrow.parquet.read_table(os.path.join(directorio, 'trazas.parquet'))
+        columnas = {nombre: tabla.column(nombre).to_numpy() for nombre, _, _ in COLUMNAS}
+    return columnas, metadatos
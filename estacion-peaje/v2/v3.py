@@ -1,7 +1,7 @@
-import random
 import heapq
 import statistics
-import scipy.stats as stats
+from distribucion_t import intervalo_t
+from semillas import semilla_maestra, generar_semillas, generadores_por_tipo
 
 # Definición de tipos de vehículo y tasas de llegada
 class Vehiculo:
@@ -27,12 +27,12 @@ tasas_llegada = {
     }
 }
 
-# Distribuciones del tiempo de atención usando random
+# Distribuciones del tiempo de atención, cada una con el generador de random del tipo de vehículo
 distribuciones_tiempo_atencion = {
-    Vehiculo.GRAN_PORTE: lambda: random.uniform(45, 55),  # Distribución uniforme
-    Vehiculo.GRANDE: lambda: random.expovariate(1 / 30),  # Distribución exponencial
-    Vehiculo.PEQUENO: lambda: random.triangular(15, 20, 35),  # Distribución triangular
-    Vehiculo.MOTO: lambda: random.expovariate(1 / 30)     # Distribución exponencial
+    Vehiculo.GRAN_PORTE: lambda generador: generador.uniform(45, 55),  # Distribución uniforme
+    Vehiculo.GRANDE: lambda generador: generador.expovariate(1 / 30),  # Distribución exponencial
+    Vehiculo.PEQUENO: lambda generador: generador.triangular(15, 20, 35),  # Distribución triangular
+    Vehiculo.MOTO: lambda generador: generador.expovariate(1 / 30)     # Distribución exponencial
 }
 
 # Períodos de tiempo pico
@@ -51,8 +51,10 @@ class Evento:
 
 # Clase SimulacionPeaje
 class SimulacionPeaje:
-    def __init__(self, tiempo_final, periodos_pico_A, periodos_pico_D):
+    def __init__(self, tiempo_final, periodos_pico_A, periodos_pico_D, semilla=None):
         self.tiempo_actual = 0
+        self.semilla = semilla_maestra(semilla)  # Queda registrada para poder repetir la corrida
+        self.generadores_llegadas, self.generadores_servicio = generadores_por_tipo(self.semilla, list(tasas_llegada['no_pico']))
         self.tiempo_final = tiempo_final
         self.periodos_pico_A = periodos_pico_A
         self.periodos_pico_D = periodos_pico_D
@@ -75,7 +77,7 @@ class SimulacionPeaje:
 
     def programar_eventos_iniciales(self):
         for tipo_vehiculo in tasas_llegada['no_pico'].keys():
-            tiempo_llegada = self.tiempo_actual + random.expovariate(tasas_llegada['no_pico'][tipo_vehiculo])
+            tiempo_llegada = self.tiempo_actual + self.generadores_llegadas[tipo_vehiculo].expovariate(tasas_llegada['no_pico'][tipo_vehiculo])
             heapq.heappush(self.cola_eventos, Evento(tiempo_llegada, 'llegada', tipo_vehiculo))
 
     def manejar_evento(self, evento):
@@ -87,7 +89,7 @@ class SimulacionPeaje:
     def manejar_llegada(self, evento):
         if self.cabinas_disponibles > 0:
             self.cabinas_disponibles -= 1
-            tiempo_salida = self.tiempo_actual + distribuciones_tiempo_atencion[evento.tipo_vehiculo]()
+            tiempo_salida = self.tiempo_actual + distribuciones_tiempo_atencion[evento.tipo_vehiculo](self.generadores_servicio[evento.tipo_vehiculo])
             heapq.heappush(self.cola_eventos, Evento(tiempo_salida, 'salida', evento.tipo_vehiculo))
         else:
             self.cola_vehiculos.append(evento)
@@ -95,7 +97,7 @@ class SimulacionPeaje:
 
     def programar_proxima_llegada(self, tipo_vehiculo):
         tasa_llegada = self.obtener_tasa_llegada(tipo_vehiculo)
-        tiempo_llegada = self.tiempo_actual + random.expovariate(tasa_llegada)
+        tiempo_llegada = self.tiempo_actual + self.generadores_llegadas[tipo_vehiculo].expovariate(tasa_llegada)
         heapq.heappush(self.cola_eventos, Evento(tiempo_llegada, 'llegada', tipo_vehiculo))
 
     def obtener_tasa_llegada(self, tipo_vehiculo):
@@ -111,7 +113,7 @@ class SimulacionPeaje:
             siguiente_vehiculo = self.cola_vehiculos.pop(0)
             tiempo_espera = self.tiempo_actual - siguiente_vehiculo.tiempo
             self.tiempos_espera.append(tiempo_espera)
-            tiempo_salida = self.tiempo_actual + distribuciones_tiempo_atencion[siguiente_vehiculo.tipo_vehiculo]()
+            tiempo_salida = self.tiempo_actual + distribuciones_tiempo_atencion[siguiente_vehiculo.tipo_vehiculo](self.generadores_servicio[siguiente_vehiculo.tipo_vehiculo])
             heapq.heappush(self.cola_eventos, Evento(tiempo_salida, 'salida', siguiente_vehiculo.tipo_vehiculo))
 
     def es_periodo_pico(self):
@@ -133,14 +135,16 @@ class SimulacionPeaje:
         else:
             print("Es más económico pagar las multas por tiempos de espera excesivos.")
 
-    def correr_multiples_simulaciones(self, n_simulaciones=100):
+    def correr_multiples_simulaciones(self, n_simulaciones=100, semilla=None):
+        semilla = semilla_maestra(semilla)
         tiempos_promedio_espera = []
-        for _ in range(n_simulaciones):
-            simulacion = SimulacionPeaje(self.tiempo_final, self.periodos_pico_A, self.periodos_pico_D)
+        for semilla_replica in generar_semillas(semilla, n_simulaciones):
+            simulacion = SimulacionPeaje(self.tiempo_final, self.periodos_pico_A, self.periodos_pico_D, semilla_replica)
             simulacion.correr()
             tiempos_promedio_espera.append(statistics.mean(simulacion.tiempos_espera))
         promedio_espera = statistics.mean(tiempos_promedio_espera)
-        intervalo_confianza = stats.t.interval(0.95, len(tiempos_promedio_espera)-1, loc=promedio_espera, scale=stats.sem(tiempos_promedio_espera))
+        _, *intervalo_confianza = intervalo_t(tiempos_promedio_espera, 0.95)
+        print(f"Semilla: {semilla}")
         print(f"Promedio de tiempo de espera: {promedio_espera:.2f} segundos")
         print(f"Tiempo promedio de espera: {promedio_espera:.2f} segundos ({promedio_espera/60/60:.2f} horas)")  # Tiempo de espera promedio (mean)
         print(f"Intervalo de confianza del 95%: ({intervalo_confianza[0]:.2f}, {intervalo_confianza[1]:.2f}) segundos")
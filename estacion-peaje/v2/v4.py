@@ -1,9 +1,8 @@
-import random
 import heapq
 import statistics
-import scipy.stats as stats
-import matplotlib.pyplot as plt
+from distribucion_t import intervalo_t
 from enum import Enum
+from semillas import semilla_maestra, generar_semillas, generadores_por_tipo
 
 # Definición de tipos de vehículo y tasas de llegada
 class Vehiculo(Enum):
@@ -29,12 +28,12 @@ tasas_arribo = {
     }
 }
 
-# Distribuciones del tiempo de atención usando la librería random
+# Distribuciones del tiempo de atención, cada una con el generador de random del tipo de vehículo
 distribuciones_tiempo_servicio = {
-    Vehiculo.GRAN_PORTE: lambda: random.uniform(45, 55),  # Distribución uniforme
-    Vehiculo.GRANDE: lambda: random.expovariate(1 / 30),  # Distribución exponencial
-    Vehiculo.PEQUENO: lambda: random.triangular(15, 20, 35),  # Distribución triangular
-    Vehiculo.MOTOCICLETA: lambda: random.expovariate(1 / 30)     # Distribución exponencial
+    Vehiculo.GRAN_PORTE: lambda generador: generador.uniform(45, 55),  # Distribución uniforme
+    Vehiculo.GRANDE: lambda generador: generador.expovariate(1 / 30),  # Distribución exponencial
+    Vehiculo.PEQUENO: lambda generador: generador.triangular(15, 20, 35),  # Distribución triangular
+    Vehiculo.MOTOCICLETA: lambda generador: generador.expovariate(1 / 30)     # Distribución exponencial
 }
 
 # Períodos de tiempo pico
@@ -53,8 +52,10 @@ class Suceso:
     # El método __lt__ permite que los objetos Suceso se ordenen en una cola de prioridad basada en el atributo tiempo. En el contexto de una cola de prioridad (heap), esto asegura que los sucesos se procesen en el orden correcto basado en el tiempo en el que ocurren.
 
 class SimulacionCabinas:
-    def __init__(self, tiempo_final, horarios_pico_mañana, horarios_pico_vespertino, multa_espera):
+    def __init__(self, tiempo_final, horarios_pico_mañana, horarios_pico_vespertino, multa_espera, semilla=None):
         self.tiempo_actual = 0
+        self.semilla = semilla_maestra(semilla)  # Queda registrada para poder repetir la corrida
+        self.generadores_llegadas, self.generadores_servicio = generadores_por_tipo(self.semilla, list(tasas_arribo['no_pico']))
         self.tiempo_final = tiempo_final
         self.horarios_pico_mañana = horarios_pico_mañana
         self.horarios_pico_vespertino = horarios_pico_vespertino
@@ -84,7 +85,7 @@ class SimulacionCabinas:
     def procesar_llegada(self, suceso):
         if self.cabinas_libres > 0:
             self.cabinas_libres -= 1
-            tiempo_salida = self.tiempo_actual + distribuciones_tiempo_servicio[suceso.tipo_vehiculo]()
+            tiempo_salida = self.tiempo_actual + distribuciones_tiempo_servicio[suceso.tipo_vehiculo](self.generadores_servicio[suceso.tipo_vehiculo])
             heapq.heappush(self.cola_sucesos, Suceso(tiempo_salida, 'salida', suceso.tipo_vehiculo))
         else:
             self.cola_vehiculos.append(suceso)
@@ -92,7 +93,7 @@ class SimulacionCabinas:
 
     def proxima_llegada(self, tipo_vehiculo):
         tasa_arribo = self.obtener_tasa_arribo(tipo_vehiculo)
-        tiempo_llegada = self.tiempo_actual + random.expovariate(tasa_arribo)   # Todas las llegadas siguen una distribución exponencial
+        tiempo_llegada = self.tiempo_actual + self.generadores_llegadas[tipo_vehiculo].expovariate(tasa_arribo)   # Todas las llegadas siguen una distribución exponencial
         heapq.heappush(self.cola_sucesos, Suceso(tiempo_llegada, 'llegada', tipo_vehiculo))
 
     def obtener_tasa_arribo(self, tipo_vehiculo):
@@ -108,7 +109,7 @@ class SimulacionCabinas:
             vehiculo_saliente = self.cola_vehiculos.pop(0)
             tiempo_espera = self.tiempo_actual - vehiculo_saliente.tiempo
             self.tiempos_espera.append(tiempo_espera)
-            tiempo_salida = self.tiempo_actual + distribuciones_tiempo_servicio[vehiculo_saliente.tipo_vehiculo]()
+            tiempo_salida = self.tiempo_actual + distribuciones_tiempo_servicio[vehiculo_saliente.tipo_vehiculo](self.generadores_servicio[vehiculo_saliente.tipo_vehiculo])
             heapq.heappush(self.cola_sucesos, Suceso(tiempo_salida, 'salida', vehiculo_saliente.tipo_vehiculo))
 
     def es_hora_pico(self):
@@ -120,7 +121,7 @@ class SimulacionCabinas:
 
     def programar_sucesos_iniciales(self):
         for tipo_vehiculo in tasas_arribo['no_pico'].keys():
-            tiempo_llegada = self.tiempo_actual + random.expovariate(tasas_arribo['no_pico'][tipo_vehiculo])
+            tiempo_llegada = self.tiempo_actual + self.generadores_llegadas[tipo_vehiculo].expovariate(tasas_arribo['no_pico'][tipo_vehiculo])
             heapq.heappush(self.cola_sucesos, Suceso(tiempo_llegada, 'llegada', tipo_vehiculo))
 
     def calcular_costos(self):
@@ -137,6 +138,7 @@ class SimulacionCabinas:
         print("-----------------------------------------------------------------")
 
     def mostrar_grafico_espera(self, tiempos_espera):
+        import matplotlib.pyplot as plt  # Sólo se carga si se pide el gráfico
         plt.hist(tiempos_espera, bins=50, edgecolor='black')  # 50 intervalos
         LIMITE_ESPERA = 3 * 60  # Límite de espera de 3 minutos
         plt.axvline(LIMITE_ESPERA, color='red', linestyle='dashed', linewidth=1, label='Límite de 3 minutos')
@@ -146,15 +148,17 @@ class SimulacionCabinas:
         plt.legend()
         plt.show()
 
-    def ejecutar_n_veces(self, n_simulaciones):
+    def ejecutar_n_veces(self, n_simulaciones, semilla=None):
+        semilla = semilla_maestra(semilla)
         tiempos_promedio_espera = []
-        for _ in range(n_simulaciones):
-            simulacion = SimulacionCabinas(self.tiempo_final, self.horarios_pico_mañana, self.horarios_pico_vespertino, multa_espera)
+        for semilla_replica in generar_semillas(semilla, n_simulaciones):
+            simulacion = SimulacionCabinas(self.tiempo_final, self.horarios_pico_mañana, self.horarios_pico_vespertino, multa_espera, semilla_replica)
             simulacion.ejecutar()
             tiempos_promedio_espera.append(statistics.mean(simulacion.tiempos_espera))
         promedio_espera = statistics.mean(tiempos_promedio_espera)
-        intervalo_confianza = stats.t.interval(0.95, len(tiempos_promedio_espera)-1, loc=promedio_espera, scale=stats.sem(tiempos_promedio_espera))
+        _, *intervalo_confianza = intervalo_t(tiempos_promedio_espera, 0.95)
         print("\nResultados de las simulaciones:")
+        print(f"Semilla: {semilla}")
         print(f"Tiempo promedio de espera: {promedio_espera:.2f} segundos")
         print(f"Intervalo de confianza del 95%: ({intervalo_confianza[0]:.2f}, {intervalo_confianza[1]:.2f})")
         self.mostrar_grafico_espera(tiempos_promedio_espera)